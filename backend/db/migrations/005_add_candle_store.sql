@@ -0,0 +1,12 @@
+-- Migration: 005_add_candle_store
+-- Description: Add candles table caching completed WEEX daily candles
+
+-- Closed daily candles never change, so rows are written once and kept
+CREATE TABLE IF NOT EXISTS candles (
+    symbol TEXT NOT NULL,
+    open_time INTEGER NOT NULL,
+    close REAL,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (symbol, open_time)
+) WITHOUT ROWID;
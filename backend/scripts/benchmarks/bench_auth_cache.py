@@ -0,0 +1,82 @@
+"""
+File Name: bench_auth_cache.py
+Description: Throughput of authenticated GET /api/portfolio/holdings with and
+             without the token -> principal cache in utils.auth.
+Author Name: The FinArth Team
+
+Instructions to run: python scripts/benchmarks/bench_auth_cache.py
+                     [--requests 2000] [--users 10000]
+                     Seeds throw-away 'bench-auth-*' users in the local
+                     database and removes them afterwards.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import secrets
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', '..', 'src'))
+
+EMAIL_PREFIX = 'bench-auth-'
+
+def seed_users(db, count):
+    db.executemany(
+        'INSERT INTO users (email, password, session_token) VALUES (?, ?, ?)',
+        ((f'{EMAIL_PREFIX}{index}@example.com', 'x', secrets.token_hex(32)) for index in range(count))
+    )
+    db.commit()
+    return db.execute(
+        'SELECT session_token FROM users WHERE email = ?', (f'{EMAIL_PREFIX}{count - 1}@example.com',)
+    ).fetchone()[0]
+
+def measure(client, token, requests):
+    headers = {'Authorization': f'Bearer {token}'}
+    started = time.perf_counter()
+    for _ in range(requests):
+        assert client.get('/api/portfolio/holdings', headers=headers).status_code == 200
+    return requests / (time.perf_counter() - started)
+
+def measure_auth_only(app, token, requests):
+    """Cost of the token_required check alone, without routing or JSON."""
+    from utils.auth import token_required
+    check = token_required(lambda user: user)
+    with app.test_request_context(headers={'Authorization': f'Bearer {token}'}):
+        started = time.perf_counter()
+        for _ in range(requests):
+            check()
+        return (time.perf_counter() - started) / requests * 1e6
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--users', type=int, default=10000)
+    args = parser.parse_args()
+
+    # Logger echoes every line to stdout; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app import app
+        from database import db
+        from utils.auth import auth_cache
+
+    client = app.test_client()
+    token = seed_users(db, args.users)
+    try:
+        print(f"GET /api/portfolio/holdings, {args.requests} requests, {args.users} users in the table")
+        for label, enabled in (('without cache', False), ('with cache', True)):
+            auth_cache.enabled = enabled
+            auth_cache.clear()
+            with contextlib.redirect_stdout(io.StringIO()):
+                measure(client, token, 50)
+                throughput = measure(client, token, args.requests)
+                auth_us = measure_auth_only(app, token, args.requests)
+            print(f"  {label:<14} {throughput:10.0f} req/s   token_required {auth_us:7.2f} us/request")
+    finally:
+        db.execute('DELETE FROM users WHERE email LIKE ?', (f'{EMAIL_PREFIX}%',))
+        db.commit()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+File Name: bench_db_replication.py
+Description: Write latency of DatabaseManager.execute_write with the legacy
+             full-file copy replication versus incremental background
+             replication (SQLite online backup API), at several database
+             sizes.
+Author Name: The FinArth Team
+
+Instructions to run: python scripts/benchmarks/bench_db_replication.py
+                     [--sizes 10,100,1024] [--writes 20]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', '..', 'src'))
+
+from utils.db_manager import DatabaseManager
+
+BLOB_SIZE = 1024 * 1024
+
+def build_database(base_path: Path, size_mb: int, mode: str) -> DatabaseManager:
+    manager = DatabaseManager(base_path, replication=mode, max_lag=0.5)
+    conn = manager.get_write_connection()
+    conn.execute("CREATE TABLE filler (id INTEGER PRIMARY KEY, data BLOB)")
+    conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO filler (data) VALUES (?)", ((os.urandom(BLOB_SIZE),) for _ in range(size_mb)))
+    conn.commit()
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    # Start from fully replicated databases
+    manager.replicator.replicate_now()
+    return manager
+
+def measure(manager: DatabaseManager, writes: int):
+    latencies = []
+    for index in range(writes):
+        started = time.perf_counter()
+        manager.execute_write("INSERT INTO events (body) VALUES (?)", (f"event {index}",))
+        latencies.append((time.perf_counter() - started) * 1000)
+    started = time.perf_counter()
+    manager.sync(600)
+    catch_up = (time.perf_counter() - started) * 1000
+    return latencies, catch_up
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='10,100,1024', help='Database sizes in MB')
+    parser.add_argument('--writes', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"execute_write latency over {args.writes} writes (ms)")
+    print(f"  {'size':>8} {'mode':<12} {'p50':>10} {'max':>10} {'catch-up':>10} {'backup runs':>12}")
+    for size_mb in (int(size) for size in args.sizes.split(',')):
+        for mode in ('copy', 'incremental'):
+            with tempfile.TemporaryDirectory() as directory:
+                # Logger echoes every line to stdout; keep the report readable
+                with contextlib.redirect_stdout(io.StringIO()):
+                    manager = build_database(Path(directory) / 'bench.sqlite', size_mb, mode)
+                    runs_before = manager.replicator.runs
+                    latencies, catch_up = measure(manager, args.writes)
+                    manager.replicator.stop()
+                runs = manager.replicator.runs - runs_before
+                print(f"  {size_mb:>6}MB {mode:<12} {statistics.median(latencies):>10.2f} "
+                      f"{max(latencies):>10.2f} {catch_up:>10.2f} {runs:>12}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+File Name: bench_generate_insight.py
+Description: Load benchmark for POST /api/agent/generate-insight against a
+             local stub LLM server. Compares the legacy per-request event
+             loop with the shared long-lived loop.
+Author Name: The FinArth Team
+
+Instructions to run: python scripts/benchmarks/bench_generate_insight.py
+                     [--requests 200] [--concurrency 50] [--latency 0.25]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', '..', 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+from stub_server import openai_stub
+
+def post(url, payload):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode(),
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    with urllib.request.urlopen(request, timeout=120) as response:
+        return response.status
+
+def run_load(base_url, total, concurrency):
+    url = f"{base_url}/api/agent/generate-insight"
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        statuses = list(pool.map(lambda i: post(url, {'query': f'What is an index fund? #{i}'}), range(total)))
+    elapsed = time.perf_counter() - started
+    return elapsed, sum(1 for s in statuses if s == 200)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.25, help='stub LLM latency in seconds')
+    args = parser.parse_args()
+
+    with openai_stub(delay=args.latency) as llm:
+        os.environ['OPENROUTER_BASE_URL'] = f"{llm.url}/v1"
+        os.environ.setdefault('OPENROUTER_API_KEY', 'stub-key')
+        os.environ.setdefault('MODEL_NAME', 'stub-model')
+
+        from werkzeug.serving import make_server
+        from app import app
+        from utils.async_runner import AsyncRunner
+        from utils.logger import Logger
+
+        Logger.get_instance().configure({'enable_colors': False})
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+        print(f"{args.requests} requests, concurrency {args.concurrency}, stub LLM latency {args.latency}s")
+        for mode in ('per_request', 'shared'):
+            AsyncRunner.get_instance().mode = mode
+            with contextlib.redirect_stdout(io.StringIO()):
+                elapsed, ok = run_load(base_url, args.requests, args.concurrency)
+            print(f"  {mode:<12} {elapsed:7.2f}s  {args.requests / elapsed:8.1f} req/s  ({ok}/{args.requests} ok)")
+
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
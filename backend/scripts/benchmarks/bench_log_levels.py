@@ -0,0 +1,71 @@
+"""
+File Name: bench_log_levels.py
+Description: Per-call cost of Logger.debug when DEBUG is enabled versus
+             filtered out by log_level, and of the text versus JSON-lines
+             formats with and without caller info.
+Author Name: The FinArth Team
+
+Instructions to run: python scripts/benchmarks/bench_log_levels.py [--calls 20000]
+                     Logs go to a temporary directory.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', '..', 'src'))
+
+from utils.logger import Logger
+
+CASES = (
+    ('debug filtered (level INFO)', {'log_level': 'INFO'}),
+    ('debug, text + caller', {'log_level': 'DEBUG', 'format': 'text', 'caller_info': True}),
+    ('debug, text, no caller', {'log_level': 'DEBUG', 'format': 'text', 'caller_info': False}),
+    ('debug, json + caller', {'log_level': 'DEBUG', 'format': 'json', 'caller_info': True}),
+    ('debug, json, no caller', {'log_level': 'DEBUG', 'format': 'json', 'caller_info': False}),
+)
+
+def measure(logger: Logger, calls: int) -> float:
+    metadata = {'step': 3, 'context': 'x' * 100}
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        for _ in range(calls):
+            logger.debug('ReAct step 3 starting', 42, metadata)
+        elapsed = time.perf_counter() - started
+        logger.flush(60)
+    return elapsed / calls * 1e9
+
+def baseline(calls: int) -> float:
+    """An empty method call with the same arguments, for reference."""
+    class Noop:
+        def debug(self, message, user_id=None, metadata=None):
+            pass
+    noop, metadata = Noop(), {'step': 3}
+    started = time.perf_counter()
+    for _ in range(calls):
+        noop.debug('ReAct step 3 starting', 42, metadata)
+    return (time.perf_counter() - started) / calls * 1e9
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"Logger.debug cost over {args.calls} calls (ns/call, queued writer)")
+    print(f"  {'empty method call':<30} {baseline(args.calls):10.0f}")
+    for label, config in CASES:
+        with tempfile.TemporaryDirectory() as log_dir:
+            logger = Logger()
+            logger.log_dir = Path(log_dir)
+            logger.configure({'max_lines_per_file': 10 ** 9, **config})
+            print(f"  {label:<30} {measure(logger, args.calls):10.0f}")
+            logger.close()
+
+if __name__ == '__main__':
+    main()
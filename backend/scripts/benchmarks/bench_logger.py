@@ -0,0 +1,87 @@
+"""
+File Name: bench_logger.py
+Description: Per-call latency of Logger.info when the current log file
+             already holds 1000 lines: the legacy path (count every line of
+             the file, reopen it, print) versus the synchronous and
+             queue-backed writers with in-memory line counters.
+Author Name: The FinArth Team
+
+Instructions to run: python scripts/benchmarks/bench_logger.py [--calls 2000]
+                     Logs go to a temporary directory.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', '..', 'src'))
+
+from utils.logger import Logger
+
+class LegacyLogger(Logger):
+    """The pre-queue write path: every call re-reads the file series to pick the file."""
+
+    def _legacy_next_log_file(self, user_id):
+        base_filename = self._get_log_filename(user_id)
+        current_file = self.log_dir / base_filename
+        file_index = 1
+        while current_file.exists():
+            if self._get_current_file_line_count(current_file) < self.config['max_lines_per_file']:
+                return current_file
+            current_file = self.log_dir / f"{base_filename.replace('.log', '')}_{file_index}.log"
+            file_index += 1
+        return current_file
+
+    def _write_log(self, level, message, user_id, metadata):
+        log_file = self._legacy_next_log_file(user_id)
+        caller_info = self._get_caller_info()
+        formatted_entry = self._format_log_entry(level, message, user_id, metadata, caller_info)
+        with open(log_file, 'a') as f:
+            f.write(formatted_entry + '\n')
+        print(formatted_entry)
+
+def make_logger(cls, log_dir: Path, asynchronous: bool) -> Logger:
+    logger = cls()
+    logger.log_dir = log_dir
+    logger.configure({'async': asynchronous})
+    # A full first file, as after a busy day
+    (log_dir / logger._get_log_filename(None)).write_text('existing line\n' * logger.config['max_lines_per_file'])
+    return logger
+
+def measure(logger: Logger, calls: int):
+    latencies = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index in range(calls):
+            started = time.perf_counter()
+            logger.info('DB Operation: SELECT on users', metadata={'table': 'users', 'index': index})
+            latencies.append((time.perf_counter() - started) * 1e6)
+        started = time.perf_counter()
+        logger.flush()
+        drain = (time.perf_counter() - started) * 1000
+    logger.close()
+    return latencies, drain
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"Logger.info latency over {args.calls} calls, current file at 1000 lines (us)")
+    print(f"  {'writer':<10} {'p50':>8} {'p99':>8} {'mean':>8} {'drain ms':>10}")
+    for label, cls, asynchronous in (('legacy', LegacyLogger, False), ('sync', Logger, False), ('queued', Logger, True)):
+        with tempfile.TemporaryDirectory() as log_dir:
+            latencies, drain = measure(make_logger(cls, Path(log_dir), asynchronous), args.calls)
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(f"  {label:<10} {statistics.median(latencies):8.1f} {p99:8.1f} "
+              f"{statistics.fmean(latencies):8.1f} {drain:10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+File Name: bench_market_client.py
+Description: Market-data fetch latency and connection reuse against a local
+             CoinGecko/WEEX stub: the legacy path (requests.get without a
+             session, a thread per call) versus the shared pooled async
+             client used by MarketDataService and WeexService.
+Author Name: The FinArth Team
+
+Instructions to run: python scripts/benchmarks/bench_market_client.py
+                     [--rounds 30] [--tickers 8] [--latency 0.02]
+                     Each round refreshes the market snapshot and looks up
+                     --tickers WEEX tickers concurrently.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', '..', 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+import requests
+from stub_server import market_stub
+
+SYMBOLS = ('btcusdt', 'ethusdt', 'solusdt', 'xrpusdt', 'adausdt', 'dogeusdt', 'dotusdt', 'ltcusdt', 'linkusdt', 'avaxusdt')
+
+async def legacy_round(base_url, tickers):
+    """The pre-client behaviour: every call is a fresh requests.get on a worker thread."""
+    def fetch(url):
+        r = requests.get(url, headers={"accept": "application/json"}, timeout=10)
+        return r.json() if r.status_code == 200 else None
+
+    urls = [f"{base_url}/api/v3/global", f"{base_url}/api/v3/coins/markets?vs_currency=usd&per_page=10"]
+    urls += [f"{base_url}/capi/v2/market/ticker?symbol=cmt_{symbol}" for symbol in SYMBOLS[:tickers]]
+    await asyncio.gather(*(asyncio.to_thread(fetch, url) for url in urls))
+
+async def pooled_round(tickers):
+    from ai_agent.tools import MarketDataService, WeexService
+    await asyncio.gather(MarketDataService._fetch_snapshot(), *(WeexService.get_ticker(symbol) for symbol in SYMBOLS[:tickers]))
+
+async def measure(round_factory, rounds):
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await round_factory()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=30)
+    parser.add_argument('--tickers', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.02, help='stub upstream latency in seconds')
+    args = parser.parse_args()
+
+    with market_stub(delay=args.latency) as server:
+        os.environ['COINGECKO_BASE_URL'] = f"{server.url}/api/v3"
+        os.environ['WEEX_BASE_URL'] = server.url
+        with contextlib.redirect_stdout(io.StringIO()):
+            from ai_agent.tools import MarketDataService
+        # Keep the benchmark from writing the real market cache file
+        MarketDataService._save_cache = staticmethod(lambda data, expiry: None)
+
+        requests_per_round = 2 + args.tickers
+        print(f"{args.rounds} rounds of {requests_per_round} concurrent market-data requests, "
+              f"stub latency {args.latency * 1000:.0f} ms")
+        print(f"  {'client':<10} {'p50 ms':>8} {'p95 ms':>8} {'connections':>12} {'per request':>12}")
+        for label, factory in (('legacy', lambda: legacy_round(server.url, args.tickers)),
+                               ('pooled', lambda: pooled_round(args.tickers))):
+            opened = server.connection_count
+            with contextlib.redirect_stdout(io.StringIO()):
+                latencies = asyncio.run(measure(factory, args.rounds))
+            connections = server.connection_count - opened
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            print(f"  {label:<10} {statistics.median(latencies):8.1f} {p95:8.1f} {connections:12d} "
+                  f"{connections / (args.rounds * requests_per_round):12.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+File Name: bench_orchestrator_setup.py
+Description: Micro-benchmark for the per-request fixed cost of obtaining an
+             AgentOrchestrator (router, five handlers and their OpenAI
+             clients) and running one request against a stubbed endpoint.
+Author Name: The FinArth Team
+
+Instructions to run: python scripts/benchmarks/bench_orchestrator_setup.py
+                     [--iterations 50]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', '..', 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+from stub_server import openai_stub
+
+def legacy_orchestrator():
+    """Emulates the old behaviour: six fresh OpenAI clients and pools per request."""
+    from openai import OpenAI
+    from ai_agent.core import AgentOrchestrator
+    from ai_agent.llm_gateway import LLMGateway
+    from utils.opik_client import OpikConfig
+
+    for _ in range(5):
+        OpikConfig.track_openai_client(OpenAI(
+            api_key=os.environ['OPENROUTER_API_KEY'],
+            base_url=os.environ['OPENROUTER_BASE_URL']
+        ))
+    LLMGateway._instance = None
+    return AgentOrchestrator()
+
+def measure(factory, iterations):
+    setup_total = 0.0
+    request_total = 0.0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        orchestrator = factory()
+        setup_total += time.perf_counter() - started
+
+        started = time.perf_counter()
+        asyncio.run(orchestrator.process('What is an index fund?'))
+        request_total += time.perf_counter() - started
+    return setup_total / iterations, request_total / iterations
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    with openai_stub() as llm:
+        os.environ['OPENROUTER_BASE_URL'] = f"{llm.url}/v1"
+        os.environ.setdefault('OPENROUTER_API_KEY', 'stub-key')
+        os.environ.setdefault('MODEL_NAME', 'stub-model')
+
+        from ai_agent.core import AgentOrchestrator
+
+        print(f"Per-request orchestrator cost over {args.iterations} iterations")
+        for label, factory in (
+            ('legacy (clients per request)', legacy_orchestrator),
+            ('AgentOrchestrator.get_instance()', AgentOrchestrator.get_instance),
+        ):
+            # Logger echoes every line to stdout; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                AgentOrchestrator.reset()
+                factory()
+                setup, request = measure(factory, args.iterations)
+            print(f"  {label:<34} setup {setup * 1000:8.3f} ms   request {request * 1000:8.3f} ms")
+
+if __name__ == '__main__':
+    main()
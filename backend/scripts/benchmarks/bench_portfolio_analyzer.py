@@ -0,0 +1,59 @@
+"""
+File Name: bench_portfolio_analyzer.py
+Description: PortfolioAnalyzer.analyze_holdings on synthetic portfolios:
+             the pure-Python loop versus the NumPy path (category codes,
+             bincount allocation, risk-weight dot product, argpartition
+             top-N). analyze_holdings picks between them by portfolio
+             size (VECTORIZE_MIN_HOLDINGS).
+Author Name: The FinArth Team
+
+Instructions to run: python scripts/benchmarks/bench_portfolio_analyzer.py
+                     [--sizes 10,1000,100000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', '..', 'src'))
+
+from ai_agent.engine.portfolio_analyzer import PortfolioAnalyzer
+
+CATEGORIES = ['Crypto', 'Stock', 'US Equity', 'Technology Fund', 'ETF', 'Bond', 'Real Estate', 'Cash', 'Gold', 'Art']
+
+def make_holdings(count, seed=1):
+    rng = random.Random(seed)
+    return [
+        {"id": index, "name": f"Asset {index}", "symbol": f"SYM{index}", "category": rng.choice(CATEGORIES),
+         "amount": round(rng.uniform(10, 100000), 2)}
+        for index in range(count)
+    ]
+
+def measure(func, holdings, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(holdings)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='10,1000,100000')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"  {'holdings':>9} {'python ms':>10} {'numpy ms':>10} {'speedup':>8} {'analyze ms':>11}")
+    for size in (int(size) for size in args.sizes.split(',')):
+        holdings = make_holdings(size)
+        python_ms = measure(PortfolioAnalyzer._analyze_python, holdings, args.repeat)
+        numpy_ms = measure(PortfolioAnalyzer._analyze_vectorized, holdings, args.repeat)
+        analyze_ms = measure(PortfolioAnalyzer.analyze_holdings, holdings, args.repeat)
+        print(f"  {size:9d} {python_ms:10.3f} {numpy_ms:10.3f} {python_ms / numpy_ms:7.1f}x {analyze_ms:11.3f}")
+
+if __name__ == '__main__':
+    main()
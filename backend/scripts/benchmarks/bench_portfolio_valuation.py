@@ -0,0 +1,119 @@
+"""
+File Name: bench_portfolio_valuation.py
+Description: Mark-to-market valuation of large portfolios against a local
+             WEEX stub: price fetching (one ticker per distinct symbol), then
+             valuation alone and valuation plus analysis at current value
+             (what PortfolioHandler and /api/portfolio/summary run), as
+             per-holding Python loops versus PortfolioValuation +
+             PortfolioAnalyzer.
+Author Name: The FinArth Team
+
+Instructions to run: python scripts/benchmarks/bench_portfolio_valuation.py
+                     [--sizes 1000,10000,100000] [--symbols 50] [--repeat 5]
+                     [--latency 0.02]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', '..', 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+from stub_server import market_stub
+
+CATEGORIES = ['Crypto', 'Crypto', 'Stock', 'ETF', 'Bond', 'Cash']
+
+def make_holdings(count, symbols, seed=1):
+    rng = random.Random(seed)
+    holdings = []
+    for index in range(count):
+        category = rng.choice(CATEGORIES)
+        holdings.append({
+            "id": index, "name": f"Asset {index}", "category": category,
+            "symbol": f"coin{rng.randrange(symbols)}usdt" if category == 'Crypto' else f"SYM{index}",
+            "amount": round(rng.uniform(10, 10000), 2),
+            "entry_price": round(rng.uniform(1, 1000), 4) if category == 'Crypto' else None
+        })
+    return holdings
+
+def python_loop(holdings, prices):
+    """Reference per-holding valuation, as a plain loop would do it."""
+    from ai_agent.tools import WeexService
+    total_invested = total_value = 0.0
+    allocation = {}
+    values = []
+    for h in holdings:
+        amount = h.get('amount') or 0
+        value = amount
+        if h.get('category') == 'Crypto' and h.get('symbol') and h.get('entry_price'):
+            price = prices.get(WeexService.weex_symbol(h['symbol']))
+            if price:
+                value = amount / h['entry_price'] * price
+        values.append(value)
+        total_invested += amount
+        total_value += value
+        allocation[h.get('category')] = allocation.get(h.get('category'), 0) + value
+    return values, total_invested, total_value, {k: v / total_value for k, v in allocation.items()}
+
+def python_pipeline(holdings, prices):
+    from ai_agent.engine.portfolio_analyzer import PortfolioAnalyzer
+    values = python_loop(holdings, prices)[0]
+    return PortfolioAnalyzer._analyze_python(holdings, values)
+
+def numpy_pipeline(holdings, prices):
+    from ai_agent.engine.portfolio_analyzer import PortfolioAnalyzer
+    from ai_agent.engine.portfolio_valuation import PortfolioValuation
+    valuation = PortfolioValuation.mark_to_market(holdings, prices)
+    return PortfolioAnalyzer.analyze_holdings(holdings, values=valuation['values'])
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='1000,10000,100000')
+    parser.add_argument('--symbols', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.02, help='stub upstream latency in seconds')
+    args = parser.parse_args()
+
+    with market_stub(delay=args.latency) as server:
+        os.environ['WEEX_BASE_URL'] = server.url
+        with contextlib.redirect_stdout(io.StringIO()):
+            from ai_agent.engine.portfolio_valuation import PortfolioValuation
+            from ai_agent.ticker_cache import TickerCache
+
+        print(f"{args.symbols} distinct crypto symbols, stub latency {args.latency * 1000:.0f} ms")
+        print(f"  {'':>9} {'':>10} {'':>8} {'valuation only':>20} {'valuation + analysis':>22}")
+        print(f"  {'holdings':>9} {'prices ms':>10} {'tickers':>8} {'loop ms':>9} {'numpy ms':>10} {'loop ms':>10} {'numpy ms':>11}")
+        for size in (int(size) for size in args.sizes.split(',')):
+            holdings = make_holdings(size, args.symbols)
+            TickerCache._instance = TickerCache()
+            before = server.count('/capi/v2/market/ticker')
+            started = time.perf_counter()
+            prices = asyncio.run(PortfolioValuation.fetch_prices(holdings))
+            fetch_ms = (time.perf_counter() - started) * 1000
+            tickers = server.count('/capi/v2/market/ticker') - before
+
+            loop_ms = measure(lambda: python_loop(holdings, prices), args.repeat)
+            numpy_ms = measure(lambda: PortfolioValuation.mark_to_market(holdings, prices), args.repeat)
+            pipeline_loop_ms = measure(lambda: python_pipeline(holdings, prices), args.repeat)
+            pipeline_numpy_ms = measure(lambda: numpy_pipeline(holdings, prices), args.repeat)
+            print(f"  {size:9d} {fetch_ms:10.1f} {tickers:8d} {loop_ms:9.2f} {numpy_ms:10.2f} "
+                  f"{pipeline_loop_ms:10.2f} {pipeline_numpy_ms:11.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+File Name: bench_weex_batch.py
+Description: Crypto-holding analysis against a local WEEX stub: one
+             POST /api/market/weex/analysis per holding (as the Dashboard
+             used to do, fired concurrently) versus one
+             POST /api/market/weex/analysis/batch for the whole portfolio.
+Author Name: The FinArth Team
+
+Instructions to run: python scripts/benchmarks/bench_weex_batch.py
+                     [--holdings 20] [--symbols 8] [--rounds 10] [--latency 0.05]
+                     Holdings cycle over --symbols symbols and a few
+                     purchase dates, so tickers and candles repeat. Each
+                     mode starts from an empty ticker cache and candle store
+                     (a temporary database).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', '..', 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+from stub_server import market_stub
+
+SYMBOLS = ('btcusdt', 'ethusdt', 'solusdt', 'xrpusdt', 'adausdt', 'dogeusdt', 'dotusdt', 'ltcusdt', 'linkusdt', 'avaxusdt')
+DATES = ('2026-01-05', '2026-02-10', '2026-03-15')
+
+def make_holdings(count, symbols):
+    return [
+        {"id": index, "symbol": SYMBOLS[index % symbols], "date": DATES[index % len(DATES)]}
+        for index in range(count)
+    ]
+
+def reset_caches(directory, label):
+    """Fresh ticker cache and a candle store on a temporary database."""
+    from ai_agent.candle_store import CandleStore
+    from ai_agent.ticker_cache import TickerCache
+    from utils.db_pool import ConnectionPool
+    from utils.migration_runner import MigrationRunner
+    pool = ConnectionPool(os.path.join(directory, f'{label}.sqlite'))
+    MigrationRunner(pool.connection()).run_migrations()
+    CandleStore._instance = CandleStore(connection=pool.connection)
+    TickerCache._instance = TickerCache()
+
+def single_calls(client, holdings):
+    # Browsers fire these in parallel; the Flask dev server handles each on its own thread
+    def analyse(holding):
+        return client.post('/api/market/weex/analysis', json=holding).get_json()
+
+    with ThreadPoolExecutor(max_workers=len(holdings)) as pool:
+        return list(pool.map(analyse, holdings))
+
+def batch_call(client, holdings):
+    return client.post('/api/market/weex/analysis/batch', json={"holdings": holdings}).get_json()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--holdings', type=int, default=20)
+    parser.add_argument('--symbols', type=int, default=8)
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.05, help='stub upstream latency in seconds')
+    args = parser.parse_args()
+
+    holdings = make_holdings(args.holdings, min(args.symbols, len(SYMBOLS)))
+    with market_stub(delay=args.latency) as server, tempfile.TemporaryDirectory() as directory:
+        os.environ['WEEX_BASE_URL'] = server.url
+        with contextlib.redirect_stdout(io.StringIO()):
+            from app import app
+        client = app.test_client()
+
+        print(f"{args.holdings} crypto holdings over {args.symbols} symbols, {args.rounds} rounds, "
+              f"stub latency {args.latency * 1000:.0f} ms")
+        print(f"  {'mode':<8} {'p50 ms':>8} {'max ms':>8} {'HTTP calls':>11} {'upstream/round':>15}")
+        for label, run in (('single', single_calls), ('batch', batch_call)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                reset_caches(directory, label)
+            before = server.count('/capi/v2/market/ticker') + server.count('/capi/v2/market/historyCandles')
+            latencies = []
+            for _ in range(args.rounds):
+                started = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run(client, holdings)
+                latencies.append((time.perf_counter() - started) * 1000)
+            upstream = server.count('/capi/v2/market/ticker') + server.count('/capi/v2/market/historyCandles') - before
+            calls = args.holdings if label == 'single' else 1
+            print(f"  {label:<8} {statistics.median(latencies):8.1f} {max(latencies):8.1f} {calls:11d} "
+                  f"{upstream / args.rounds:15.1f}")
+
+if __name__ == '__main__':
+    main()
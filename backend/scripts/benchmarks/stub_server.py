@@ -0,0 +1,278 @@
+"""
+File Name: stub_server.py
+Description: Tiny threaded HTTP server used by the benchmarks and tests to
+             stand in for OpenRouter, CoinGecko, WEEX and Opik without
+             touching the network.
+Author Name: The FinArth Team
+
+Instructions to run: Import StubServer, register routes and use it as a
+                     context manager. Each route receives a StubRequest and
+                     returns either a JSON-serialisable payload or a
+                     (status, payload) tuple.
+"""
+
+import json
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse, parse_qs
+
+@dataclass
+class StubRequest:
+    method: str
+    path: str
+    query: Dict[str, str]
+    body: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+class _Server(ThreadingHTTPServer):
+    # The default listen backlog (5) drops SYNs under concurrent bursts, adding 1s retransmits
+    request_queue_size = 128
+
+class StubServer:
+    def __init__(self, routes: Optional[Dict[str, Callable[[StubRequest], Any]]] = None, delay: float = 0.0):
+        self.routes = dict(routes or {})
+        self.delay = delay
+        self.request_counts: Dict[str, int] = {}
+        self.connection_count = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def route(self, path: str):
+        def decorator(func):
+            self.routes[path] = func
+            return func
+        return decorator
+
+    def count(self, path: str) -> int:
+        with self._lock:
+            return self.request_counts.get(path, 0)
+
+    def _match(self, path: str):
+        # Longest registered prefix wins so '/v1/chat/completions' beats '/v1'
+        for prefix in sorted(self.routes, key=len, reverse=True):
+            if path == prefix or path.startswith(prefix.rstrip('/') + '/'):
+                return prefix
+        return None
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                # Headers and body go out in separate writes; avoid Nagle stalls on keep-alive
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with stub._lock:
+                    stub.connection_count += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def _dispatch(self):
+                parsed = urlparse(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    body = raw.decode(errors='replace')
+
+                prefix = stub._match(parsed.path)
+                if prefix is None:
+                    self._send(404, {'error': 'not found'})
+                    return
+                with stub._lock:
+                    stub.request_counts[prefix] = stub.request_counts.get(prefix, 0) + 1
+
+                if stub.delay:
+                    time.sleep(stub.delay)
+                request = StubRequest(
+                    method=self.command,
+                    path=parsed.path,
+                    query={k: v[-1] for k, v in parse_qs(parsed.query).items()},
+                    body=body,
+                    headers=dict(self.headers)
+                )
+                result = stub.routes[prefix](request)
+                status, payload = result if isinstance(result, tuple) else (200, result)
+                if isinstance(payload, StreamingBody):
+                    self._send_stream(status, payload)
+                else:
+                    self._send(status, payload)
+
+            def _send(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, status, payload):
+                self.send_response(status)
+                self.send_header('Content-Type', payload.content_type)
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                for chunk in payload.chunks:
+                    data = chunk.encode() if isinstance(chunk, str) else chunk
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+                    if payload.interval:
+                        time.sleep(payload.interval)
+                self.wfile.write(b"0\r\n\r\n")
+
+            do_GET = _dispatch
+            do_POST = _dispatch
+            do_PUT = _dispatch
+            do_DELETE = _dispatch
+
+        return Handler
+
+    def start(self):
+        self._server = _Server(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+@dataclass
+class StreamingBody:
+    chunks: Any
+    content_type: str = 'text/event-stream'
+    interval: float = 0.0
+
+def chat_completion(content: str, model: str = 'stub-model') -> Dict[str, Any]:
+    """Builds an OpenAI-compatible chat completion payload."""
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20}
+    }
+
+def chat_completion_chunks(content: str, model: str = 'stub-model'):
+    """Splits content into OpenAI-compatible `stream=True` SSE chunks."""
+    words = content.split(' ')
+    for index, word in enumerate(words):
+        delta = word if index == 0 else f" {word}"
+        chunk = {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}]
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+def openai_stub(content: str = '{"intent": "GENERAL_ADVICE", "confidence": 0.9, "reasoning": "stub"}',
+                delay: float = 0.0, token_interval: float = 0.0) -> StubServer:
+    """
+    Returns a StubServer answering /v1/chat/completions with a fixed message,
+    streamed word by word when the request sets `stream`.
+    """
+    def completions(request: StubRequest):
+        if delay:
+            time.sleep(delay)
+        body = request.body or {}
+        model = body.get('model') or 'stub-model'
+        if body.get('stream'):
+            return StreamingBody(chat_completion_chunks(content, model), interval=token_interval)
+        return chat_completion(content, model)
+
+    return StubServer({'/v1/chat/completions': completions})
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+def stub_price(symbol: str, timestamp_ms: Optional[int] = None) -> float:
+    """Deterministic price for a symbol (at a point in time) so tests can assert on it."""
+    base = 10 + sum(ord(char) for char in symbol.lower().split('_')[-1]) % 900
+    if timestamp_ms is None:
+        return float(base * 100)
+    return float(base * 50 + (timestamp_ms // DAY_MS) % 100)
+
+def market_chart(coin_id: str, days: float, now_ms: Optional[int] = None) -> Dict[str, Any]:
+    """CoinGecko `market_chart` payload: 5-minute points up to 1 day, hourly up to 90, daily beyond."""
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    step = 5 * 60 * 1000 if days <= 1 else (60 * 60 * 1000 if days <= 90 else DAY_MS)
+    start = now_ms - int(days * DAY_MS)
+    points = [start + index * step for index in range(int((now_ms - start) // step) + 1)]
+    price = stub_price(coin_id)
+    return {
+        "prices": [[point, price + (point // step) % 10] for point in points],
+        "market_caps": [[point, price * 1e6] for point in points],
+        "total_volumes": [[point, price * 1e3] for point in points]
+    }
+
+def market_stub(delay: float = 0.0) -> StubServer:
+    """
+    Returns a StubServer answering the CoinGecko (/api/v3/...) and WEEX
+    (/capi/v2/market/...) endpoints used by MarketDataService and WeexService.
+    """
+    def global_data(request: StubRequest):
+        return {"data": {"market_cap_change_percentage_24h_usd": 1.5, "market_cap_percentage": {"btc": 52.0}}}
+
+    def coins_markets(request: StubRequest):
+        return [
+            {"id": coin, "name": coin.title(), "current_price": stub_price(coin), "price_change_percentage_24h": 1.0}
+            for coin in ('bitcoin', 'ethereum', 'solana', 'ripple', 'cardano')
+        ]
+
+    def coin_chart(request: StubRequest):
+        coin_id = request.path.split('/')[4]
+        return market_chart(coin_id, float(request.query.get('days', 7)))
+
+    def ticker(request: StubRequest):
+        symbol = request.query.get('symbol', '')
+        price = stub_price(symbol)
+        return {"symbol": symbol, "last": str(price), "high_24h": str(price * 1.02),
+                "low_24h": str(price * 0.98), "priceChangePercent": "0.01"}
+
+    def history_candles(request: StubRequest):
+        symbol = request.query.get('symbol', '')
+        start = int(request.query.get('startTime', 0))
+        limit = int(request.query.get('limit', 1))
+        end = int(request.query.get('endTime', start + limit * DAY_MS))
+        candles = []
+        for open_time in range(start, min(end, start + limit * DAY_MS), DAY_MS):
+            close = stub_price(symbol, open_time)
+            candles.append([str(open_time), str(close), str(close + 1), str(close - 1), str(close), "100", "1000"])
+        return candles
+
+    return StubServer({
+        '/api/v3/global': global_data,
+        '/api/v3/coins/markets': coins_markets,
+        '/api/v3/coins': coin_chart,
+        '/capi/v2/market/ticker': ticker,
+        '/capi/v2/market/historyCandles': history_candles
+    }, delay=delay)
@@ -1,37 +1,46 @@
-
+import argparse
 import asyncio
 import os
+import time
 from dotenv import load_dotenv
-from opik import Opik
-from opik.evaluation import evaluate
-from opik.evaluation.metrics import base_metric, score_result
 from ai_agent.router import IntentRouter
 from ai_agent.types import AgentIntent
+from ai_agent.intent_examples import INTENT_EXAMPLES
+from ai_agent.local_classifier import LocalIntentClassifier
+
+try:
+    from opik import Opik
+    from opik.evaluation import evaluate
+    from opik.evaluation.metrics import base_metric, score_result
+    OPIK_AVAILABLE = True
+except ImportError:
+    OPIK_AVAILABLE = False
 
 # Load key from .env
 load_dotenv()
 
-# Metric
-class IntentAccuracy(base_metric.BaseMetric):
-    def __init__(self, name: str = "intent_accuracy"):
-        self.name = name
-
-    def score(self, output, expected_output, **kwargs):
-        actual = output.intent.value
-        expected = expected_output
-        
-        return score_result.ScoreResult(
-            name=self.name,
-            value=1.0 if actual == expected else 0.0,
-            reason=f"Expected {expected}, got {actual}"
-        )
+if OPIK_AVAILABLE:
+    # Metric
+    class IntentAccuracy(base_metric.BaseMetric):
+        def __init__(self, name: str = "intent_accuracy"):
+            self.name = name
+
+        def score(self, output, expected_output, **kwargs):
+            actual = output.intent.value
+            expected = expected_output
+
+            return score_result.ScoreResult(
+                name=self.name,
+                value=1.0 if actual == expected else 0.0,
+                reason=f"Expected {expected}, got {actual}"
+            )
 
 # Evaluation Task
 async def evaluation_task(item):
     router = IntentRouter()
     # We await the router classification
     result = await router.classify(item["input"])
-    
+
     return {
         "input": item["input"],
         "output": result,
@@ -44,27 +53,86 @@ def sync_evaluation_task(item):
     return asyncio.run(evaluation_task(item))
 
 # Dataset
-DATASET_ITEMS = [
-    {"input": "How much money do I have in stocks?", "expected": "PORTFOLIO_ANALYSIS"},
-    {"input": "What is my current asset allocation?", "expected": "PORTFOLIO_ANALYSIS"},
-    {"input": "Is my portfolio too risky?", "expected": "RISK_ASSESSMENT"},
-    {"input": "What happens if the market crashes?", "expected": "RISK_ASSESSMENT"},
-    {"input": "I want to start a new retirement plan", "expected": "INVESTMENT_PLANNING"},
-    {"input": "Create a savings goal for a car", "expected": "INVESTMENT_PLANNING"},
-    {"input": "What is the S&P 500?", "expected": "GENERAL_ADVICE"},
-    {"input": "Tell me a joke about money", "expected": "GENERAL_ADVICE"},
-]
+DATASET_ITEMS = INTENT_EXAMPLES
+
+def score_local_path(threshold: float):
+    """
+    Leave-one-out evaluation of the local classifier: each item is classified
+    by a model trained on all the other items, so nothing is scored on its
+    own training data.
+    """
+    rows = []
+    for index, item in enumerate(DATASET_ITEMS):
+        training = DATASET_ITEMS[:index] + DATASET_ITEMS[index + 1:]
+        classifier = LocalIntentClassifier(threshold=threshold, examples=training)
+        started = time.perf_counter()
+        intent, confidence, source = classifier.predict(item["input"])
+        rows.append({
+            "input": item["input"],
+            "expected": item["expected"],
+            "local": intent.value,
+            "confidence": confidence,
+            "source": source,
+            "short_circuit": confidence >= threshold,
+            "local_ms": (time.perf_counter() - started) * 1000
+        })
+    return rows
+
+async def score_llm_path(rows):
+    router = IntentRouter(use_local=False)
+    for row in rows:
+        started = time.perf_counter()
+        result = await router.classify_with_llm(row["input"])
+        row["llm"] = result.intent.value
+        row["llm_ms"] = (time.perf_counter() - started) * 1000
+
+def accuracy(rows, key):
+    return sum(row[key] == row["expected"] for row in rows) / len(rows) if rows else 0.0
+
+def run_offline(threshold: float, local_only: bool):
+    rows = score_local_path(threshold)
+    covered = [row for row in rows if row["short_circuit"]]
+    print(f"Items: {len(rows)} | threshold: {threshold}")
+    print(f"Local path: short-circuit share {len(covered) / len(rows):.0%} "
+          f"(rules {sum(row['source'] == 'rule' for row in covered)}, model {sum(row['source'] == 'model' for row in covered)}), "
+          f"accuracy on short-circuited {accuracy(covered, 'local'):.0%}, "
+          f"avg {sum(row['local_ms'] for row in rows) / len(rows):.3f} ms")
+
+    if local_only or not os.getenv("OPENROUTER_API_KEY"):
+        print("LLM path: skipped (set OPENROUTER_API_KEY to score it)")
+    else:
+        asyncio.run(score_llm_path(rows))
+        avg_llm_ms = sum(row["llm_ms"] for row in rows) / len(rows)
+        for row in rows:
+            row["hybrid"] = row["local"] if row["short_circuit"] else row["llm"]
+        print(f"LLM path: accuracy {accuracy(rows, 'llm'):.0%}, avg {avg_llm_ms:.0f} ms")
+        print(f"Hybrid: accuracy {accuracy(rows, 'hybrid'):.0%}, "
+              f"estimated latency saved {len(covered) * avg_llm_ms:.0f} ms over {len(rows)} queries")
+
+    for row in rows:
+        if row["short_circuit"] and row["local"] != row["expected"]:
+            print(f"  local miss: {row['input']!r} -> {row['local']} ({row['confidence']:.2f}), expected {row['expected']}")
 
 if __name__ == "__main__":
-    if not os.getenv("OPIK_API_KEY"):
-        print("Please set OPIK_API_KEY to run evaluation.")
+    parser = argparse.ArgumentParser(description="Evaluate the intent router")
+    parser.add_argument("--offline", action="store_true", help="Score the local and LLM paths without Opik")
+    parser.add_argument("--local-only", action="store_true", help="With --offline, skip the LLM path")
+    parser.add_argument("--threshold", type=float, default=float(os.getenv("LOCAL_ROUTER_THRESHOLD", 0.75)))
+    args = parser.parse_args()
+
+    if args.offline:
+        run_offline(args.threshold, args.local_only)
+        exit(0)
+
+    if not OPIK_AVAILABLE or not os.getenv("OPIK_API_KEY"):
+        print("Please install opik and set OPIK_API_KEY to run evaluation (or use --offline).")
         exit(1)
 
     client = Opik()
     client.auth_check()
     dataset = client.get_or_create_dataset(name="FinArth_Router_Benchmark")
     dataset.insert(DATASET_ITEMS)
-    
+
     evaluate(
         experiment_name="Router_Model_Baseline",
         dataset=dataset,
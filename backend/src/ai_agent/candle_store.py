@@ -0,0 +1,137 @@
+"""
+File: candle_store.py
+Description: Permanent store of completed WEEX daily candles behind
+             WeexService.get_history.
+
+A daily candle never changes once its day has closed, so each one is fetched
+from WEEX at most once and kept in the `candles` table (migration 005).
+Lookups are answered from an in-process LRU mirror first and SQLite second.
+Candles for the current, still open day are never stored.
+
+WeexService.backfill_candles stores a whole date range from one upstream
+call (up to CANDLE_BACKFILL_MAX_DAYS candles), e.g. ahead of looking up
+several purchase dates of the same symbol.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from utils.ttl_cache import TTLCache, register_cache
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+Candle = List[Any]
+
+def _open_time(candle: Candle) -> Optional[int]:
+    try:
+        return int(candle[0])
+    except (IndexError, TypeError, ValueError):
+        return None
+
+def _close(candle: Candle) -> Optional[float]:
+    try:
+        return float(candle[4])
+    except (IndexError, TypeError, ValueError):
+        return None
+
+class CandleStore:
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, connection: Optional[Callable[[], sqlite3.Connection]] = None,
+                 memory_entries: Optional[int] = None, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            connection: Returns the calling thread's connection to a database
+                        with the candles table (default: the primary database)
+            memory_entries: Size of the in-process mirror (CANDLE_CACHE_SIZE)
+            clock: Time source deciding which days have closed, injectable for tests
+        """
+        if connection is None:
+            from database import get_connection
+            connection = get_connection
+        self._connection = connection
+        self._clock = clock
+        self.memory = TTLCache(max_entries=memory_entries or int(os.getenv('CANDLE_CACHE_SIZE', 50000)), ttl=None)
+        self.max_backfill_days = int(os.getenv('CANDLE_BACKFILL_MAX_DAYS', 1000))
+        self._stats_lock = threading.Lock()
+        self.db_hits = 0
+        self.stored = 0
+
+    @classmethod
+    def get_instance(cls) -> 'CandleStore':
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+                    register_cache('candles', cls._instance)
+        return cls._instance
+
+    def is_closed(self, start_ms: int) -> bool:
+        """Whether the day starting at start_ms is over (its candle is final)."""
+        return start_ms + DAY_MS <= self._clock() * 1000
+
+    def get(self, symbol: str, start_ms: int) -> Optional[Candle]:
+        """
+        The stored candle opening within [start_ms, start_ms + 1 day), the
+        same one a WEEX historyCandles call for that window would return.
+        """
+        key = (symbol, start_ms)
+        candle = self.memory.get(key)
+        if candle is not None:
+            return candle
+        row = self._connection().execute(
+            "SELECT data FROM candles WHERE symbol = ? AND open_time >= ? AND open_time < ? ORDER BY open_time LIMIT 1",
+            (symbol, start_ms, start_ms + DAY_MS)
+        ).fetchone()
+        if row is None:
+            return None
+        candle = json.loads(row[0])
+        self.memory.set(key, candle)
+        with self._stats_lock:
+            self.db_hits += 1
+        return candle
+
+    def put(self, symbol: str, candles: Iterable[Candle]) -> int:
+        """Stores the closed candles among `candles`, returning how many."""
+        now = self._clock()
+        rows = []
+        for candle in candles:
+            open_time = _open_time(candle)
+            if open_time is not None and self.is_closed(open_time):
+                rows.append((symbol, open_time, _close(candle), json.dumps(candle), now))
+        if not rows:
+            return 0
+        conn = self._connection()
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO candles (symbol, open_time, close, data, fetched_at) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        conn.commit()
+        stored = conn.total_changes - before
+        with self._stats_lock:
+            self.stored += stored
+        return stored
+
+    def count(self, symbol: str, start_ms: int, end_ms: int) -> int:
+        """Stored candles of `symbol` opening within [start_ms, end_ms)."""
+        row = self._connection().execute(
+            "SELECT COUNT(*) FROM candles WHERE symbol = ? AND open_time >= ? AND open_time < ?",
+            (symbol, start_ms, end_ms)
+        ).fetchone()
+        return row[0]
+
+    def missing_days(self, symbol: str, start_ms: int, end_ms: int) -> int:
+        """Closed days in [start_ms, end_ms) without a stored candle."""
+        closed = sum(1 for day in range(start_ms, end_ms, DAY_MS) if self.is_closed(day))
+        return max(0, closed - self.count(symbol, start_ms, end_ms))
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        with self._stats_lock:
+            stats.update({'db_hits': self.db_hits, 'stored': self.stored})
+        return stats
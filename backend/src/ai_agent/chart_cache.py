@@ -0,0 +1,153 @@
+"""
+File: chart_cache.py
+Description: Cache of CoinGecko `market_chart` responses behind
+             MarketDataService.get_coin_chart.
+
+Charts are keyed on (coin, vs_currency, days). CoinGecko picks the point
+spacing from the range (5-minute points up to 1 day, hourly up to 90 days,
+daily beyond), so entries live for a TTL scaled to that spacing: a 1-day
+chart changes every few minutes, a 1-year chart once a day.
+
+A request for a shorter range is answered by slicing a cached longer range
+with the same spacing (e.g. 3d out of 7d). With CHART_CACHE_ALLOW_COARSER a
+coarser longer range may be sliced too (e.g. 1d out of hourly 7d). Concurrent
+misses for the same chart share one upstream call.
+"""
+
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+from utils.single_flight import SingleFlight
+from utils.ttl_cache import TTLCache, register_cache
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+# Point spacing (seconds) -> cache lifetime (seconds)
+GRANULARITY_TTL = {
+    5 * 60: 60,
+    60 * 60: 600,
+    24 * 60 * 60: 3600
+}
+
+Days = Union[int, float, str]
+ChartKey = Tuple[str, str, Days]
+
+def granularity(days: Days) -> int:
+    """Seconds between the points CoinGecko returns for a range of `days`."""
+    if days == 'max' or float(days) > 90:
+        return 24 * 60 * 60
+    return 5 * 60 if float(days) <= 1 else 60 * 60
+
+def slice_chart(chart: Dict[str, Any], days: Days) -> Dict[str, Any]:
+    """The last `days` of a longer chart, measured back from its newest point."""
+    prices = chart.get('prices') or []
+    if not prices:
+        return chart
+    cutoff = prices[-1][0] - float(days) * DAY_MS
+    return {
+        series: [point for point in points if point[0] >= cutoff] if isinstance(points, list) else points
+        for series, points in chart.items()
+    }
+
+class ChartCache:
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_scale: Optional[float] = None,
+                 allow_coarser: Optional[bool] = None):
+        if allow_coarser is None:
+            allow_coarser = os.getenv('CHART_CACHE_ALLOW_COARSER', 'false').lower() == 'true'
+        self.allow_coarser = allow_coarser
+        self.ttl_scale = ttl_scale if ttl_scale is not None else float(os.getenv('CHART_CACHE_TTL_SCALE', 1.0))
+        self.memory = TTLCache(max_entries=max_entries or int(os.getenv('CHART_CACHE_SIZE', 512)), ttl=None)
+        # (coin, vs_currency) -> cached numeric ranges, to find slicing candidates
+        self._ranges: Dict[Tuple[str, str], set] = {}
+        self._flights = SingleFlight()
+        self._state_lock = threading.Lock()
+        self.sliced = 0
+
+    @classmethod
+    def get_instance(cls) -> 'ChartCache':
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+                    register_cache('chart', cls._instance)
+        return cls._instance
+
+    @staticmethod
+    def key(coin_id: str, vs_currency: str, days: Days) -> ChartKey:
+        days = days if days == 'max' else float(days)
+        return (coin_id.lower(), vs_currency.lower(), days)
+
+    def ttl(self, days: Days) -> float:
+        return GRANULARITY_TTL[granularity(days)] * self.ttl_scale
+
+    def _sliceable(self, cached_days: float, days: float) -> bool:
+        if cached_days <= days:
+            return False
+        if granularity(cached_days) == granularity(days):
+            return True
+        return self.allow_coarser
+
+    def _from_longer_range(self, key: ChartKey) -> Optional[Dict[str, Any]]:
+        coin_id, vs_currency, days = key
+        if days == 'max':
+            return None
+        with self._state_lock:
+            candidates = sorted(d for d in self._ranges.get((coin_id, vs_currency), ()) if self._sliceable(d, days))
+        for cached_days in candidates:
+            # Peek without counting a miss for every candidate
+            if (coin_id, vs_currency, cached_days) not in self.memory:
+                continue
+            chart = self.memory.get((coin_id, vs_currency, cached_days))
+            if chart is not None:
+                return slice_chart(chart, days)
+        return None
+
+    def _store(self, key: ChartKey, chart: Dict[str, Any]):
+        self.memory.set(key, chart, self.ttl(key[2]))
+        if key[2] != 'max':
+            with self._state_lock:
+                self._ranges.setdefault(key[:2], set()).add(key[2])
+
+    async def get(self, coin_id: str, vs_currency: str, days: Days,
+                  fetch: Callable[[], Awaitable[Optional[Dict[str, Any]]]]) -> Optional[Dict[str, Any]]:
+        """
+        The chart for (coin, vs_currency, days): cached, sliced out of a
+        cached longer range, or fetched with `fetch()` (once for all
+        concurrent callers). Failed fetches (None) are not cached.
+        """
+        key = self.key(coin_id, vs_currency, days)
+        chart = self.memory.get(key)
+        if chart is not None:
+            return chart
+        chart = self._from_longer_range(key)
+        if chart is not None:
+            with self._state_lock:
+                self.sliced += 1
+            return chart
+
+        async def fetch_and_store():
+            chart = await fetch()
+            if chart is not None:
+                self._store(key, chart)
+            return chart
+
+        return await self._flights.do(key, fetch_and_store)
+
+    def clear(self):
+        self.memory.clear()
+        with self._state_lock:
+            self._ranges.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        with self._state_lock:
+            stats.update({
+                'upstream': self._flights.calls,
+                'sliced': self.sliced,
+                'coalesced': self._flights.coalesced,
+                'inflight': len(self._flights)
+            })
+        return stats
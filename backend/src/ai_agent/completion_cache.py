@@ -0,0 +1,105 @@
+"""
+File: completion_cache.py
+Description: Opt-in cache of chat completions in the LLM gateway.
+
+Handler prompts are built from the user profile, portfolio summary and the
+hourly market context, so an identical question from the same user state
+produces an identical message list. Completions are keyed on
+(model, hash of the messages, temperature, max_tokens) and kept until the
+TTL the handler asks for (at most the market cache expiry).
+
+Sampled completions (temperature > 0) are bypassed unless
+COMPLETION_CACHE_SAMPLED=true, since callers asking for sampling may rely on
+varied answers.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+from utils.ttl_cache import TTLCache, register_cache
+
+# OpenAI-compatible APIs sample at temperature 1 when none is given
+DEFAULT_TEMPERATURE = 1.0
+
+class CompletionCache:
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, enabled: Optional[bool] = None, allow_sampled: Optional[bool] = None,
+                 max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        if enabled is None:
+            enabled = os.getenv('COMPLETION_CACHE_ENABLED', 'false').lower() == 'true'
+        if allow_sampled is None:
+            allow_sampled = os.getenv('COMPLETION_CACHE_SAMPLED', 'false').lower() == 'true'
+        self.enabled = enabled
+        self.allow_sampled = allow_sampled
+        self.memory = TTLCache(
+            max_entries=max_entries or int(os.getenv('COMPLETION_CACHE_SIZE', 256)),
+            ttl=ttl if ttl is not None else float(os.getenv('COMPLETION_CACHE_TTL', 3600))
+        )
+        self._stats_lock = threading.Lock()
+        self.bypassed = 0
+        self.saved_prompt_tokens = 0
+        self.saved_completion_tokens = 0
+
+    @classmethod
+    def get_instance(cls) -> 'CompletionCache':
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+                    register_cache('completion', cls._instance)
+        return cls._instance
+
+    def key(self, kwargs: Dict[str, Any], ttl: Optional[float] = None) -> Optional[str]:
+        """
+        Cache key for `chat.completions.create` keyword arguments, or None
+        when the request must go upstream (cache disabled, sampled, or a
+        handler TTL of zero because the market data is about to expire).
+        """
+        if not self.enabled:
+            return None
+        temperature = kwargs.get('temperature', DEFAULT_TEMPERATURE)
+        if (temperature > 0 and not self.allow_sampled) or (ttl is not None and ttl <= 0):
+            with self._stats_lock:
+                self.bypassed += 1
+            return None
+        messages = json.dumps(
+            {'messages': kwargs.get('messages'), 'extra_body': kwargs.get('extra_body')},
+            sort_keys=True, default=str
+        )
+        digest = hashlib.sha256(messages.encode('utf-8')).hexdigest()
+        return f"{kwargs.get('model')}|{digest}|{temperature}|{kwargs.get('max_tokens')}"
+
+    def get(self, key: str):
+        response = self.memory.get(key)
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            with self._stats_lock:
+                self.saved_prompt_tokens += usage.prompt_tokens or 0
+                self.saved_completion_tokens += usage.completion_tokens or 0
+        return response
+
+    def set(self, key: str, response, ttl: Optional[float] = None):
+        if ttl is None:
+            self.memory.set(key, response)
+        else:
+            self.memory.set(key, response, ttl=ttl)
+
+    def clear(self):
+        self.memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        with self._stats_lock:
+            stats.update({
+                'enabled': self.enabled,
+                'allow_sampled': self.allow_sampled,
+                'bypassed': self.bypassed,
+                'saved_prompt_tokens': self.saved_prompt_tokens,
+                'saved_completion_tokens': self.saved_completion_tokens,
+                'saved_tokens': self.saved_prompt_tokens + self.saved_completion_tokens
+            })
+        return stats
@@ -1,15 +1,31 @@
-from typing import Dict, Any, Optional
+import os
+import threading
+from typing import Dict, Any, Optional, AsyncIterator, Tuple
 from ai_agent.types import AgentResponse, AgentIntent, RouterResult
+from ai_agent.handlers.base import BaseHandler
 from ai_agent.router import IntentRouter
 from ai_agent.handlers.portfolio import PortfolioHandler
 from ai_agent.handlers.risk import RiskHandler
 from ai_agent.handlers.planning import PlanHandler
 from ai_agent.handlers.generic import GenericHandler
 from ai_agent.handlers.market_analyst import MarketAnalystHandler
-from utils.opik_client import OpikConfig, trace
+from ai_agent.llm_gateway import llm_config
+from ai_agent.engine.context_prefetch import ContextPrefetcher
+from utils.timing import StageTimer
+from utils.opik_client import OpikConfig, StreamTrace, TraceExporter, trace
 
 class AgentOrchestrator:
-    def __init__(self):
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    # Context needed by most handlers, loaded while the router classifies
+    SPECULATIVE_CONTEXT = ("user_profile", "holdings", "market_context")
+
+    def __init__(self, prefetch: Optional[bool] = None):
+        self.config = llm_config()
+        if prefetch is None:
+            prefetch = os.getenv('AGENT_PREFETCH', 'true').lower() == 'true'
+        self.prefetch = prefetch
         # Initialize Opik client early to ensure correct project/workspace settings
         OpikConfig.get_client()
         
@@ -22,34 +38,132 @@ class AgentOrchestrator:
             AgentIntent.MARKET_ANALYSIS: MarketAnalystHandler()
         }
 
-    @trace(name="agent_orchestrator_process")
-    async def process(self, query: str, user_id: Optional[int] = None, history: list = []) -> AgentResponse:
-        """
-        Main entry point for the AI Agent.
-        Orchestrates the flow: Query -> Router -> Handler -> Response.
-        """
-        
+    async def _route(self, query: str, user_id: Optional[int], history: list, timer: StageTimer) -> Tuple[RouterResult, BaseHandler, Dict[str, Any]]:
+        """Classifies the query and picks the handler plus its context."""
+        prefetcher = ContextPrefetcher(user_id, timer)
+        if self.prefetch:
+            # Speculatively load context concurrently with classification
+            prefetcher.start(self.SPECULATIVE_CONTEXT)
+
         # 1. Route the query
-        router_result = await self.router.classify(query, history)
+        try:
+            with timer.stage("router_classification"):
+                router_result = await self.router.classify(query, history)
+        except BaseException:
+            prefetcher.cancel()
+            raise
         
         # 2. Select Handler
         handler = self.handlers.get(router_result.intent, self.handlers[AgentIntent.GENERAL_ADVICE])
+        prefetcher.keep(handler.context_needs)
         
-        # 3. Process with Handler
         # Pass router context and conversation history to handler
         context = {
             "intent_confidence": router_result.confidence,
             "intent_reasoning": router_result.reasoning,
             "original_query": query,
-            "conversation_history": history  # Pass conversation history
+            "conversation_history": history,  # Pass conversation history
+            "prefetcher": prefetcher,
+            "timer": timer
         }
+        return router_result, handler, context
+
+    def _attach_timings(self, response: AgentResponse, handler: BaseHandler, timer: StageTimer):
+        """Adds per-stage timings (ms) and the wall-clock saved by prefetching."""
+        stages = timer.stages
+        loads = [key for key in handler.context_needs if key in stages]
+        sequential = stages.get("router_classification", 0) + sum(stages[key] for key in loads)
+        finished = [timer.finished_at[key] for key in loads + ["router_classification"] if key in timer.finished_at]
+        overlapped = (max(finished) - timer.started) * 1000 if finished else sequential
+
+        timings = timer.as_dict()
+        timings["prefetch_saved"] = round(max(0.0, sequential - overlapped), 2)
+        response.metadata = dict(response.metadata or {})
+        response.metadata["timings"] = timings
+        response.metadata["prefetch"] = self.prefetch
+
+    @trace(name="agent_orchestrator_process")
+    async def process(self, query: str, user_id: Optional[int] = None, history: list = [],
+                      timer: Optional[StageTimer] = None) -> AgentResponse:
+        """
+        Main entry point for the AI Agent.
+        Orchestrates the flow: Query -> Router -> Handler -> Response.
+        Pass the request's `timer` to report stages timed before the call too.
+        """
+        timer = timer or StageTimer()
+        router_result, handler, context = await self._route(query, user_id, history, timer)
         
-        response = await handler.process(query, user_id, context)
+        # 3. Process with Handler
+        try:
+            response = await handler.process(query, user_id, context)
+        finally:
+            context["prefetcher"].cancel()
+        self._attach_timings(response, handler, timer)
         
         # Capture current trace ID
         response.trace_id = OpikConfig.get_current_trace_id()
         
-        # Ensure traces are sent
-        OpikConfig.flush()
+        # Traces are sent by the background exporter, off the request path
+        if OpikConfig.is_active():
+            TraceExporter.get_instance().mark_spans_pending()
         
         return response
+
+    async def stream(self, query: str, user_id: Optional[int] = None, history: list = [],
+                     timer: Optional[StageTimer] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of `process`. Yields events in order:
+          {"event": "route", "data": {...}}    as soon as the intent is known
+          {"event": "token", "data": "..."}    for every generated text delta
+          {"event": "response", "data": AgentResponse} once generation ends
+        The whole stream is one Opik trace, whose id is set on the response.
+        """
+        timer = timer or StageTimer()
+        stream_trace = StreamTrace("agent_orchestrator_stream", input={"query": query, "user_id": user_id})
+        output = None
+        try:
+            router_result, handler, context = await self._route(query, user_id, history, timer)
+            yield {
+                "event": "route",
+                "data": {
+                    "intent": router_result.intent.value,
+                    "confidence": router_result.confidence,
+                    "reasoning": router_result.reasoning,
+                    "handler": type(handler).__name__
+                }
+            }
+
+            try:
+                async for item in handler.stream(query, user_id, context):
+                    if isinstance(item, AgentResponse):
+                        self._attach_timings(item, handler, timer)
+                        item.trace_id = stream_trace.id
+                        output = {"content": item.content, "intent": item.intent.value}
+                        yield {"event": "response", "data": item}
+                    else:
+                        yield {"event": "token", "data": item}
+            finally:
+                context["prefetcher"].cancel()
+        finally:
+            stream_trace.end(output)
+
+    @classmethod
+    def get_instance(cls) -> 'AgentOrchestrator':
+        """
+        Application-scoped orchestrator. Built once and reused by every
+        request; rebuilt lazily when the LLM configuration changes.
+        """
+        config = llm_config()
+        instance = cls._instance
+        if instance is not None and instance.config == config:
+            return instance
+        with cls._instance_lock:
+            if cls._instance is None or cls._instance.config != config:
+                cls._instance = cls()
+            return cls._instance
+
+    @classmethod
+    def reset(cls):
+        """Drops the shared orchestrator so the next lookup rebuilds it."""
+        with cls._instance_lock:
+            cls._instance = None
@@ -0,0 +1,61 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+from ai_agent.engine.user_service import UserService
+from ai_agent.tools import MarketDataService
+from utils.timing import StageTimer
+
+# Context every handler may need, keyed by the name handlers declare in
+# `context_needs`. Database lookups run in worker threads so they overlap
+# with the router's LLM call instead of blocking the event loop.
+CONTEXT_LOADERS: Dict[str, Callable[[Optional[int]], Awaitable[Any]]] = {
+    "user_profile": lambda user_id: asyncio.to_thread(UserService.get_user_profile, user_id) if user_id else _value({}),
+    "holdings": lambda user_id: asyncio.to_thread(UserService.get_user_holdings, user_id) if user_id else _value([]),
+    "market_context": lambda user_id: MarketDataService.get_market_context(),
+}
+
+async def _value(value):
+    return value
+
+class ContextPrefetcher:
+    """
+    Starts context loads speculatively (e.g. while the intent router is still
+    classifying) and hands the results to whichever handler wins.
+    """
+
+    def __init__(self, user_id: Optional[int], timer: Optional[StageTimer] = None):
+        self.user_id = user_id
+        self.timer = timer or StageTimer()
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    def start(self, keys: Iterable[str]):
+        for key in keys:
+            if key not in self.tasks:
+                self.tasks[key] = asyncio.ensure_future(self._timed(key))
+        return self
+
+    async def _timed(self, key: str):
+        # Only completed loads are timed; cancelled or failed ones would skew the stage latencies
+        started = time.perf_counter()
+        value = await CONTEXT_LOADERS[key](self.user_id)
+        self.timer.record(key, started)
+        return value
+
+    def keep(self, keys: Iterable[str]):
+        """Cancels speculative loads the chosen handler does not need."""
+        wanted = set(keys)
+        for key, task in list(self.tasks.items()):
+            if key not in wanted:
+                task.cancel()
+                del self.tasks[key]
+
+    async def get(self, key: str):
+        """Returns the prefetched value, loading it on demand if it was not started."""
+        if key not in self.tasks:
+            self.start([key])
+        return await self.tasks[key]
+
+    def cancel(self):
+        for task in self.tasks.values():
+            task.cancel()
+        self.tasks.clear()
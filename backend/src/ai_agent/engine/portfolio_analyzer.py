@@ -1,70 +1,162 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 from collections import defaultdict
+from functools import lru_cache
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Basic Risk Score (Heuristic based on categories)
+# 1-10 Scale: Crypto=9, Tech=7, Bonds=3, Cash=1
+RISK_MAP = {
+    "Crypto": 9,
+    "Cryptocurrency": 9,
+    "Stock": 7,
+    "Equity": 7,
+    "Technology": 8,
+    "ETF": 5,
+    "Bond": 3,
+    "Real Estate": 4,
+    "Cash": 1
+}
+# Default to medium risk (5) if unknown
+DEFAULT_RISK = 5
+_RISK_KEYS = tuple((key.lower(), val) for key, val in RISK_MAP.items())
+
+TOP_ASSETS = 3
+# Below this many holdings array setup costs more than the Python loop
+VECTORIZE_MIN_HOLDINGS = 64
+
+@lru_cache(maxsize=1024)
+def category_risk(category: str) -> int:
+    """Risk score of a category: the first RISK_MAP key contained in its name."""
+    # Simple keyword matching
+    name = category.lower() if isinstance(category, str) else ''
+    for key, val in _RISK_KEYS:
+        if key in name:
+            return val
+    return DEFAULT_RISK
 
 class PortfolioAnalyzer:
     """
     Deterministic engine for analyzing portfolio data before AI processing.
+
+    Large portfolios are analysed column-wise with NumPy (amounts, category
+    codes and risk weights as arrays) when it is installed, small ones with
+    the pure-Python loop; both produce the same dict.
     """
-    
+
+    @staticmethod
+    def _empty() -> Dict[str, Any]:
+        return {
+            "total_value": 0,
+            "allocation": {},
+            "risk_score": 0,
+            "diversity_score": 0,
+            "top_holdings": []
+        }
+
     @staticmethod
-    def analyze_holdings(holdings: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _asset(h: Dict[str, Any], total_value: float, amount: Any = None) -> Dict[str, Any]:
+        if amount is None:
+            amount = h.get('amount', 0)
+        return {
+            "symbol": h.get("symbol", "N/A"),
+            "name": h.get("name", "Unknown"),
+            "value": amount,
+            "weight": (amount / total_value) if total_value > 0 else 0
+        }
+
+    @staticmethod
+    def analyze_holdings(holdings: List[Dict[str, Any]], values: Optional[Sequence[float]] = None) -> Dict[str, Any]:
         """
         Calculates core metrics from a list of holdings.
+
+        Args:
+            holdings: Rows of portfolio_holdings
+            values: Current value of each holding (e.g. from
+                    PortfolioValuation.mark_to_market); defaults to the
+                    invested `amount`
         """
         if not holdings:
-            return {
-                "total_value": 0,
-                "allocation": {},
-                "risk_score": 0,
-                "diversity_score": 0,
-                "top_holdings": []
-            }
-
-        total_value = sum(h.get('amount', 0) for h in holdings)
-        
+            return PortfolioAnalyzer._empty()
+        if NUMPY_AVAILABLE and len(holdings) >= VECTORIZE_MIN_HOLDINGS:
+            return PortfolioAnalyzer._analyze_vectorized(holdings, values)
+        return PortfolioAnalyzer._analyze_python(holdings, values)
+
+    @staticmethod
+    def _analyze_vectorized(holdings: List[Dict[str, Any]], values: Optional[Sequence[float]] = None) -> Dict[str, Any]:
+        count = len(holdings)
+        if values is not None:
+            amounts = np.asarray(values, dtype=np.float64)
+        else:
+            amounts = np.fromiter((h.get('amount', 0) for h in holdings), dtype=np.float64, count=count)
+
+        # Category codes in first-seen order, so allocation keeps the same key order
+        codes_by_category: Dict[Any, int] = {}
+        codes = np.fromiter(
+            (codes_by_category.setdefault(h.get('category', 'Uncategorized'), len(codes_by_category)) for h in holdings),
+            dtype=np.intp, count=count
+        )
+        categories = list(codes_by_category)
+
+        total_value = float(amounts.sum())
+        category_totals = np.bincount(codes, weights=amounts, minlength=len(categories))
+        if total_value > 0:
+            category_weights = category_totals / total_value
+        else:
+            category_weights = np.zeros(len(categories))
+        allocation_pct = dict(zip(categories, category_weights.tolist()))
+
+        risk_weights = np.fromiter((category_risk(cat) for cat in categories), dtype=np.float64, count=len(categories))
+        weighted_risk = float(risk_weights @ category_weights)
+
+        return {
+            "total_value": total_value,
+            "allocation": allocation_pct,
+            "risk_metric": round(weighted_risk, 2),
+            "holdings_count": count,
+            "top_3_assets": [
+                PortfolioAnalyzer._asset(holdings[i], total_value, None if values is None else values[i])
+                for i in PortfolioAnalyzer._top_indices(amounts)
+            ]
+        }
+
+    @staticmethod
+    def _top_indices(values: 'np.ndarray', n: int = TOP_ASSETS) -> List[int]:
+        """Indices of the n largest values, ties in original order (like a stable sort)."""
+        n = min(n, len(values))
+        if n < len(values):
+            threshold = values[np.argpartition(values, -n)[-n]]
+            candidates = np.flatnonzero(values >= threshold)
+        else:
+            candidates = np.arange(len(values))
+        order = np.argsort(-values[candidates], kind='stable')
+        return candidates[order[:n]].tolist()
+
+    @staticmethod
+    def _analyze_python(holdings: List[Dict[str, Any]], values: Optional[Sequence[float]] = None) -> Dict[str, Any]:
+        if values is None:
+            values = [h.get('amount', 0) for h in holdings]
+        total_value = sum(values)
+
         # Category Allocation
         allocation = defaultdict(float)
         assets = []
-        
-        for h in holdings:
-            amount = h.get('amount', 0)
+
+        for h, amount in zip(holdings, values):
             category = h.get('category', 'Uncategorized')
             allocation[category] += amount
-            
-            assets.append({
-                "symbol": h.get("symbol", "N/A"),
-                "name": h.get("name", "Unknown"),
-                "value": amount,
-                "weight": (amount / total_value) if total_value > 0 else 0
-            })
+            assets.append(PortfolioAnalyzer._asset(h, total_value, amount))
 
         # Calculate percentages
         allocation_pct = {k: (v / total_value) if total_value > 0 else 0 for k, v in allocation.items()}
-        
-        # Basic Risk Score (Heuristic based on categories)
-        # 1-10 Scale: Crypto=9, Tech=7, Bonds=3, Cash=1
-        risk_map = {
-            "Crypto": 9,
-            "Cryptocurrency": 9,
-            "Stock": 7,
-            "Equity": 7,
-            "Technology": 8,
-            "ETF": 5,
-            "Bond": 3,
-            "Real Estate": 4,
-            "Cash": 1
-        }
-        
+
         weighted_risk = 0
         for cat, weight in allocation_pct.items():
-            # Default to medium risk (5) if unknown
-            # Simple keyword matching
-            score = 5
-            for key, val in risk_map.items():
-                if key.lower() in cat.lower():
-                    score = val
-                    break
-            weighted_risk += score * weight
+            weighted_risk += category_risk(cat) * weight
 
         # Sort top holdings
         assets.sort(key=lambda x: x['value'], reverse=True)
@@ -74,5 +166,5 @@ class PortfolioAnalyzer:
             "allocation": allocation_pct,
             "risk_metric": round(weighted_risk, 2),
             "holdings_count": len(holdings),
-            "top_3_assets": assets[:3]
+            "top_3_assets": assets[:TOP_ASSETS]
         }
@@ -0,0 +1,162 @@
+import asyncio
+import os
+from typing import Any, Dict, List, Tuple
+from ai_agent.tools import WeexService
+from ai_agent.engine.portfolio_analyzer import PortfolioAnalyzer
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Holdings in these categories are priced from WEEX tickers
+PRICED_CATEGORIES = ("Crypto", "Cryptocurrency")
+
+class PortfolioValuation:
+    """
+    Mark-to-market valuation of portfolio holdings.
+
+    `amount` is what was invested. A priced holding (a WEEX symbol with a
+    ticker and a positive `entry_price`) is worth amount / entry_price units
+    at the current price; any other holding is carried at its invested amount.
+    Prices come from one ticker lookup per distinct symbol (through the
+    ticker cache), and the whole portfolio is valued in one array pass (a
+    plain loop when NumPy is not installed).
+    """
+
+    PRICE_CONCURRENCY = int(os.getenv("VALUATION_PRICE_CONCURRENCY", 8))
+
+    @staticmethod
+    def _is_priced(h: Dict[str, Any]) -> bool:
+        return h.get('category') in PRICED_CATEGORIES and bool(h.get('symbol'))
+
+    @staticmethod
+    async def fetch_prices(holdings: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Current price per normalized `cmt_` symbol, fetched once per distinct symbol."""
+        symbols = {WeexService.weex_symbol(h['symbol']) for h in holdings if PortfolioValuation._is_priced(h)}
+        semaphore = asyncio.Semaphore(PortfolioValuation.PRICE_CONCURRENCY)
+
+        async def price(symbol):
+            async with semaphore:
+                try:
+                    ticker = await WeexService.get_ticker(symbol)
+                    return float(ticker['last']) if ticker else None
+                except Exception as e:
+                    print(f"Valuation price error for {symbol}: {str(e)}")
+                    return None
+
+        symbols = list(symbols)
+        prices = await asyncio.gather(*(price(symbol) for symbol in symbols))
+        return {symbol: value for symbol, value in zip(symbols, prices) if value is not None and value > 0}
+
+    @staticmethod
+    def mark_to_market(holdings: List[Dict[str, Any]], prices: Dict[str, float],
+                       include_holdings: bool = False) -> Dict[str, Any]:
+        """
+        Values `holdings` at `prices` (from fetch_prices).
+
+        Returns totals (invested, current value, unrealized P&L), allocation
+        by category at current value, and `values`: the current value of each
+        holding, aligned with `holdings` (for PortfolioAnalyzer). With
+        include_holdings, per-holding detail is added under 'holdings'.
+        """
+        count = len(holdings)
+        # One pass over the rows; symbols repeat, so each is resolved to a price once
+        nan = float('nan')
+        price_by_symbol: Dict[str, float] = {}
+        codes_by_category: Dict[Any, int] = {}
+        invested, entry, price, codes = [], [], [], []
+        for h in holdings:
+            invested.append(h.get('amount') or 0)
+            entry.append(h.get('entry_price') or 0)
+            codes.append(codes_by_category.setdefault(h.get('category', 'Uncategorized'), len(codes_by_category)))
+            symbol = h.get('symbol')
+            if symbol and h.get('category') in PRICED_CATEGORIES:
+                current = price_by_symbol.get(symbol)
+                if current is None:
+                    current = price_by_symbol[symbol] = prices.get(WeexService.weex_symbol(symbol), nan)
+                price.append(current)
+            else:
+                price.append(nan)
+        if NUMPY_AVAILABLE:
+            values, priced, category_values = PortfolioValuation._value_arrays(invested, entry, price, codes, len(codes_by_category))
+        else:
+            values, priced, category_values = PortfolioValuation._value_lists(invested, entry, price, codes, len(codes_by_category))
+
+        total_invested = float(sum(invested))
+        total_value = float(sum(values))
+        unrealized_pnl = total_value - total_invested
+        if total_value > 0:
+            allocation = {category: value / total_value for category, value in zip(codes_by_category, category_values)}
+        else:
+            allocation = {category: 0 for category in codes_by_category}
+
+        result = {
+            "total_invested": round(total_invested, 2),
+            "total_value": round(total_value, 2),
+            "unrealized_pnl": round(unrealized_pnl, 2),
+            "unrealized_pnl_pct": round(unrealized_pnl / total_invested * 100, 2) if total_invested > 0 else None,
+            "allocation": allocation,
+            "holdings_count": count,
+            "priced_count": sum(priced),
+            "values": values
+        }
+        if include_holdings:
+            result["holdings"] = []
+            for h, invested_amount, current_price, value, is_priced in zip(holdings, invested, price, values, priced):
+                gain = value - invested_amount
+                gain_pct = gain * 100 / invested_amount if invested_amount > 0 else 0
+                result["holdings"].append({
+                    "id": h.get('id'),
+                    "name": h.get('name'),
+                    "symbol": h.get('symbol'),
+                    "category": h.get('category'),
+                    "invested": float(invested_amount),
+                    "current_price": current_price if is_priced else None,
+                    "current_value": round(value, 2),
+                    "unrealized_pnl": round(gain, 2),
+                    "unrealized_pnl_pct": round(gain_pct, 2) if is_priced else None,
+                    "priced": is_priced
+                })
+        return result
+
+    @staticmethod
+    def _value_arrays(invested: List[float], entry: List[float], price: List[float], codes: List[int],
+                      categories: int) -> Tuple[List[float], List[bool], List[float]]:
+        """Current values, priced flags and per-category values, computed column-wise."""
+        invested = np.array(invested, dtype=np.float64)
+        entry = np.array(entry, dtype=np.float64)
+        price = np.array(price, dtype=np.float64)
+        codes = np.array(codes, dtype=np.intp)
+
+        priced = ~np.isnan(price) & (entry > 0)
+        units = np.divide(invested, entry, out=np.zeros(len(invested)), where=priced)
+        values = np.where(priced, units * np.nan_to_num(price), invested)
+        category_values = np.bincount(codes, weights=values, minlength=categories)
+        return values.tolist(), priced.tolist(), category_values.tolist()
+
+    @staticmethod
+    def _value_lists(invested: List[float], entry: List[float], price: List[float], codes: List[int],
+                     categories: int) -> Tuple[List[float], List[bool], List[float]]:
+        """Same as _value_arrays, one holding at a time."""
+        values, priced = [], []
+        category_values = [0.0] * categories
+        for amount, entry_price, current, code in zip(invested, entry, price, codes):
+            # NaN marks a holding without a price
+            is_priced = current == current and entry_price > 0
+            value = amount / entry_price * current if is_priced else amount
+            values.append(value)
+            priced.append(is_priced)
+            category_values[code] += value
+        return values, priced, category_values
+
+    @staticmethod
+    async def value_portfolio(holdings: List[Dict[str, Any]], include_holdings: bool = True) -> Dict[str, Any]:
+        """Prices and values a portfolio, adding the risk metric and top assets at current value."""
+        prices = await PortfolioValuation.fetch_prices(holdings)
+        valuation = PortfolioValuation.mark_to_market(holdings, prices, include_holdings=include_holdings)
+        analysis = PortfolioAnalyzer.analyze_holdings(holdings, values=valuation.pop("values"))
+        valuation["risk_metric"] = analysis.get("risk_metric", 0)
+        valuation["top_3_assets"] = analysis.get("top_3_assets", [])
+        return valuation
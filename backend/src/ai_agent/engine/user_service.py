@@ -1,6 +1,5 @@
-import sqlite3
-from typing import Dict, Any, Optional
-from database import db_path
+from typing import Dict, Any, Optional, List
+from database import get_connection
 from ai_agent.session_cache import session_cache
 
 class UserService:
@@ -27,16 +26,13 @@ class UserService:
 
         # 2. Try Database
         try:
-            conn = sqlite3.connect(str(db_path))
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+            cursor = get_connection().cursor()
             
             # Get basic profile
             cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
             user = cursor.fetchone()
             
             if not user:
-                conn.close()
                 return {}
             
             profile = dict(user)
@@ -49,8 +45,6 @@ class UserService:
             cursor.execute("SELECT objective FROM user_objectives WHERE user_id = ?", (user_id,))
             profile['selected_options'] = [row[0] for row in cursor.fetchall()]
             
-            conn.close()
-            
             # Update cache for next time
             session_cache.set(user_id, {
                 'name': profile.get('name'),
@@ -68,3 +62,19 @@ class UserService:
         except Exception as e:
             print(f"User Service Error: {e}")
             return {}
+
+    @staticmethod
+    def get_user_holdings(user_id: int) -> List[Dict[str, Any]]:
+        """
+        Fetches the user's portfolio holdings from the database.
+        """
+        if not user_id:
+            return []
+        try:
+            cursor = get_connection().cursor()
+            cursor.execute("SELECT * FROM portfolio_holdings WHERE user_id = ?", (user_id,))
+            rows = cursor.fetchall()
+            return [dict(row) for row in rows]
+        except Exception as e:
+            print(f"User Service Error: {e}")
+            return []
@@ -1,23 +1,133 @@
+import os
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
-from ai_agent.types import AgentResponse, AgentIntent
+from typing import Dict, Any, Optional, Union, AsyncIterator, Tuple
+from ai_agent.types import AgentResponse, AgentIntent, LLMRequest
+from ai_agent.llm_gateway import get_llm_gateway
+from ai_agent.engine.context_prefetch import ContextPrefetcher
+from ai_agent.tools import MarketDataService
+from utils.opik_client import trace
 
 class BaseHandler(ABC):
     """
     Abstract Base Class for all specialized agent handlers.
+
+    Subclasses only build the prompt in `prepare`; the LLM call itself is
+    shared so that the same prompt can be answered in one shot (`process`)
+    or token by token (`stream`).
     """
-    
+
+    intent: AgentIntent = AgentIntent.GENERAL_ADVICE
+    # Context this handler reads via `load`; the orchestrator prefetches it
+    context_needs: Tuple[str, ...] = ("user_profile",)
+
+    def __init__(self):
+        # Shared AsyncOpenAI client and connection pool, see ai_agent.llm_gateway
+        self.llm = get_llm_gateway()
+        self._model_name = os.getenv('MODEL_NAME')
+
     @abstractmethod
-    async def process(self, query: str, user_id: Optional[int], context: Dict[str, Any] = {}) -> AgentResponse:
+    async def prepare(self, query: str, user_id: Optional[int], context: Dict[str, Any] = {}) -> Union[LLMRequest, AgentResponse]:
         """
-        Process the user query and return an AgentResponse.
-        
+        Build the LLM request for the user query.
+
         Args:
             query: The user's input question
             user_id: The ID of the authenticated user (if any)
             context: Additional context from the router/orchestrator
-            
+
         Returns:
-            AgentResponse containing the final answer and metadata
+            LLMRequest to send to the model, or an AgentResponse when the
+            handler can answer without one (e.g. user not logged in)
         """
         pass
+
+    async def load(self, key: str, user_id: Optional[int], context: Dict[str, Any]):
+        """
+        Returns a piece of handler context ("user_profile", "holdings" or
+        "market_context"), using the orchestrator's prefetched result when
+        available.
+        """
+        prefetcher = context.get("prefetcher")
+        if prefetcher is None:
+            prefetcher = ContextPrefetcher(user_id, context.get("timer"))
+        return await prefetcher.get(key)
+
+    def cache_ttl(self) -> Optional[float]:
+        """
+        How long this handler's completions may be served from the completion
+        cache. Prompts embedding the market context are only valid until the
+        market cache expires; others use the cache default (None).
+        """
+        if "market_context" in self.context_needs:
+            return MarketDataService.cache_expires_in()
+        return None
+
+    def _completion_kwargs(self, request: LLMRequest) -> Dict[str, Any]:
+        kwargs = {
+            "model": self._model_name,
+            "messages": request.messages,
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens,
+            "cache_ttl": request.cache_ttl if request.cache_ttl is not None else self.cache_ttl()
+        }
+        if request.extra_body:
+            kwargs["extra_body"] = request.extra_body
+        return kwargs
+
+    def _error_response(self, error: Exception) -> AgentResponse:
+        return AgentResponse(
+            content=f"API Error ({self._model_name}): {str(error)}",
+            intent=self.intent,
+            metadata={"error": str(error)}
+        )
+
+    @trace(name="handler_process")
+    async def process(self, query: str, user_id: Optional[int], context: Dict[str, Any] = {}) -> AgentResponse:
+        """
+        Process the user query and return an AgentResponse containing the
+        final answer and metadata.
+        """
+        request = await self.prepare(query, user_id, context)
+        if isinstance(request, AgentResponse):
+            return request
+
+        started = time.perf_counter()
+        try:
+            response = await self.llm.chat(**self._completion_kwargs(request))
+            content = response.choices[0].message.content
+        except Exception as e:
+            return self._error_response(e)
+        finally:
+            if context.get("timer"):
+                context["timer"].record("llm_generation", started)
+
+        return AgentResponse(content=content, intent=self.intent, metadata=request.metadata)
+
+    async def stream(self, query: str, user_id: Optional[int], context: Dict[str, Any] = {}) -> AsyncIterator[Union[str, AgentResponse]]:
+        """
+        Same as `process` but yields text deltas as the model produces them.
+        The last item yielded is always the assembled AgentResponse.
+        """
+        request = await self.prepare(query, user_id, context)
+        if isinstance(request, AgentResponse):
+            yield request.content
+            yield request
+            return
+
+        parts = []
+        started = time.perf_counter()
+        try:
+            async for delta in self.llm.stream_chat(**self._completion_kwargs(request)):
+                parts.append(delta)
+                yield delta
+        except Exception as e:
+            error_response = self._error_response(e)
+            yield error_response.content
+            yield error_response
+            return
+        finally:
+            if context.get("timer"):
+                context["timer"].record("llm_generation", started)
+
+        yield AgentResponse(content="".join(parts), intent=self.intent, metadata=request.metadata)
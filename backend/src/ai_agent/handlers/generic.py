@@ -1,28 +1,18 @@
-import os
-from typing import Dict, Any, Optional
-from openai import OpenAI
-from ai_agent.types import AgentResponse, AgentIntent
+from typing import Dict, Any, Optional, Union
+from ai_agent.types import AgentResponse, AgentIntent, LLMRequest
 from ai_agent.handlers.base import BaseHandler
-from utils.opik_client import OpikConfig, trace
-
-from ai_agent.engine.user_service import UserService
+from utils.opik_client import trace
 
 class GenericHandler(BaseHandler):
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=os.getenv('OPENROUTER_API_KEY'),
-            base_url="https://openrouter.ai/api/v1"
-        )
-        self.client = OpikConfig.track_openai_client(self.client)
-        # Upgraded to a more capable model for better financial advice
-        self._model_name = os.getenv('MODEL_NAME')  # or 'mistralai/mistral-7b-instruct:free'
+    intent = AgentIntent.GENERAL_ADVICE
+    context_needs = ("user_profile",)
 
-    @trace(name="handler_generic_process")
-    async def process(self, query: str, user_id: Optional[int], context: Dict[str, Any] = {}) -> AgentResponse:
+    @trace(name="handler_generic_prepare")
+    async def prepare(self, query: str, user_id: Optional[int], context: Dict[str, Any] = {}) -> Union[LLMRequest, AgentResponse]:
         """
         Handles general financial questions or casual chat.
         """
-        user_profile = UserService.get_user_profile(user_id) if user_id else {}
+        user_profile = await self.load("user_profile", user_id, context)
         user_name = user_profile.get('name', 'User')
         user_country = user_profile.get('country', 'International')
         risk_tolerance = user_profile.get('risk_tolerance', 'moderate')
@@ -59,30 +49,13 @@ Guidelines:
         
         messages.append({"role": "user", "content": query})
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self._model_name,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1500,
-                extra_body={
-                    "metadata": {
-                        "handler": "GenericHandler",
-                        "user_id": user_id
-                    }
+        return LLMRequest(
+            messages=messages,
+            metadata={"handler": "GenericHandler"},
+            extra_body={
+                "metadata": {
+                    "handler": "GenericHandler",
+                    "user_id": user_id
                 }
-            )
-            content = response.choices[0].message.content
-            
-            return AgentResponse(
-                content=content,
-                intent=AgentIntent.GENERAL_ADVICE,
-                metadata={"handler": "GenericHandler"}
-            )
-            
-        except Exception as e:
-            return AgentResponse(
-                content=f"API Error ({self._model_name}): {str(e)}",
-                intent=AgentIntent.GENERAL_ADVICE,
-                metadata={"error": str(e)}
-            )
+            }
+        )
@@ -1,33 +1,22 @@
-import os
-import json
-from typing import Dict, Any, Optional
-from openai import OpenAI
-from ai_agent.types import AgentResponse, AgentIntent
+from typing import Dict, Any, Optional, Union
+from ai_agent.types import AgentResponse, AgentIntent, LLMRequest
 from ai_agent.handlers.base import BaseHandler
-from ai_agent.tools import MarketDataService
-from utils.opik_client import OpikConfig, trace
-
-from ai_agent.engine.user_service import UserService
+from utils.opik_client import trace
 
 class MarketAnalystHandler(BaseHandler):
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=os.getenv('OPENROUTER_API_KEY'),
-            base_url="https://openrouter.ai/api/v1"
-        )
-        self.client = OpikConfig.track_openai_client(self.client)
-        self._model_name = os.getenv('MODEL_NAME')
+    intent = AgentIntent.MARKET_ANALYSIS
+    context_needs = ("user_profile", "market_context")
 
-    @trace(name="handler_market_analyst_process")
-    async def process(self, query: str, user_id: Optional[int], context: Dict[str, Any] = {}) -> AgentResponse:
+    @trace(name="handler_market_analyst_prepare")
+    async def prepare(self, query: str, user_id: Optional[int], context: Dict[str, Any] = {}) -> Union[LLMRequest, AgentResponse]:
         """
         Provides deep analysis of market trends and real-time sentiment.
         """
-        user_profile = UserService.get_user_profile(user_id) if user_id else {}
+        user_profile = await self.load("user_profile", user_id, context)
         user_name = user_profile.get('name', 'User')
         user_country = user_profile.get('country', 'International')
         
-        market_data = await MarketDataService.get_market_context()
+        market_data = await self.load("market_context", user_id, context)
 
         system_message = f"""You are a Senior Market Strategist named FinArth with expertise in technical and fundamental analysis.
 
@@ -52,35 +41,18 @@ Market Context:
         
         messages.append({"role": "user", "content": query})
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self._model_name,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1500,
-                extra_body={
-                    "metadata": {
-                        "handler": "MarketAnalystHandler",
-                        "user_id": user_id,
-                        "location": user_country
-                    }
-                }
-            )
-            content = response.choices[0].message.content
-            
-            return AgentResponse(
-                content=content,
-                intent=AgentIntent.MARKET_ANALYSIS,
-                metadata={
+        return LLMRequest(
+            messages=messages,
+            metadata={
+                "handler": "MarketAnalystHandler",
+                "model": self._model_name,
+                "location": user_country
+            },
+            extra_body={
+                "metadata": {
                     "handler": "MarketAnalystHandler",
-                    "model": self._model_name,
+                    "user_id": user_id,
                     "location": user_country
                 }
-            )
-            
-        except Exception as e:
-            return AgentResponse(
-                content=f"API Error ({self._model_name}): {str(e)}",
-                intent=AgentIntent.MARKET_ANALYSIS,
-                metadata={"error": str(e)}
-            )
+            }
+        )
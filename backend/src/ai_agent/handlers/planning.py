@@ -1,27 +1,14 @@
-import os
-import sqlite3 
-import json
-from typing import Dict, Any, Optional
-from openai import OpenAI
-from ai_agent.types import AgentResponse, AgentIntent
+from typing import Dict, Any, Optional, Union
+from ai_agent.types import AgentResponse, AgentIntent, LLMRequest
 from ai_agent.handlers.base import BaseHandler
-from ai_agent.tools import MarketDataService
-from utils.opik_client import OpikConfig, trace
-from database import db_path
-
-from ai_agent.engine.user_service import UserService
+from utils.opik_client import trace
 
 class PlanHandler(BaseHandler):
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=os.getenv('OPENROUTER_API_KEY'),
-            base_url="https://openrouter.ai/api/v1"
-        )
-        self.client = OpikConfig.track_openai_client(self.client)
-        self._model_name = os.getenv('MODEL_NAME')
+    intent = AgentIntent.INVESTMENT_PLANNING
+    context_needs = ("user_profile", "market_context")
 
-    @trace(name="handler_planning_process")
-    async def process(self, query: str, user_id: Optional[int], context: Dict[str, Any] = {}) -> AgentResponse:
+    @trace(name="handler_planning_prepare")
+    async def prepare(self, query: str, user_id: Optional[int], context: Dict[str, Any] = {}) -> Union[LLMRequest, AgentResponse]:
         """
         Helps user with investment planning and goal setting.
         """
@@ -32,12 +19,12 @@ class PlanHandler(BaseHandler):
                  metadata={"error": "User not logged in"}
              )
 
-        user_profile = UserService.get_user_profile(user_id)
+        user_profile = await self.load("user_profile", user_id, context)
         user_name = user_profile.get('name', 'User')
         user_country = user_profile.get('country', 'International')
         objectives = user_profile.get('selected_options', [])
         
-        market_context = await MarketDataService.get_market_context()
+        market_context = await self.load("market_context", user_id, context)
 
         system_message = f"""You are FinArth, a Strategic Financial Planner specializing in goal-based investing.
 
@@ -65,33 +52,16 @@ Market Context:
         
         messages.append({"role": "user", "content": query})
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self._model_name,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1500,
-                extra_body={
-                    "metadata": {
-                        "handler": "PlanHandler",
-                        "user_id": user_id
-                    }
-                }
-            )
-            content = response.choices[0].message.content
-            
-            return AgentResponse(
-                content=content,
-                intent=AgentIntent.INVESTMENT_PLANNING,
-                metadata={
+        return LLMRequest(
+            messages=messages,
+            metadata={
+                "handler": "PlanHandler",
+                "goals_count": len(objectives)
+            },
+            extra_body={
+                "metadata": {
                     "handler": "PlanHandler",
-                    "goals_count": len(objectives)
+                    "user_id": user_id
                 }
-            )
-            
-        except Exception as e:
-            return AgentResponse(
-                content=f"API Error ({self._model_name}): {str(e)}",
-                intent=AgentIntent.INVESTMENT_PLANNING,
-                metadata={"error": str(e)}
-            )
+            }
+        )
@@ -1,43 +1,17 @@
-import os
-import sqlite3 
 import json
-from typing import Dict, Any, Optional
-from openai import OpenAI
-from ai_agent.types import AgentResponse, AgentIntent
+from typing import Dict, Any, Optional, Union
+from ai_agent.types import AgentResponse, AgentIntent, LLMRequest
 from ai_agent.handlers.base import BaseHandler
-from ai_agent.tools import MarketDataService
-from utils.opik_client import OpikConfig, trace
-from database import db_path  # Import db_path to connect
+from utils.opik_client import trace
 from ai_agent.engine.portfolio_analyzer import PortfolioAnalyzer
-
-from ai_agent.engine.user_service import UserService
+from ai_agent.engine.portfolio_valuation import PortfolioValuation
 
 class PortfolioHandler(BaseHandler):
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=os.getenv('OPENROUTER_API_KEY'),
-            base_url="https://openrouter.ai/api/v1"
-        )
-        self.client = OpikConfig.track_openai_client(self.client)
-        self._model_name = os.getenv('MODEL_NAME')
-
-    def _get_user_holdings(self, user_id: int):
-        if not user_id:
-            return []
-        try:
-            conn = sqlite3.connect(str(db_path))
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM portfolio_holdings WHERE user_id = ?", (user_id,))
-            rows = cursor.fetchall()
-            conn.close()
-            return [dict(row) for row in rows]
-        except Exception as e:
-            print(f"DB Error: {e}")
-            return []
+    intent = AgentIntent.PORTFOLIO_ANALYSIS
+    context_needs = ("user_profile", "holdings", "market_context")
 
-    @trace(name="handler_portfolio_process")
-    async def process(self, query: str, user_id: Optional[int], context: Dict[str, Any] = {}) -> AgentResponse:
+    @trace(name="handler_portfolio_prepare")
+    async def prepare(self, query: str, user_id: Optional[int], context: Dict[str, Any] = {}) -> Union[LLMRequest, AgentResponse]:
         """
         Analyzes the user's portfolio holdings.
         """
@@ -48,11 +22,11 @@ class PortfolioHandler(BaseHandler):
                 metadata={"error": "User not logged in"}
             )
 
-        user_profile = UserService.get_user_profile(user_id)
+        user_profile = await self.load("user_profile", user_id, context)
         user_name = user_profile.get('name', 'User')
         user_country = user_profile.get('country', 'International')
 
-        holdings = self._get_user_holdings(user_id)
+        holdings = await self.load("holdings", user_id, context)
         
         if not holdings:
             return AgentResponse(
@@ -61,10 +35,13 @@ class PortfolioHandler(BaseHandler):
                 metadata={"status": "empty_portfolio"}
             )
 
-        # Deterministic Analysis
-        analysis = PortfolioAnalyzer.analyze_holdings(holdings)
+        # Deterministic Analysis at current market prices
+        prices = await PortfolioValuation.fetch_prices(holdings)
+        valuation = PortfolioValuation.mark_to_market(holdings, prices)
+        analysis = PortfolioAnalyzer.analyze_holdings(holdings, values=valuation['values'])
+        pnl_pct = valuation['unrealized_pnl_pct']
 
-        market_context = await MarketDataService.get_market_context()
+        market_context = await self.load("market_context", user_id, context)
 
         system_message = f"""You are FinArth, an expert Portfolio Analyst specializing in asset allocation and risk management.
 
@@ -74,6 +51,8 @@ User Profile:
 
 Portfolio Summary:
 - Total Value: ${analysis['total_value']:.2f}
+- Invested: ${valuation['total_invested']:.2f}
+- Unrealized P&L: ${valuation['unrealized_pnl']:.2f}{f" ({pnl_pct:+.2f}%)" if pnl_pct is not None else ""}
 - Risk Score: {analysis['risk_metric']}/10
 - Allocation: {json.dumps(analysis['allocation'], indent=2)}
 - Top Assets: {json.dumps(analysis['top_3_assets'], indent=2)}
@@ -95,36 +74,20 @@ Market Context:
         
         messages.append({"role": "user", "content": query})
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self._model_name,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1500,
-                extra_body={
-                    "metadata": {
-                        "handler": "PortfolioHandler",
-                        "user_id": user_id,
-                        "holdings_count": len(holdings)
-                    }
+        return LLMRequest(
+            messages=messages,
+            metadata={
+                "handler": "PortfolioHandler",
+                "holdings_count": len(holdings),
+                "total_value": analysis['total_value'],
+                "unrealized_pnl": valuation['unrealized_pnl'],
+                "model": self._model_name
+            },
+            extra_body={
+                "metadata": {
+                    "handler": "PortfolioHandler",
+                    "user_id": user_id,
+                    "holdings_count": len(holdings)
                 }
-            )
-            content = response.choices[0].message.content
-            
-            return AgentResponse(
-                content=content,
-                intent=AgentIntent.PORTFOLIO_ANALYSIS,
-                metadata={
-                    "handler": "PortfolioHandler", 
-                    "holdings_count": len(holdings),
-                    "total_value": analysis['total_value'],
-                    "model": self._model_name
-                }
-            )
-            
-        except Exception as e:
-            return AgentResponse(
-                content=f"API Error ({self._model_name}): {str(e)}",
-                intent=AgentIntent.PORTFOLIO_ANALYSIS,
-                metadata={"error": str(e)}
-            )
+            }
+        )
@@ -1,49 +1,15 @@
-import os
-import sqlite3 
 import json
-from typing import Dict, Any, Optional
-from openai import OpenAI
-from ai_agent.types import AgentResponse, AgentIntent
+from typing import Dict, Any, Optional, Union
+from ai_agent.types import AgentResponse, AgentIntent, LLMRequest
 from ai_agent.handlers.base import BaseHandler
-from ai_agent.tools import MarketDataService
-from utils.opik_client import OpikConfig, trace
-from database import db_path
+from utils.opik_client import trace
 
 class RiskHandler(BaseHandler):
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=os.getenv('OPENROUTER_API_KEY'),
-            base_url="https://openrouter.ai/api/v1"
-        )
-        self.client = OpikConfig.track_openai_client(self.client)
-        self._model_name = os.getenv('MODEL_NAME')
-
-    def _get_user_profile(self, user_id: int):
-        if not user_id:
-             return None
-        try:
-            conn = sqlite3.connect(str(db_path))
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("SELECT risk_preference, age, country FROM users WHERE id = ?", (user_id,))
-            row = cursor.fetchone()
-            
-            # Also get holdings for context
-            cursor.execute("SELECT category, amount FROM portfolio_holdings WHERE user_id = ?", (user_id,))
-            holdings = cursor.fetchall()
-            
-            conn.close()
-            
-            return {
-                "profile": dict(row) if row else {},
-                "holdings": [dict(h) for h in holdings]
-            }
-        except Exception as e:
-            print(f"DB Error: {e}")
-            return None
+    intent = AgentIntent.RISK_ASSESSMENT
+    context_needs = ("user_profile", "holdings", "market_context")
 
-    @trace(name="handler_risk_process")
-    async def process(self, query: str, user_id: Optional[int], context: Dict[str, Any] = {}) -> AgentResponse:
+    @trace(name="handler_risk_prepare")
+    async def prepare(self, query: str, user_id: Optional[int], context: Dict[str, Any] = {}) -> Union[LLMRequest, AgentResponse]:
         """
         Analyzes the risk associated with the user's portfolio and profile.
         """
@@ -54,17 +20,16 @@ class RiskHandler(BaseHandler):
                  metadata={"error": "User not logged in"}
              )
 
-        data = self._get_user_profile(user_id)
-        if not data or not data["profile"]:
+        profile = await self.load("user_profile", user_id, context)
+        if not profile:
             return AgentResponse(
                 content="I couldn't find your risk profile. Please update it in your settings.",
                 intent=AgentIntent.RISK_ASSESSMENT,
                  metadata={"status": "missing_profile"}
             )
             
-        profile = data["profile"]
-        holdings = data["holdings"]
-        market_context = await MarketDataService.get_market_context()
+        holdings = await self.load("holdings", user_id, context)
+        market_context = await self.load("market_context", user_id, context)
 
         # Simple aggregation for prompt
         allocation_summary = {}
@@ -98,33 +63,16 @@ Market Context:
         
         messages.append({"role": "user", "content": query})
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self._model_name,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1500,
-                extra_body={
-                    "metadata": {
-                        "handler": "RiskHandler",
-                        "user_id": user_id
-                    }
-                }
-            )
-            content = response.choices[0].message.content
-            
-            return AgentResponse(
-                content=content,
-                intent=AgentIntent.RISK_ASSESSMENT,
-                metadata={
+        return LLMRequest(
+            messages=messages,
+            metadata={
+                "handler": "RiskHandler",
+                "risk_preference": profile.get('risk_preference')
+            },
+            extra_body={
+                "metadata": {
                     "handler": "RiskHandler",
-                    "risk_preference": profile.get('risk_preference')
+                    "user_id": user_id
                 }
-            )
-            
-        except Exception as e:
-            return AgentResponse(
-                content=f"API Error ({self._model_name}): {str(e)}",
-                intent=AgentIntent.RISK_ASSESSMENT,
-                metadata={"error": str(e)}
-            )
+            }
+        )
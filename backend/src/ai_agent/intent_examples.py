@@ -0,0 +1,78 @@
+"""
+Labelled example queries per AgentIntent.
+
+Used to train the local intent classifier and as the offline benchmark in
+scripts/evaluation/evaluate_router.py.
+"""
+
+INTENT_EXAMPLES = [
+    # PORTFOLIO_ANALYSIS
+    {"input": "How much money do I have in stocks?", "expected": "PORTFOLIO_ANALYSIS"},
+    {"input": "What is my current asset allocation?", "expected": "PORTFOLIO_ANALYSIS"},
+    {"input": "How is my portfolio doing?", "expected": "PORTFOLIO_ANALYSIS"},
+    {"input": "How am I doing with my investments?", "expected": "PORTFOLIO_ANALYSIS"},
+    {"input": "Show me a breakdown of my holdings", "expected": "PORTFOLIO_ANALYSIS"},
+    {"input": "What are my top performing assets?", "expected": "PORTFOLIO_ANALYSIS"},
+    {"input": "What is the total value of my portfolio?", "expected": "PORTFOLIO_ANALYSIS"},
+    {"input": "Analyze my current holdings", "expected": "PORTFOLIO_ANALYSIS"},
+    {"input": "How much of my portfolio is in crypto?", "expected": "PORTFOLIO_ANALYSIS"},
+    {"input": "Which of my investments gained the most?", "expected": "PORTFOLIO_ANALYSIS"},
+    {"input": "Give me a summary of my portfolio performance", "expected": "PORTFOLIO_ANALYSIS"},
+    {"input": "Should I rebalance my current allocation?", "expected": "PORTFOLIO_ANALYSIS"},
+
+    # RISK_ASSESSMENT
+    {"input": "Is my portfolio too risky?", "expected": "RISK_ASSESSMENT"},
+    {"input": "What happens if the market crashes?", "expected": "RISK_ASSESSMENT"},
+    {"input": "How volatile are my investments?", "expected": "RISK_ASSESSMENT"},
+    {"input": "Does my portfolio match my risk profile?", "expected": "RISK_ASSESSMENT"},
+    {"input": "Am I taking too much risk for my age?", "expected": "RISK_ASSESSMENT"},
+    {"input": "How safe are my savings in a downturn?", "expected": "RISK_ASSESSMENT"},
+    {"input": "What is my risk exposure to crypto?", "expected": "RISK_ASSESSMENT"},
+    {"input": "How much could I lose in a recession?", "expected": "RISK_ASSESSMENT"},
+    {"input": "Is my risk tolerance aligned with my holdings?", "expected": "RISK_ASSESSMENT"},
+    {"input": "How do I protect my investments from a market drop?", "expected": "RISK_ASSESSMENT"},
+    {"input": "Assess the risk of my current investments", "expected": "RISK_ASSESSMENT"},
+    {"input": "Am I too conservative with my investments?", "expected": "RISK_ASSESSMENT"},
+
+    # INVESTMENT_PLANNING
+    {"input": "I want to start a new retirement plan", "expected": "INVESTMENT_PLANNING"},
+    {"input": "Create a savings goal for a car", "expected": "INVESTMENT_PLANNING"},
+    {"input": "How much should I save each month to retire at 50?", "expected": "INVESTMENT_PLANNING"},
+    {"input": "What should I buy with 10000 rupees?", "expected": "INVESTMENT_PLANNING"},
+    {"input": "Help me plan for my child's education", "expected": "INVESTMENT_PLANNING"},
+    {"input": "I want to buy a house in 5 years, how should I invest?", "expected": "INVESTMENT_PLANNING"},
+    {"input": "Suggest a monthly SIP plan for me", "expected": "INVESTMENT_PLANNING"},
+    {"input": "Where should I invest my bonus?", "expected": "INVESTMENT_PLANNING"},
+    {"input": "Build me an investment plan to reach 1 crore", "expected": "INVESTMENT_PLANNING"},
+    {"input": "Is my retirement goal realistic?", "expected": "INVESTMENT_PLANNING"},
+    {"input": "How do I plan for early retirement?", "expected": "INVESTMENT_PLANNING"},
+    {"input": "Set up a plan to save for a vacation", "expected": "INVESTMENT_PLANNING"},
+
+    # GENERAL_ADVICE
+    {"input": "What is the S&P 500?", "expected": "GENERAL_ADVICE"},
+    {"input": "Tell me a joke about money", "expected": "GENERAL_ADVICE"},
+    {"input": "What is the difference between an ETF and a mutual fund?", "expected": "GENERAL_ADVICE"},
+    {"input": "Explain compound interest", "expected": "GENERAL_ADVICE"},
+    {"input": "What does diversification mean?", "expected": "GENERAL_ADVICE"},
+    {"input": "Hello, who are you?", "expected": "GENERAL_ADVICE"},
+    {"input": "What can you do?", "expected": "GENERAL_ADVICE"},
+    {"input": "How is crypto taxed in India?", "expected": "GENERAL_ADVICE"},
+    {"input": "Who regulates the stock market in India?", "expected": "GENERAL_ADVICE"},
+    {"input": "What is a bond?", "expected": "GENERAL_ADVICE"},
+    {"input": "Define expense ratio", "expected": "GENERAL_ADVICE"},
+    {"input": "Thanks for the help!", "expected": "GENERAL_ADVICE"},
+
+    # MARKET_ANALYSIS
+    {"input": "What's the bitcoin price?", "expected": "MARKET_ANALYSIS"},
+    {"input": "What's happening in the market today?", "expected": "MARKET_ANALYSIS"},
+    {"input": "Is the crypto market bullish right now?", "expected": "MARKET_ANALYSIS"},
+    {"input": "Give me the latest market news", "expected": "MARKET_ANALYSIS"},
+    {"input": "How is ethereum trending this week?", "expected": "MARKET_ANALYSIS"},
+    {"input": "What are the top gainers today?", "expected": "MARKET_ANALYSIS"},
+    {"input": "Analyze the current stock market trend", "expected": "MARKET_ANALYSIS"},
+    {"input": "Why is the market down today?", "expected": "MARKET_ANALYSIS"},
+    {"input": "What is the current price of solana?", "expected": "MARKET_ANALYSIS"},
+    {"input": "What is the bitcoin dominance now?", "expected": "MARKET_ANALYSIS"},
+    {"input": "How did Nifty perform today?", "expected": "MARKET_ANALYSIS"},
+    {"input": "Market outlook for crypto this month", "expected": "MARKET_ANALYSIS"},
+]
@@ -0,0 +1,171 @@
+"""
+File: llm_gateway.py
+Description: Single entry point for OpenRouter access shared by the router,
+             every handler and the ReAct agent.
+
+All LLM calls go through one AsyncOpenAI client (and therefore one keep-alive
+connection pool, using HTTP/2 when the `h2` package is installed) so that
+router classification, tool fetches and generation interleave on the event
+loop instead of blocking it. When OPENROUTER_API_KEY, OPENROUTER_BASE_URL or
+MODEL_NAME change, the next lookup transparently builds a fresh gateway.
+"""
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Optional, Tuple
+try:
+    # Newer openai SDKs are built on httpx2; older ones on httpx
+    import httpx2 as httpx
+except ImportError:
+    import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from openai.types.chat import ChatCompletion
+from ai_agent.completion_cache import CompletionCache
+from utils.opik_client import OpikConfig
+from utils.logger import Logger
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = Logger.get_instance()
+
+DEFAULT_BASE_URL = 'https://openrouter.ai/api/v1'
+
+def llm_config() -> Tuple[Optional[str], str, Optional[str]]:
+    """Returns the (api_key, base_url, model) triple the gateway is keyed on."""
+    return (
+        os.getenv('OPENROUTER_API_KEY'),
+        os.getenv('OPENROUTER_BASE_URL', DEFAULT_BASE_URL),
+        os.getenv('MODEL_NAME')
+    )
+
+class LLMGateway:
+    _instance = None
+    _lock = threading.Lock()
+
+    # Keep-alive pool shared by every handler
+    MAX_CONNECTIONS = 100
+    MAX_KEEPALIVE_CONNECTIONS = 20
+    KEEPALIVE_EXPIRY = 30.0
+
+    def __init__(self, config: Tuple[Optional[str], str, Optional[str]]):
+        self.config = config
+        self.api_key, self.base_url, self.model_name = config
+        # httpx async pools are bound to the loop that created them. With the
+        # shared AsyncRunner loop this holds exactly one client; extra entries
+        # only appear for ad-hoc loops (tests, scripts, per_request mode).
+        self._clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]' = weakref.WeakKeyDictionary()
+        self._clients_lock = threading.Lock()
+        self.completion_cache = CompletionCache.get_instance()
+
+    @classmethod
+    def get_instance(cls) -> 'LLMGateway':
+        """Returns the shared gateway, rebuilding it if the LLM config changed."""
+        config = llm_config()
+        instance = cls._instance
+        if instance is not None and instance.config == config:
+            return instance
+        with cls._lock:
+            if cls._instance is None or cls._instance.config != config:
+                # In-flight requests keep their reference to the old gateway
+                cls._instance = cls(config)
+                logger.info('LLM gateway initialised', metadata={
+                    'base_url': config[1],
+                    'model': config[2],
+                    'http2': HTTP2_AVAILABLE
+                })
+            return cls._instance
+
+    def _build_client(self):
+        http_client = DefaultAsyncHttpxClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=self.MAX_CONNECTIONS,
+                max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=self.KEEPALIVE_EXPIRY
+            )
+        )
+        client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, http_client=http_client)
+        # Wrap with Opik once per pool instead of once per handler
+        return OpikConfig.track_openai_client(client)
+
+    @property
+    def client(self):
+        """AsyncOpenAI client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            with self._clients_lock:
+                client = self._clients.get(loop)
+                if client is None:
+                    client = self._build_client()
+                    self._clients[loop] = client
+        return client
+
+    async def chat(self, cache_ttl: Optional[float] = None, **kwargs):
+        """
+        Awaitable chat completion. Accepts the same keyword arguments as
+        `chat.completions.create`; `model` defaults to MODEL_NAME.
+
+        `cache_ttl` opts the call into the completion cache for that many
+        seconds (see ai_agent.completion_cache); None uses the cache default.
+        """
+        kwargs.setdefault('model', self.model_name)
+        key = self.completion_cache.key(kwargs, cache_ttl)
+        if key is not None:
+            cached = self.completion_cache.get(key)
+            if cached is not None:
+                return cached
+
+        response = await self.client.chat.completions.create(**kwargs)
+        if key is not None and response.choices:
+            self.completion_cache.set(key, response, cache_ttl)
+        return response
+
+    async def stream_chat(self, cache_ttl: Optional[float] = None, **kwargs) -> AsyncIterator[str]:
+        """
+        Streams a chat completion (`stream=True`) and yields the text deltas
+        as they arrive from the upstream model. A cached completion is
+        yielded as a single delta.
+        """
+        kwargs.setdefault('model', self.model_name)
+        key = self.completion_cache.key(kwargs, cache_ttl)
+        if key is not None:
+            cached = self.completion_cache.get(key)
+            if cached is not None:
+                yield cached.choices[0].message.content or ""
+                return
+
+        parts = []
+        usage = None
+        stream = await self.client.chat.completions.create(stream=True, **kwargs)
+        async for chunk in stream:
+            # Some providers report usage on the final chunk
+            usage = getattr(chunk, 'usage', None) or usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+
+        if key is not None:
+            # Store in the same shape as `chat` so either call can serve it
+            self.completion_cache.set(key, ChatCompletion(
+                id='cached-stream',
+                object='chat.completion',
+                created=int(time.time()),
+                model=kwargs['model'],
+                choices=[{'index': 0, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': ''.join(parts)}}],
+                usage=usage
+            ), cache_ttl)
+
+def get_llm_gateway() -> LLMGateway:
+    """Shared gateway for the current configuration."""
+    return LLMGateway.get_instance()
@@ -0,0 +1,310 @@
+"""
+File: local_classifier.py
+Description: In-process fast path for intent routing.
+
+Most queries ("What's the bitcoin price?", "How is my portfolio doing?") do not
+need an LLM round trip to be routed. LocalIntentClassifier answers them from
+high-precision keyword rules and a small TF-IDF + logistic regression model
+trained at startup on ai_agent.intent_examples. High-confidence LLM decisions
+logged with ROUTER_LOG_DECISIONS (deduplicated by text, most recent first) are
+folded in by a retrain on a background thread, while the seed model serves.
+Anything below LOCAL_ROUTER_THRESHOLD (or a follow-up that depends on
+conversation history) falls back to the LLM router.
+
+RouterStats keeps the share of queries answered locally and the LLM latency
+that was avoided, exposed via the health blueprint.
+"""
+
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from ai_agent.intent_examples import INTENT_EXAMPLES
+from ai_agent.types import AgentIntent, RouterResult
+from utils.logger import Logger
+
+logger = Logger.get_instance()
+
+DEFAULT_THRESHOLD = 0.75
+RULE_CONFIDENCE = 0.9
+# Only confident LLM decisions are fed back as training data
+LOG_MIN_CONFIDENCE = 0.8
+# Distinct logged queries used for training; training time grows linearly with it
+MAX_LOGGED_EXAMPLES = int(os.getenv('ROUTER_MAX_LOGGED_EXAMPLES', 300))
+DEFAULT_DECISION_LOG = Path(__file__).parent.parent / 'logs' / 'router_decisions.jsonl'
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9&]+")
+
+# Each rule is unambiguous on its own; when rules for two different intents
+# match the same query the rules abstain and the model decides.
+KEYWORD_RULES: List[Tuple[re.Pattern, AgentIntent]] = [
+    (re.compile(r"\b(price|prices|dominance|top (gainers|losers)|market (today|news|outlook|trend)|happening in the market)\b"), AgentIntent.MARKET_ANALYSIS),
+    (re.compile(r"\b(bullish|bearish)\b"), AgentIntent.MARKET_ANALYSIS),
+    (re.compile(r"\b(risky|volatile|volatility|downturn|crash|crashes|recession|drawdown)\b"), AgentIntent.RISK_ASSESSMENT),
+    (re.compile(r"\b(my risk|risk (of|profile|tolerance|exposure|appetite)|protect my)\b"), AgentIntent.RISK_ASSESSMENT),
+    (re.compile(r"\b(my (portfolio|holdings|asset allocation|allocation)|how am i doing)\b"), AgentIntent.PORTFOLIO_ANALYSIS),
+    (re.compile(r"\b(retire|retirement|sip|savings goal|save for|saving for|plan for|investment plan)\b"), AgentIntent.INVESTMENT_PLANNING),
+    (re.compile(r"^(hi|hello|hey|thanks|thank you)\b"), AgentIntent.GENERAL_ADVICE),
+    (re.compile(r"^(what is|what does|define|explain)\b(?!.*\b(my|i)\b)"), AgentIntent.GENERAL_ADVICE),
+]
+
+# With conversation history these queries depend on earlier turns, which
+# only the LLM router sees
+FOLLOW_UP_PATTERN = re.compile(r"^(and|also|what about|how about|why|what if|ok|okay|so)\b|\b(it|that|this|those|them|these)\b")
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word unigrams plus bigrams."""
+    words = TOKEN_PATTERN.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+class TfidfLogisticModel:
+    """
+    Multinomial logistic regression over sparse, L2-normalised TF-IDF
+    vectors. Pure Python: training grows linearly with the examples (about
+    80ms on the seed set, 0.5s with 300 logged decisions); prediction takes
+    microseconds.
+    """
+
+    def __init__(self, epochs: int = 100, learning_rate: float = 1.0, l2: float = 3e-3, seed: int = 7):
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.seed = seed
+        self.labels: List[str] = []
+        self.idf: Dict[str, float] = {}
+        self.weights: Dict[str, List[float]] = {}
+        self.bias: List[float] = []
+
+    def vectorize(self, text: str) -> Dict[str, float]:
+        counts = Counter(token for token in tokenize(text) if token in self.idf)
+        vector = {token: (1.0 + math.log(count)) * self.idf[token] for token, count in counts.items()}
+        norm = math.sqrt(sum(value * value for value in vector.values())) or 1.0
+        return {token: value / norm for token, value in vector.items()}
+
+    def _scores(self, vector: Dict[str, float]) -> List[float]:
+        scores = list(self.bias)
+        for token, value in vector.items():
+            for index, weight in enumerate(self.weights[token]):
+                scores[index] += weight * value
+        top = max(scores)
+        exps = [math.exp(score - top) for score in scores]
+        total = sum(exps)
+        return [value / total for value in exps]
+
+    def fit(self, texts: List[str], labels: List[str]) -> 'TfidfLogisticModel':
+        self.labels = sorted(set(labels))
+        documents = [set(tokenize(text)) for text in texts]
+        document_frequency = Counter(token for document in documents for token in document)
+        total = len(texts)
+        self.idf = {token: math.log((1 + total) / (1 + df)) + 1.0 for token, df in document_frequency.items()}
+        self.weights = {token: [0.0] * len(self.labels) for token in self.idf}
+        self.bias = [0.0] * len(self.labels)
+
+        samples = [(self.vectorize(text), self.labels.index(label)) for text, label in zip(texts, labels)]
+        rng = random.Random(self.seed)
+        for epoch in range(self.epochs):
+            rng.shuffle(samples)
+            rate = self.learning_rate / (1.0 + 0.05 * epoch)
+            for vector, target in samples:
+                probabilities = self._scores(vector)
+                for index, probability in enumerate(probabilities):
+                    gradient = probability - (1.0 if index == target else 0.0)
+                    self.bias[index] -= rate * gradient
+                    for token, value in vector.items():
+                        weights = self.weights[token]
+                        weights[index] -= rate * (gradient * value + self.l2 * weights[index])
+        return self
+
+    def predict(self, text: str) -> Tuple[Optional[str], float]:
+        """Returns (label, probability); label is None for out-of-vocabulary text."""
+        vector = self.vectorize(text)
+        if not vector or not self.labels:
+            return None, 0.0
+        probabilities = self._scores(vector)
+        best = max(range(len(probabilities)), key=probabilities.__getitem__)
+        return self.labels[best], probabilities[best]
+
+class RouterStats:
+    """Counters for the local fast path versus the LLM fallback."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.local_rule = 0
+        self.local_model = 0
+        self.llm = 0
+        self.local_ms = 0.0
+        self.llm_ms = 0.0
+
+    def record_local(self, source: str, elapsed_ms: float):
+        with self._lock:
+            if source == 'rule':
+                self.local_rule += 1
+            else:
+                self.local_model += 1
+            self.local_ms += elapsed_ms
+
+    def record_llm(self, elapsed_ms: float):
+        with self._lock:
+            self.llm += 1
+            self.llm_ms += elapsed_ms
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            local = self.local_rule + self.local_model
+            total = local + self.llm
+            avg_llm_ms = self.llm_ms / self.llm if self.llm else 0.0
+            return {
+                'total': total,
+                'local_rule': self.local_rule,
+                'local_model': self.local_model,
+                'llm_fallback': self.llm,
+                'short_circuit_share': round(local / total, 4) if total else 0.0,
+                'avg_local_ms': round(self.local_ms / local, 3) if local else 0.0,
+                'avg_llm_ms': round(avg_llm_ms, 2),
+                # Each local answer saved roughly one average LLM classification
+                'latency_saved_ms': round(max(local * avg_llm_ms - self.local_ms, 0.0), 2)
+            }
+
+class LocalIntentClassifier:
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, threshold: Optional[float] = None, examples: Optional[Iterable[Dict[str, str]]] = None,
+                 decision_log: Optional[Path] = None, log_decisions: Optional[bool] = None):
+        self.threshold = threshold if threshold is not None else float(os.getenv('LOCAL_ROUTER_THRESHOLD', DEFAULT_THRESHOLD))
+        self.decision_log = Path(decision_log or os.getenv('ROUTER_DECISION_LOG', DEFAULT_DECISION_LOG))
+        # Logging stores raw user queries in plain text, so it is opt-in
+        if log_decisions is None:
+            log_decisions = os.getenv('ROUTER_LOG_DECISIONS', 'false').lower() == 'true'
+        self.log_decisions = log_decisions
+        self.stats = RouterStats()
+        self._log_lock = threading.Lock()
+
+        self.examples = list(examples if examples is not None else INTENT_EXAMPLES)
+        self.model = self._train(self.examples, [])
+        self._trainer: Optional[threading.Thread] = None
+        logged = self._load_logged_decisions() if examples is None else []
+        if logged:
+            self._trainer = threading.Thread(target=self._retrain, args=(logged,), name='intent-classifier-train', daemon=True)
+            self._trainer.start()
+
+    def _train(self, items: List[Dict[str, str]], logged: List[Dict[str, str]]) -> TfidfLogisticModel:
+        started = time.perf_counter()
+        model = TfidfLogisticModel().fit(
+            [item['input'] for item in items + logged],
+            [item['expected'] for item in items + logged]
+        )
+        logger.debug('Local intent classifier trained', metadata={
+            'examples': len(items),
+            'logged_decisions': len(logged),
+            'vocabulary': len(model.idf),
+            'train_ms': round((time.perf_counter() - started) * 1000, 2),
+            'threshold': self.threshold
+        })
+        return model
+
+    def _retrain(self, logged: List[Dict[str, str]]):
+        try:
+            self.model = self._train(self.examples, logged)
+        except Exception as e:
+            logger.error('Could not train on router decision log', metadata={'error': str(e)})
+
+    def wait_until_trained(self, timeout: Optional[float] = None) -> bool:
+        """Waits for the background retrain on logged decisions; True once it is done."""
+        if self._trainer is not None:
+            self._trainer.join(timeout)
+            return not self._trainer.is_alive()
+        return True
+
+    @classmethod
+    def get_instance(cls) -> 'LocalIntentClassifier':
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def _load_logged_decisions(self) -> List[Dict[str, str]]:
+        if not self.decision_log.exists():
+            return []
+        # Latest label per distinct query, most recently logged last
+        decisions: 'OrderedDict[str, Tuple[str, str]]' = OrderedDict()
+        try:
+            with open(self.decision_log, 'r') as f:
+                for line in f:
+                    try:
+                        item = json.loads(line)
+                    except ValueError:
+                        continue
+                    text = item.get('input')
+                    if item.get('expected') in AgentIntent.__members__ and text:
+                        key = ' '.join(text.lower().split())
+                        decisions.pop(key, None)
+                        decisions[key] = (text, item['expected'])
+        except OSError as e:
+            logger.error('Could not read router decision log', metadata={'error': str(e)})
+        recent = list(decisions.values())[-MAX_LOGGED_EXAMPLES:] if MAX_LOGGED_EXAMPLES > 0 else []
+        return [{'input': text, 'expected': expected} for text, expected in recent]
+
+    def match_rules(self, query: str) -> Optional[AgentIntent]:
+        """Intent of the matching keyword rules, or None if none or several intents match."""
+        text = query.lower().strip()
+        matched = {intent for pattern, intent in KEYWORD_RULES if pattern.search(text)}
+        return matched.pop() if len(matched) == 1 else None
+
+    def predict(self, query: str) -> Tuple[AgentIntent, float, str]:
+        """
+        Best local guess regardless of threshold: (intent, confidence, source)
+        where source is 'rule' or 'model'.
+        """
+        intent = self.match_rules(query)
+        if intent is not None:
+            return intent, RULE_CONFIDENCE, 'rule'
+        label, probability = self.model.predict(query)
+        if label is None:
+            return AgentIntent.GENERAL_ADVICE, 0.0, 'model'
+        return AgentIntent(label), probability, 'model'
+
+    def classify(self, query: str, history: List[Dict[str, Any]] = []) -> Optional[RouterResult]:
+        """
+        Returns a RouterResult when the local path is confident enough,
+        otherwise None so the caller falls back to the LLM router.
+        """
+        if not query or not query.strip():
+            return None
+        if history and FOLLOW_UP_PATTERN.search(query.lower()):
+            return None
+
+        started = time.perf_counter()
+        intent, confidence, source = self.predict(query)
+        if confidence < self.threshold:
+            return None
+        self.stats.record_local(source, (time.perf_counter() - started) * 1000)
+        return RouterResult(
+            intent=intent,
+            confidence=round(confidence, 4),
+            reasoning=f"Local classifier ({source})"
+        )
+
+    def log_decision(self, query: str, result: RouterResult):
+        """
+        Appends a confident LLM decision so the next start trains on it
+        (only with ROUTER_LOG_DECISIONS). Blocking file I/O: call it off the
+        event loop.
+        """
+        if not self.log_decisions or result.confidence < LOG_MIN_CONFIDENCE or not query:
+            return
+        line = json.dumps({'input': query, 'expected': result.intent.value, 'confidence': result.confidence})
+        try:
+            with self._log_lock:
+                self.decision_log.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.decision_log, 'a') as f:
+                    f.write(line + '\n')
+        except OSError as e:
+            logger.error('Could not write router decision log', metadata={'error': str(e)})
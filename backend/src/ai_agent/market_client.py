@@ -0,0 +1,148 @@
+"""
+File: market_client.py
+Description: Pooled async HTTP client shared by the CoinGecko and WEEX
+             market-data services.
+
+Every market-data request goes through one httpx AsyncClient per event loop
+(in practice the shared AsyncRunner loop), so concurrent snapshot refreshes,
+chart lookups and ticker calls reuse keep-alive connections instead of
+opening a new one each time. Requests are capped per host, time out, and
+are retried with jittered exponential backoff on connection errors, 429 and
+5xx responses.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import weakref
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+try:
+    # Newer openai SDKs are built on httpx2; older ones on httpx
+    import httpx2 as httpx
+except ImportError:
+    import httpx
+from utils.logger import Logger
+
+logger = Logger.get_instance()
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class MarketHttpClient:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_connections: Optional[int] = None, max_per_host: Optional[int] = None,
+                 timeout: Optional[float] = None, connect_timeout: Optional[float] = None,
+                 retries: Optional[int] = None, backoff: Optional[float] = None,
+                 keepalive_expiry: float = 30.0):
+        self.max_connections = max_connections or int(os.getenv('MARKET_HTTP_MAX_CONNECTIONS', 50))
+        self.max_per_host = max_per_host or int(os.getenv('MARKET_HTTP_MAX_PER_HOST', 10))
+        self.timeout = timeout or float(os.getenv('MARKET_HTTP_TIMEOUT', 10))
+        self.connect_timeout = connect_timeout or float(os.getenv('MARKET_HTTP_CONNECT_TIMEOUT', 3))
+        self.retries = retries if retries is not None else int(os.getenv('MARKET_HTTP_RETRIES', 2))
+        self.backoff = backoff if backoff is not None else float(os.getenv('MARKET_HTTP_BACKOFF', 0.25))
+        self.keepalive_expiry = keepalive_expiry
+        # httpx pools and asyncio semaphores are bound to the loop that created them
+        self._clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]' = weakref.WeakKeyDictionary()
+        self._host_limits: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]' = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+
+    @classmethod
+    def get_instance(cls) -> 'MarketHttpClient':
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def _build_client(self):
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout)
+        )
+
+    @property
+    def client(self):
+        """AsyncClient bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(loop)
+                if client is None:
+                    client = self._build_client()
+                    self._clients[loop] = client
+                    self._host_limits[loop] = {}
+        return client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        limits = self._host_limits[asyncio.get_running_loop()]
+        host = urlsplit(url).netloc
+        semaphore = limits.get(host)
+        if semaphore is None:
+            semaphore = limits[host] = asyncio.Semaphore(self.max_per_host)
+        return semaphore
+
+    def _delay(self, attempt: int) -> float:
+        # Full jitter keeps retries from synchronising across requests
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+                  headers: Optional[Dict[str, str]] = None):
+        """
+        GET with retries. Returns the last response (which may still be an
+        error status); raises the last transport error if every attempt failed.
+        """
+        client = self.client
+        async with self._host_limit(url):
+            for attempt in range(self.retries + 1):
+                self.requests += 1
+                try:
+                    response = await client.get(url, params=params, headers=headers)
+                    if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                        return response
+                except httpx.TransportError:
+                    if attempt == self.retries:
+                        self.failures += 1
+                        raise
+                self.retried += 1
+                await asyncio.sleep(self._delay(attempt))
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                       headers: Optional[Dict[str, str]] = None) -> Optional[Any]:
+        """Decoded JSON body of a 200 response, or None on any failure."""
+        try:
+            response = await self.get(url, params=params, headers=headers)
+        except Exception as e:
+            logger.error('Market data request failed', metadata={'url': url, 'error': str(e)})
+            return None
+        if response.status_code != 200:
+            self.failures += 1
+            logger.error('Market data request unsuccessful', metadata={'url': url, 'status': response.status_code})
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            self.failures += 1
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'retried': self.retried,
+            'failures': self.failures,
+            'max_connections': self.max_connections,
+            'max_per_host': self.max_per_host
+        }
+
+def get_market_client() -> MarketHttpClient:
+    return MarketHttpClient.get_instance()
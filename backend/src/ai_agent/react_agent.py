@@ -25,13 +25,7 @@ import asyncio
 import requests
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass
-from openai import OpenAI
-try:
-    from opik.integrations.openai import track_openai
-    OPIK_AVAILABLE = True
-except ImportError:
-    OPIK_AVAILABLE = False
-    print("Warning: Opik integration disabled due to compatibility issues")
+from ai_agent.llm_gateway import get_llm_gateway
 from utils.logger import Logger
 
 logger = Logger.get_instance()
@@ -73,22 +67,8 @@ class ReactAgent:
             'getMarketData': MockTools.get_market_data
         }
 
-        # Initialize OpenAI client
-        client = OpenAI(
-            api_key=os.getenv('OPENROUTER_API_KEY'),
-            base_url="https://openrouter.ai/api/v1"
-        )
-
-        self.opik_client: Any
-        # Track OpenAI calls through opik if available
-        if OPIK_AVAILABLE:
-            try:
-                self.opik_client = track_openai(client)
-            except Exception as e:
-                print(f"Opik tracking failed: {e}")
-                self.opik_client = client
-        else:
-            self.opik_client = client
+        # Shared AsyncOpenAI client (Opik-tracked when available)
+        self.llm = get_llm_gateway()
 
     async def get_single_llm_response(
             self,
@@ -96,7 +76,7 @@ class ReactAgent:
             user_id: Optional[int] = None) -> str:
         logger.log_llm_call(MODEL_NAME, query, user_id)
         try:
-            prompt_response = self.opik_client.chat.completions.create(
+            prompt_response = await self.llm.chat(
                 model=MODEL_NAME,
                 messages=[{"role": "user", "content": query}],
                 max_tokens=100
@@ -108,13 +88,6 @@ class ReactAgent:
         response = prompt_response.choices[0].message.content or "Unable to generate final answer."
         logger.log_llm_response(MODEL_NAME, len(response), user_id, {'type': 'response'})
 
-        # Flush opik client to ensure all data is sent
-        if OPIK_AVAILABLE and hasattr(self.opik_client, 'flush'):
-            try:
-                await self.opik_client.flush()
-            except Exception:
-                pass
-
         logger.info('ReAct agent process completed', user_id, {
             'final_answer_length': len(response)
         })
@@ -137,7 +110,7 @@ class ReactAgent:
             try:
                 logger.info('Fetching user preferences for LLM context', user_id)
                 backend_port = os.getenv('PORT', '8000')
-                response = requests.get(f'http://localhost:{backend_port}/api/users/{user_id}/preferences')
+                response = await asyncio.to_thread(requests.get, f'http://localhost:{backend_port}/api/users/{user_id}/preferences')
                 if response.status_code == 200:
                     data = response.json()
                     prefs = data['preferences']
@@ -173,7 +146,7 @@ class ReactAgent:
     Action: [tool_name] (if needed, otherwise say "none")"""
             logger.log_llm_call(MODEL_NAME, thought_prompt, user_id, {'step': i + 1, 'type': 'thought'})
             try:
-                thought_response = self.opik_client.chat.completions.create(
+                thought_response = await self.llm.chat(
                     model=MODEL_NAME,
                     messages=[{"role": "user", "content": thought_prompt}],
                     max_tokens=2000
@@ -218,7 +191,7 @@ class ReactAgent:
 
     IMPORTANT: Do NOT include any of the 'Step X', 'Thought:', 'Action:', or 'Observation:' text in your final answer. Start directly with your insights and recommendations. Format your response using clean Markdown with headers and tables where appropriate."""
         logger.log_llm_call(MODEL_NAME, final_prompt, user_id, {'type': 'final_answer'})
-        final_response = self.opik_client.chat.completions.create(
+        final_response = await self.llm.chat(
             model=MODEL_NAME,
             messages=[{"role": "user", "content": final_prompt}],
             max_tokens=3000
@@ -226,13 +199,6 @@ class ReactAgent:
         final_answer = final_response.choices[0].message.content or "Unable to generate final answer."
         logger.log_llm_response(MODEL_NAME, len(final_answer), user_id, {'type': 'final_answer'})
 
-        # Flush opik client to ensure all data is sent
-        if OPIK_AVAILABLE and hasattr(self.opik_client, 'flush'):
-            try:
-                await self.opik_client.flush()
-            except Exception:
-                pass
-
         logger.info('ReAct agent process completed', user_id, {
             'steps_count': len(steps),
             'final_answer_length': len(final_answer)
@@ -1,23 +1,59 @@
+import asyncio
 import json
 import os
-from openai import OpenAI
-from typing import List, Dict, Any
+import time
+from ai_agent.llm_gateway import get_llm_gateway
+from ai_agent.local_classifier import LocalIntentClassifier
+from ai_agent.router_cache import RouterCache
+from typing import List, Dict, Any, Optional
 from ai_agent.types import AgentIntent, RouterResult
-from utils.opik_client import OpikConfig, trace
+from utils.opik_client import trace
 
 class IntentRouter:
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=os.getenv('OPENROUTER_API_KEY'),
-            base_url="https://openrouter.ai/api/v1"
-        )
-        # Wrap with Opik if available
-        self.client = OpikConfig.track_openai_client(self.client)
+    def __init__(self, use_local: Optional[bool] = None, use_cache: Optional[bool] = None):
+        # Shared AsyncOpenAI client and connection pool, see ai_agent.llm_gateway
+        self.llm = get_llm_gateway()
+        if use_local is None:
+            use_local = os.getenv('LOCAL_ROUTER_ENABLED', 'true').lower() == 'true'
+        # Keyword rules + TF-IDF model answering confident queries without an LLM call
+        self.local = LocalIntentClassifier.get_instance() if use_local else None
+        if use_cache is None:
+            use_cache = os.getenv('ROUTER_CACHE_ENABLED', 'true').lower() == 'true'
+        # Previous LLM classifications keyed on the normalised query + history
+        self.cache = RouterCache.get_instance() if use_cache else None
 
     @trace(name="router_classify")
     async def classify(self, query: str, history: List[Dict[str, Any]] = []) -> RouterResult:
         """
-        Classifies the user query into a specific financial intent.
+        Classifies the user query into a specific financial intent, using the
+        local classifier when it is confident, then previously cached LLM
+        answers, and the LLM otherwise.
+        """
+        if self.local is not None:
+            result = self.local.classify(query, history)
+            if result is not None:
+                return result
+
+        if self.cache is not None:
+            result = await self.cache.get_async(query, history)
+            if result is not None:
+                return result
+
+        started = time.perf_counter()
+        result = await self.classify_with_llm(query, history)
+        # confidence 0.0 marks a failed call, which must not be cached
+        if self.cache is not None and result.confidence > 0.0:
+            await self.cache.set_async(query, history, result)
+        if self.local is not None and result.confidence > 0.0:
+            self.local.stats.record_llm((time.perf_counter() - started) * 1000)
+            if not history and self.local.log_decisions:
+                # Stand-alone queries become training data for the next start
+                await asyncio.to_thread(self.local.log_decision, query, result)
+        return result
+
+    async def classify_with_llm(self, query: str, history: List[Dict[str, Any]] = []) -> RouterResult:
+        """
+        Classifies the user query with the LLM (the pre-fast-path behaviour).
         """
         
         system_prompt = """You are an expert financial intent classifier. 
@@ -52,7 +88,7 @@ class IntentRouter:
         Classify this query."""
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.llm.chat(
                 model=os.getenv('MODEL_NAME'),
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -0,0 +1,159 @@
+"""
+File: router_cache.py
+Description: Cache of LLM intent classifications keyed on the normalised query.
+
+"What's the bitcoin price?" and "whats the Bitcoin price" map to the same key,
+combined with a hash of the last 3 history turns (the only history the router
+prompt sees). Entries live in an in-memory LRU+TTL cache; when ROUTER_CACHE_DB
+is set they are also written through to SQLite so they survive restarts.
+The async lookups used by IntentRouter do the SQLite work in a worker thread,
+off the shared event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from ai_agent.types import AgentIntent, RouterResult
+from utils.ttl_cache import TTLCache, register_cache
+from utils.logger import Logger
+
+logger = Logger.get_instance()
+
+HISTORY_TURNS = 3
+NON_WORD_PATTERN = re.compile(r"[^a-z0-9]+")
+
+def normalize_query(query: str) -> str:
+    """Lower-cases and collapses whitespace and punctuation (apostrophes dropped)."""
+    return NON_WORD_PATTERN.sub(" ", query.lower().replace("'", "")).strip()
+
+def cache_key(query: str, history: List[Dict[str, Any]] = []) -> str:
+    key = normalize_query(query)
+    if history:
+        turns = [f"{msg.get('role', 'user')}:{msg.get('content', '')}" for msg in history[-HISTORY_TURNS:]]
+        key += "|" + hashlib.sha1("\n".join(turns).encode("utf-8")).hexdigest()
+    return key
+
+class RouterCache:
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None, db_path: Optional[str] = None):
+        self.ttl = ttl if ttl is not None else float(os.getenv('ROUTER_CACHE_TTL', 3600))
+        self.memory = TTLCache(
+            max_entries=max_entries or int(os.getenv('ROUTER_CACHE_SIZE', 2048)),
+            ttl=self.ttl
+        )
+        self.persistent_hits = 0
+        self._db = None
+        self._db_lock = threading.Lock()
+        db_path = db_path if db_path is not None else os.getenv('ROUTER_CACHE_DB')
+        if db_path:
+            self._open(db_path)
+
+    @classmethod
+    def get_instance(cls) -> 'RouterCache':
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+                    register_cache('router', cls._instance)
+        return cls._instance
+
+    def _open(self, db_path: str):
+        try:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS router_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            self._db.execute("DELETE FROM router_cache WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.error('Router cache persistence disabled', metadata={'error': str(e), 'path': db_path})
+            self._db = None
+
+    def get(self, query: str, history: List[Dict[str, Any]] = []) -> Optional[RouterResult]:
+        key = cache_key(query, history)
+        result = self.memory.get(key)
+        if result is not None or self._db is None:
+            return result
+        return self._read_through(key)
+
+    async def get_async(self, query: str, history: List[Dict[str, Any]] = []) -> Optional[RouterResult]:
+        """`get` for the event loop: an in-memory miss is looked up in SQLite in a worker thread."""
+        key = cache_key(query, history)
+        result = self.memory.get(key)
+        if result is not None or self._db is None:
+            return result
+        return await asyncio.to_thread(self._read_through, key)
+
+    def _read_through(self, key: str) -> Optional[RouterResult]:
+        # Read-through from SQLite, e.g. after a restart
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT result, expires_at FROM router_cache WHERE cache_key = ? AND expires_at > ?",
+                    (key, time.time())
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error('Router cache read failed', metadata={'error': str(e)})
+            return None
+        if row is None:
+            return None
+        data = json.loads(row[0])
+        result = RouterResult(intent=AgentIntent(data['intent']), confidence=data['confidence'], reasoning=data['reasoning'])
+        self.memory.set(key, result, ttl=row[1] - time.time())
+        self.persistent_hits += 1
+        return result
+
+    def set(self, query: str, history: List[Dict[str, Any]], result: RouterResult):
+        key = cache_key(query, history)
+        self.memory.set(key, result)
+        if self._db is not None:
+            self._write_through(key, result)
+
+    async def set_async(self, query: str, history: List[Dict[str, Any]], result: RouterResult):
+        """`set` for the event loop: the SQLite write and commit run in a worker thread."""
+        key = cache_key(query, history)
+        self.memory.set(key, result)
+        if self._db is not None:
+            await asyncio.to_thread(self._write_through, key, result)
+
+    def _write_through(self, key: str, result: RouterResult):
+        value = json.dumps({'intent': result.intent.value, 'confidence': result.confidence, 'reasoning': result.reasoning})
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO router_cache (cache_key, result, expires_at) VALUES (?, ?, ?)",
+                    (key, value, time.time() + self.ttl)
+                )
+                self._db.commit()
+        except sqlite3.Error as e:
+            logger.error('Router cache write failed', metadata={'error': str(e)})
+
+    def clear(self):
+        self.memory.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM router_cache")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        stats['persistent'] = self._db is not None
+        stats['persistent_hits'] = self.persistent_hits
+        # A miss in memory that was served from SQLite is still a hit overall
+        stats['hits'] += self.persistent_hits
+        stats['misses'] -= self.persistent_hits
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
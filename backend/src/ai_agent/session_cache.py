@@ -3,7 +3,8 @@ File Name: session_cache.py
 Description: This file contains the code for managing user session cache.
 Author Name: The FinArth Team
 Creation Date: 27-Jan-2026
-Version: 1.0
+Version: 1.1 - Bounded LRU + idle-TTL cache with lock striping and stats.
+Version: 1.2 - Read-through/write-through to a pluggable SessionStore.
 
 Instructions to run: Import the session_cache module and use its methods to
                      manage user sessions.
@@ -11,12 +12,45 @@ Instructions to run: Import the session_cache module and use its methods to
 File Execution State: Validation is in progress
 Note: This module can be imported and used in other parts of the application
       to manage user sessions efficiently.
+
+Sessions are spread over independently locked stripes (by user id), each an
+LRU with its share of the entry and byte budget. Sessions not read or written
+for SESSION_CACHE_IDLE_TTL seconds are dropped on their next lookup.
+
+Behind the local cache sits a SessionStore (see session_store.py). With a
+shared store, a local miss is read through from the store, every set is
+written through as the full merged session, and locally cached sessions are
+re-read after SESSION_CACHE_REVALIDATE seconds so workers pick up each
+other's updates.
 """
 
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, Dict, List, Any
+from utils.ttl_cache import register_cache
+from ai_agent.session_store import SessionStore, create_session_store
+
+# user_data key (camelCase, as sent by the frontend) -> UserSession attribute
+FIELD_MAP = {
+    'name': 'name',
+    'country': 'country',
+    'age': 'age',
+    'riskPreference': 'risk_preference',
+    'familiarInvestments': 'familiar_investments',
+    'returnEstimate': 'return_estimate',
+    'selectedOptions': 'selected_options',
+    'isFirstLogin': 'is_first_login'
+}
 
 class UserSession:
+    __slots__ = ('user_id', 'name', 'country', 'age', 'risk_preference', 'familiar_investments',
+                 'return_estimate', 'selected_options', 'is_first_login', 'last_updated', 'last_access',
+                 'synced_at')
+
     def __init__(self, user_id: int, name: str = '', country: str = '', age: int = 0,
                  risk_preference: str = '', familiar_investments: List[str] = None,
                  return_estimate: str = '', selected_options: List[str] = None,
@@ -31,40 +65,183 @@ class UserSession:
         self.selected_options = selected_options or []
         self.is_first_login = is_first_login
         self.last_updated = datetime.now()
+        self.last_access = time.monotonic()
+        self.synced_at = self.last_access
+
+    def update(self, user_data: Dict[str, Any]):
+        """Applies the fields present in user_data in place."""
+        for key, attribute in FIELD_MAP.items():
+            if key in user_data:
+                setattr(self, attribute, user_data[key])
+        self.familiar_investments = self.familiar_investments or []
+        self.selected_options = self.selected_options or []
+        self.last_updated = datetime.now()
+        self.last_access = time.monotonic()
+
+    def approx_size(self) -> int:
+        """Approximate memory footprint in bytes, used for the byte budget."""
+        size = sys.getsizeof(self)
+        for attribute in ('name', 'country', 'risk_preference', 'return_estimate'):
+            size += sys.getsizeof(getattr(self, attribute))
+        for attribute in ('familiar_investments', 'selected_options'):
+            values = getattr(self, attribute)
+            size += sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values)
+        return size
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The session in the camelCase form accepted by update()."""
+        return {key: getattr(self, attribute) for key, attribute in FIELD_MAP.items()}
+
+class _Stripe:
+    __slots__ = ('lock', 'sessions', 'sizes', 'bytes')
 
-class SessionCache:
     def __init__(self):
-        self.cache: Dict[int, UserSession] = {}
-    
+        self.lock = threading.Lock()
+        self.sessions: 'OrderedDict[int, UserSession]' = OrderedDict()
+        self.sizes: Dict[int, int] = {}
+        self.bytes = 0
+
+class SessionCache:
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 idle_ttl: Optional[float] = None, stripes: int = 16,
+                 store: Optional[SessionStore] = None, revalidate: Optional[float] = None):
+        self.max_entries = max_entries or int(os.getenv('SESSION_CACHE_MAX_ENTRIES', 10000))
+        self.max_bytes = max_bytes or int(os.getenv('SESSION_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+        self.idle_ttl = idle_ttl if idle_ttl is not None else float(os.getenv('SESSION_CACHE_IDLE_TTL', 3600))
+        self.store = store or create_session_store()
+        self.revalidate = revalidate if revalidate is not None else float(os.getenv('SESSION_CACHE_REVALIDATE', 5))
+        self._stripes = [_Stripe() for _ in range(stripes)]
+        # Each stripe enforces its share of the budget
+        self._stripe_entries = max(1, self.max_entries // stripes)
+        self._stripe_bytes = max(1, self.max_bytes // stripes)
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.store_hits = 0
+        self.store_misses = 0
+
+    def _stripe(self, user_id: int) -> _Stripe:
+        return self._stripes[hash(user_id) % len(self._stripes)]
+
+    def _count(self, **increments):
+        with self._stats_lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def _remove(self, stripe: _Stripe, user_id: int):
+        stripe.sessions.pop(user_id, None)
+        stripe.bytes -= stripe.sizes.pop(user_id, 0)
+
+    def _put(self, user_id: int, user_data: Dict[str, Any], synced: bool = False) -> UserSession:
+        stripe = self._stripe(user_id)
+        evicted = 0
+        with stripe.lock:
+            session = stripe.sessions.get(user_id)
+            # Create or update the session
+            if session is None:
+                session = UserSession(user_id=user_id)
+                stripe.sessions[user_id] = session
+            session.update(user_data)
+            if synced:
+                session.synced_at = session.last_access
+            stripe.sessions.move_to_end(user_id)
+            size = session.approx_size()
+            stripe.bytes += size - stripe.sizes.get(user_id, 0)
+            stripe.sizes[user_id] = size
+
+            while len(stripe.sessions) > 1 and (len(stripe.sessions) > self._stripe_entries or stripe.bytes > self._stripe_bytes):
+                oldest = next(iter(stripe.sessions))
+                self._remove(stripe, oldest)
+                evicted += 1
+        if evicted:
+            self._count(evictions=evicted)
+        return session
+
+    def _load(self, user_id: int) -> Optional[UserSession]:
+        """Reads a session through from the shared store into the local cache."""
+        data = self.store.load(user_id)
+        if data is None:
+            self._count(store_misses=1)
+            return None
+        self._count(store_hits=1)
+        return self._put(user_id, data, synced=True)
+
     def set(self, user_id: int, user_data: Dict[str, Any]):
         """Set user session data"""
-        existing = self.cache.get(user_id)
-        # Create or update the session
-        session = UserSession(
-            user_id=user_id,
-            name=user_data.get('name', existing.name if existing else ''),
-            country=user_data.get('country', existing.country if existing else ''),
-            age=user_data.get('age', existing.age if existing else 0),
-            risk_preference=user_data.get('riskPreference', existing.risk_preference if existing else ''),
-            familiar_investments=user_data.get('familiarInvestments', existing.familiar_investments if existing else []),
-            return_estimate=user_data.get('returnEstimate', existing.return_estimate if existing else ''),
-            selected_options=user_data.get('selectedOptions', existing.selected_options if existing else []),
-            is_first_login=user_data.get('isFirstLogin', existing.is_first_login if existing else True)
-        )
-        self.cache[user_id] = session
-    
+        if self.store.shared and self._stripe(user_id).sessions.get(user_id) is None:
+            # Merge the partial update into what other workers already stored
+            self._load(user_id)
+        session = self._put(user_id, user_data, synced=True)
+        self.store.save(user_id, session.to_dict())
+
     def get(self, user_id: int) -> Optional[UserSession]:
         """Get user session data"""
-        return self.cache.get(user_id)
+        stripe = self._stripe(user_id)
+        now = time.monotonic()
+        with stripe.lock:
+            session = stripe.sessions.get(user_id)
+            if session is not None and now - session.last_access > self.idle_ttl:
+                self._remove(stripe, user_id)
+                session = None
+                expired = 1
+            else:
+                expired = 0
+            if session is not None:
+                session.last_access = now
+                stripe.sessions.move_to_end(user_id)
+            stale = session is not None and self.store.shared and now - session.synced_at > self.revalidate
+        if session is not None:
+            self._count(hits=1)
+        else:
+            self._count(misses=1, expirations=expired)
+
+        if self.store.shared and (session is None or stale):
+            loaded = self._load(user_id)
+            if loaded is None and stale:
+                # Deleted by another worker
+                self.delete(user_id)
+            session = loaded
+        return session
 
     def delete(self, user_id: int):
         """Delete user session"""
-        if user_id in self.cache:
-            del self.cache[user_id]
+        stripe = self._stripe(user_id)
+        with stripe.lock:
+            self._remove(stripe, user_id)
+        self.store.delete(user_id)
 
     def clear(self):
         """Clear all sessions"""
-        self.cache.clear()
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.sessions.clear()
+                stripe.sizes.clear()
+                stripe.bytes = 0
+        self.store.clear()
+
+    def __len__(self) -> int:
+        return sum(len(stripe.sessions) for stripe in self._stripes)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self),
+                'bytes': sum(stripe.bytes for stripe in self._stripes),
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'store': type(self.store).__name__,
+                'store_hits': self.store_hits,
+                'store_misses': self.store_misses
+            }
 
 # Global session cache instance
-session_cache = SessionCache()
\ No newline at end of file
+session_cache = SessionCache()
+register_cache('session', session_cache)
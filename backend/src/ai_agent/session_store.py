@@ -0,0 +1,109 @@
+"""
+File: session_store.py
+Description: Backends behind SessionCache.
+
+SessionCache keeps hot sessions in process memory. A SessionStore is where
+they are read through from on a local miss and written through to on every
+set, so several worker processes on one node (e.g. gunicorn workers) see the
+same onboarding data instead of each keeping its own cold cache.
+
+- MemorySessionStore: nothing beyond the process-local cache (single worker).
+- SQLiteSessionStore: a shared SQLite file in WAL mode, safe for concurrent
+  worker processes.
+
+Select one with SESSION_STORE=memory|sqlite (SESSION_STORE_PATH for the file).
+"""
+
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+from utils.db_pool import ConnectionPool
+
+DEFAULT_STORE_PATH = Path(__file__).parent.parent.parent / 'session_store.sqlite'
+
+class SessionStore(ABC):
+    # Whether other processes may change sessions behind this process' back
+    shared = False
+
+    @abstractmethod
+    def load(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Session data (camelCase keys as accepted by SessionCache.set) or None."""
+
+    @abstractmethod
+    def save(self, user_id: int, data: Dict[str, Any]):
+        pass
+
+    @abstractmethod
+    def delete(self, user_id: int):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+class MemorySessionStore(SessionStore):
+    """The process-local cache is the only copy; nothing to read or write through."""
+
+    def load(self, user_id: int) -> Optional[Dict[str, Any]]:
+        return None
+
+    def save(self, user_id: int, data: Dict[str, Any]):
+        pass
+
+    def delete(self, user_id: int):
+        pass
+
+    def clear(self):
+        pass
+
+class SQLiteSessionStore(SessionStore):
+    shared = True
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or os.getenv('SESSION_STORE_PATH') or DEFAULT_STORE_PATH)
+        self.pool = ConnectionPool(self.path)
+        conn = self.pool.connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS user_sessions (
+                user_id INTEGER PRIMARY KEY,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        conn.commit()
+
+    def load(self, user_id: int) -> Optional[Dict[str, Any]]:
+        row = self.pool.connection().execute(
+            "SELECT data FROM user_sessions WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def save(self, user_id: int, data: Dict[str, Any]):
+        conn = self.pool.connection()
+        conn.execute(
+            """
+            INSERT INTO user_sessions (user_id, data, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at
+            """,
+            (user_id, json.dumps(data), time.time())
+        )
+        conn.commit()
+
+    def delete(self, user_id: int):
+        conn = self.pool.connection()
+        conn.execute("DELETE FROM user_sessions WHERE user_id = ?", (user_id,))
+        conn.commit()
+
+    def clear(self):
+        conn = self.pool.connection()
+        conn.execute("DELETE FROM user_sessions")
+        conn.commit()
+
+def create_session_store(kind: Optional[str] = None) -> SessionStore:
+    kind = (kind or os.getenv('SESSION_STORE', 'memory')).lower()
+    if kind == 'sqlite':
+        return SQLiteSessionStore()
+    return MemorySessionStore()
@@ -0,0 +1,138 @@
+"""
+File: ticker_cache.py
+Description: Short-lived cache of WEEX ticker snapshots behind
+             WeexService.get_ticker.
+
+Tickers are keyed on the normalized `cmt_` symbol and kept for a few seconds
+(WEEX_TICKER_TTL), which absorbs the fan-out of dashboard refreshes across
+users. Concurrent misses for one symbol share a single upstream call, and
+per-symbol hit counts and snapshot ages are reported under 'ticker' at
+GET /api/health/caches.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+from utils.single_flight import SingleFlight
+from utils.ttl_cache import TTLCache, register_cache
+
+Ticker = Dict[str, Any]
+
+class _SymbolStats:
+    __slots__ = ('hits', 'misses', 'fetched_at')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.fetched_at: Optional[float] = None
+
+class TickerCache:
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl = ttl if ttl is not None else float(os.getenv('WEEX_TICKER_TTL', 5))
+        self.memory = TTLCache(max_entries=max_entries or int(os.getenv('WEEX_TICKER_CACHE_SIZE', 2048)), ttl=self.ttl)
+        self._flights = SingleFlight()
+        self._symbols: Dict[str, _SymbolStats] = {}
+        self._state_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'TickerCache':
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+                    register_cache('ticker', cls._instance)
+        return cls._instance
+
+    def _symbol_stats(self, symbol: str) -> _SymbolStats:
+        stats = self._symbols.get(symbol)
+        if stats is None:
+            # Symbols come from user input; keep the per-symbol table bounded
+            if len(self._symbols) >= self.memory.max_entries:
+                self._symbols.pop(next(iter(self._symbols)))
+            stats = self._symbols[symbol] = _SymbolStats()
+        return stats
+
+    def _store(self, symbol: str, ticker: Ticker):
+        self.memory.set(symbol, ticker)
+        with self._state_lock:
+            self._symbol_stats(symbol).fetched_at = time.time()
+
+    async def _fetch(self, symbol: str, fetch: Callable[[str], Awaitable[Optional[Ticker]]]) -> Optional[Ticker]:
+        async def fetch_and_store():
+            ticker = await fetch(symbol)
+            if ticker is not None:
+                self._store(symbol, ticker)
+            return ticker
+
+        return await self._flights.do(symbol, fetch_and_store)
+
+    async def get(self, symbol: str, fetch: Callable[[str], Awaitable[Optional[Ticker]]]) -> Optional[Ticker]:
+        """
+        The ticker for a normalized `cmt_` symbol, from the cache or from
+        `fetch(symbol)` (once for all concurrent callers). Failed fetches
+        (None) are not cached.
+        """
+        ticker = self.memory.get(symbol)
+        with self._state_lock:
+            stats = self._symbol_stats(symbol)
+            if ticker is not None:
+                stats.hits += 1
+            else:
+                stats.misses += 1
+        if ticker is not None:
+            return ticker
+        return await self._fetch(symbol, fetch)
+
+    async def refresh(self, symbols: Iterable[str], fetch: Callable[[str], Awaitable[Optional[Ticker]]],
+                      max_concurrency: int = 8) -> int:
+        """Fetches every symbol ahead of demand, returning how many were refreshed."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def refresh_one(symbol):
+            async with semaphore:
+                try:
+                    return await self._fetch(symbol, fetch) is not None
+                except Exception:
+                    return False
+
+        refreshed = await asyncio.gather(*(refresh_one(symbol) for symbol in set(symbols)))
+        return sum(refreshed)
+
+    def age(self, symbol: str) -> Optional[float]:
+        """Seconds since the symbol's ticker was last fetched (None if never)."""
+        with self._state_lock:
+            stats = self._symbols.get(symbol)
+            fetched_at = stats.fetched_at if stats else None
+        return round(time.time() - fetched_at, 3) if fetched_at is not None else None
+
+    def clear(self):
+        self.memory.clear()
+        with self._state_lock:
+            self._symbols.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        now = time.time()
+        with self._state_lock:
+            symbols = {
+                symbol: {
+                    'age': round(now - entry.fetched_at, 3) if entry.fetched_at is not None else None,
+                    'hits': entry.hits,
+                    'misses': entry.misses,
+                    'hit_ratio': round(entry.hits / (entry.hits + entry.misses), 4) if entry.hits + entry.misses else 0.0
+                }
+                for symbol, entry in self._symbols.items()
+            }
+        stats.update({
+            'ttl': self.ttl,
+            'upstream': self._flights.calls,
+            'coalesced': self._flights.coalesced,
+            'inflight': len(self._flights),
+            'symbols': symbols
+        })
+        return stats
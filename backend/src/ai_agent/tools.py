@@ -1,10 +1,14 @@
 import os
-import requests
 import asyncio
 import time
 import json
-from concurrent.futures import ThreadPoolExecutor
-from utils.opik_client import OpikConfig, trace
+from utils.opik_client import trace
+from utils.async_runner import AsyncRunner
+from ai_agent.market_client import get_market_client
+from ai_agent.chart_cache import ChartCache
+from ai_agent.ticker_cache import TickerCache
+from ai_agent.candle_store import CandleStore, DAY_MS
+from utils.single_flight import SingleFlight
 
 import threading
 
@@ -12,7 +16,12 @@ class MarketDataService:
     CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "market_cache.json")
     _cache = {"data": None, "expiry": 0}
     CACHE_DURATION = 3600  # 1 hour
+    # Past expiry, the last good snapshot is still served (while a background
+    # refresh runs) until it is this many seconds old
+    MAX_STALENESS = float(os.getenv("MARKET_MAX_STALENESS", 6 * 3600))
     _fetch_lock = threading.Lock()
+    # How often a request waiting on another thread's fetch checks the lock
+    FETCH_LOCK_POLL = 0.05
     _is_fetching = False
 
     @staticmethod
@@ -41,21 +50,44 @@ class MarketDataService:
         except:
             pass
 
+    @staticmethod
+    def cache_expires_in() -> float:
+        """Seconds until the cached market data expires (0 if already stale)."""
+        return max(0.0, MarketDataService._load_cache().get("expiry", 0) - time.time())
+
+    @staticmethod
+    def snapshot_age(cache=None) -> float:
+        """Seconds since the cached snapshot was fetched (inf when there is none)."""
+        data = (cache or MarketDataService._load_cache()).get("data") or {}
+        updated_at = data.get("updated_at")
+        return time.time() - updated_at if updated_at else float("inf")
+
+    @staticmethod
+    def _is_complete(data) -> bool:
+        # Strict validation: Ensure global and top_coins exist
+        return bool(data and data.get("global") and data.get("top_coins"))
+
     @staticmethod
     async def get_dashboard_data():
         """
         Fetches structured market data with persistent file-based caching and concurrency protection.
+        Expired data within MAX_STALENESS is served immediately while
+        MarketDataRefresher revalidates it in the background.
         """
         current_time = time.time()
         cache = MarketDataService._load_cache()
+        refresher = MarketDataRefresher.get_instance()
+        refresher.start()
         
         # Check if cache is valid
-        if cache.get("data") and current_time < cache.get("expiry", 0):
-            # Strict validation: Ensure global and top_coins exist
-            d = cache["data"]
-            if d.get("global") and d.get("top_coins"):
-                return d
+        if MarketDataService._is_complete(cache.get("data")):
+            if current_time < cache.get("expiry", 0):
+                return cache["data"]
+            if MarketDataService.snapshot_age(cache) <= MarketDataService.MAX_STALENESS:
+                refresher.trigger()
+                return cache["data"]
 
+        # No usable snapshot: fetch inline
         # Use threading lock to prevent thundering herd across Flask threads
         acquired = MarketDataService._fetch_lock.acquire(blocking=False)
         if not acquired:
@@ -63,9 +95,12 @@ class MarketDataService:
             cache = MarketDataService._load_cache()
             if cache.get("data"):
                 return cache["data"]
-            # Wait for the other thread to finish
-            with MarketDataService._fetch_lock:
+            # Wait for the other fetch to finish without blocking the shared event loop
+            await MarketDataService._acquire_fetch_lock()
+            try:
                 return MarketDataService._load_cache().get("data", {"global": {}, "top_coins": []})
+            finally:
+                MarketDataService._fetch_lock.release()
         
         try:
             # Re-check cache inside lock
@@ -81,37 +116,56 @@ class MarketDataService:
             MarketDataService._fetch_lock.release()
 
     @staticmethod
-    async def _perform_fetch(cache):
-        """Internal method to perform ONE attempt to refresh market data."""
-        current_time = time.time()
+    async def _acquire_fetch_lock():
+        """
+        Waits for _fetch_lock by polling it without blocking. A blocking
+        acquire in a worker thread would still take the lock after the waiting
+        coroutine was cancelled, and nothing would release it; here
+        cancellation can only happen while the lock is not held.
+        """
+        while not MarketDataService._fetch_lock.acquire(blocking=False):
+            await asyncio.sleep(MarketDataService.FETCH_LOCK_POLL)
+
+    @staticmethod
+    def _base_url():
+        is_pro = os.getenv("COINGECKO_IS_PRO", "false").lower() == "true"
+        default = "https://pro-api.coingecko.com/api/v3" if is_pro else "https://api.coingecko.com/api/v3"
+        return os.getenv("COINGECKO_BASE_URL") or default
+
+    @staticmethod
+    def _headers():
         api_key = os.getenv("COINGECKO_API_KEY")
         is_pro = os.getenv("COINGECKO_IS_PRO", "false").lower() == "true"
-        base_url = "https://pro-api.coingecko.com/api/v3" if is_pro else "https://api.coingecko.com/api/v3"
-        
         headers = {"accept": "application/json"}
         if api_key:
             header_name = "x-cg-pro-api-key" if is_pro else "x-cg-demo-api-key"
             headers[header_name] = api_key
+        return headers
 
-        def fetch_url(endpoint):
-            try:
-                url = f"{base_url}{endpoint}" if endpoint.startswith("/") else endpoint
-                r = requests.get(url, headers=headers, timeout=10)
-                if r.status_code == 200:
-                    return r.json()
-                print(f"CoinGecko Error {r.status_code} on {endpoint}")
-                return None
-            except Exception as e:
-                print(f"Exception fetching {endpoint}: {str(e)}")
-                return None
+    @staticmethod
+    async def _fetch_snapshot():
+        """
+        ONE attempt to fetch a complete snapshot from CoinGecko. Saves and
+        returns it, or returns None when either call failed.
+        """
+        current_time = time.time()
+        base_url = MarketDataService._base_url()
+        headers = MarketDataService._headers()
 
+        client = get_market_client()
         print("Attempting to refresh market data from CoinGecko...")
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as pool:
-            global_task = loop.run_in_executor(pool, fetch_url, "/global")
-            coins_task = loop.run_in_executor(pool, fetch_url, "/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=10&page=1&sparkline=true&price_change_percentage=24h,7d")
-            
-            global_data, coins = await asyncio.gather(global_task, coins_task)
+        # Both calls share the pooled keep-alive connections
+        global_data, coins = await asyncio.gather(
+            client.get_json(f"{base_url}/global", headers=headers),
+            client.get_json(f"{base_url}/coins/markets", headers=headers, params={
+                "vs_currency": "usd",
+                "order": "market_cap_desc",
+                "per_page": 10,
+                "page": 1,
+                "sparkline": "true",
+                "price_change_percentage": "24h,7d"
+            })
+        )
 
         # Deep data extraction
         global_obj = global_data.get("data") if (isinstance(global_data, dict) and "data" in global_data) else None
@@ -127,6 +181,14 @@ class MarketDataService:
             MarketDataService._save_cache(fresh_data, current_time + MarketDataService.CACHE_DURATION)
             print("Successfully updated market cache.")
             return fresh_data
+        return None
+
+    @staticmethod
+    async def _perform_fetch(cache):
+        """Internal method to perform ONE attempt to refresh market data."""
+        fresh_data = await MarketDataService._fetch_snapshot()
+        if fresh_data:
+            return fresh_data
         
         # FAILSAFE: If API call failed, return the old cache (if it exists)
         # We do NOT update the expiry, so the next request after some time will try again.
@@ -138,23 +200,16 @@ class MarketDataService:
         return {"global": {}, "top_coins": []}
 
     @staticmethod
-    async def get_coin_chart(coin_id="bitcoin", days=7):
-        """Fetches historical chart data for specific coin."""
-        api_key = os.getenv("COINGECKO_API_KEY")
-        is_pro = os.getenv("COINGECKO_IS_PRO", "false").lower() == "true"
-        base_url = "https://pro-api.coingecko.com/api/v3" if is_pro else "https://api.coingecko.com/api/v3"
-        
-        headers = {"accept": "application/json"}
-        if api_key:
-            header_name = "x-cg-pro-api-key" if is_pro else "x-cg-demo-api-key"
-            headers[header_name] = api_key
+    async def get_coin_chart(coin_id="bitcoin", days=7, vs_currency="usd"):
+        """Fetches historical chart data for specific coin (served from the chart cache when possible)."""
+        base_url = MarketDataService._base_url()
+        headers = MarketDataService._headers()
 
-        try:
-            url = f"{base_url}/coins/{coin_id}/market_chart?vs_currency=usd&days={days}"
-            r = requests.get(url, headers=headers, timeout=10)
-            return r.json() if r.status_code == 200 else None
-        except:
-            return None
+        url = f"{base_url}/coins/{coin_id}/market_chart"
+        params = {"vs_currency": vs_currency, "days": days}
+        return await ChartCache.get_instance().get(
+            coin_id, vs_currency, days, lambda: get_market_client().get_json(url, headers=headers, params=params)
+        )
 
     @staticmethod
     @trace(name="tool_get_market_context")
@@ -184,88 +239,369 @@ class MarketDataService:
 
         return "\n".join(summary)
 
+class MarketDataRefresher:
+    """
+    Refreshes the market snapshot on the shared event loop so requests never
+    wait on CoinGecko while a usable snapshot exists.
+
+    Once started, the refresher re-fetches MARKET_REFRESH_AHEAD seconds before
+    the snapshot expires, retrying every MARKET_REFRESH_RETRY seconds after a
+    failure. `trigger()` starts an immediate refresh for a request that was
+    served stale data. Only one refresh runs at a time.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, enabled: bool = None, refresh_ahead: float = None, retry_interval: float = None):
+        self.enabled = enabled if enabled is not None else os.getenv("MARKET_REFRESH_ENABLED", "true").lower() == "true"
+        self.refresh_ahead = refresh_ahead if refresh_ahead is not None else float(os.getenv("MARKET_REFRESH_AHEAD", 300))
+        self.retry_interval = retry_interval if retry_interval is not None else float(os.getenv("MARKET_REFRESH_RETRY", 60))
+        self._lock = threading.Lock()
+        self._task = None
+        self._refreshing = False
+        self.refreshes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_attempt = None
+        self.last_success = None
+        self.last_error = None
+
+    @classmethod
+    def get_instance(cls) -> "MarketDataRefresher":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def start(self):
+        """Starts the periodic refresh loop on the shared event loop (idempotent)."""
+        if not self.enabled or self._task is not None:
+            return
+        with self._lock:
+            if self._task is None:
+                self._task = asyncio.run_coroutine_threadsafe(self._run(), AsyncRunner.get_instance().loop)
+
+    def stop(self):
+        with self._lock:
+            if self._task is not None:
+                self._task.cancel()
+                self._task = None
+
+    def trigger(self):
+        """Schedules a refresh now unless one is already running. Never blocks."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        asyncio.run_coroutine_threadsafe(self._refresh_scheduled(), AsyncRunner.get_instance().loop)
+
+    async def _refresh_scheduled(self):
+        try:
+            await self._refresh()
+        finally:
+            self._refreshing = False
+
+    async def refresh(self) -> bool:
+        """Refreshes now; returns whether a new snapshot was stored."""
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+        try:
+            return await self._refresh()
+        finally:
+            self._refreshing = False
+
+    async def _refresh(self) -> bool:
+        # An inline fetch is already under way
+        if not MarketDataService._fetch_lock.acquire(blocking=False):
+            return False
+        self.last_attempt = time.time()
+        try:
+            fresh_data = await MarketDataService._fetch_snapshot()
+            error = None if fresh_data else "incomplete CoinGecko response"
+        except Exception as e:
+            fresh_data, error = None, str(e)
+        finally:
+            MarketDataService._fetch_lock.release()
+
+        if fresh_data:
+            self.refreshes += 1
+            self.consecutive_failures = 0
+            self.last_success = time.time()
+            return True
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = error
+        return False
+
+    def next_refresh_in(self) -> float:
+        """Seconds until the next scheduled refresh."""
+        if self.consecutive_failures:
+            return max(0.0, self.last_attempt + self.retry_interval - time.time())
+        cache = MarketDataService._load_cache()
+        if not MarketDataService._is_complete(cache.get("data")):
+            return 0.0
+        return max(0.0, cache.get("expiry", 0) - self.refresh_ahead - time.time())
+
+    async def _run(self):
+        while True:
+            delay = self.next_refresh_in()
+            if delay > 0:
+                # Re-check at least every minute; inline fetches may have moved the expiry
+                await asyncio.sleep(min(delay, 60))
+                continue
+            # Skipped because another fetch is running: check back shortly
+            if not await self.refresh() and not self.consecutive_failures:
+                await asyncio.sleep(1)
+
+    def stats(self):
+        age = MarketDataService.snapshot_age()
+        return {
+            "enabled": self.enabled,
+            "running": self._task is not None,
+            "refreshing": self._refreshing,
+            "snapshot_age": round(age, 1) if age != float("inf") else None,
+            "expires_in": round(MarketDataService.cache_expires_in(), 1),
+            "max_staleness": MarketDataService.MAX_STALENESS,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_success": self.last_success,
+            "last_error": self.last_error
+        }
+
 class WeexService:
     """Service to handle financial data from WEEX exchange."""
-    
+    BATCH_CONCURRENCY = int(os.getenv("WEEX_BATCH_CONCURRENCY", 8))
+    BATCH_MAX_ITEMS = int(os.getenv("WEEX_BATCH_MAX_ITEMS", 200))
+    _history_flights = SingleFlight()
+
+    @staticmethod
+    def _base_url():
+        return os.getenv("WEEX_BASE_URL") or "https://api-contract.weex.com"
+
     @staticmethod
-    def get_ticker(symbol: str):
-        """Fetches the latest execution price and 24h metrics from WEEX."""
+    def weex_symbol(symbol: str) -> str:
         # Enforce lowercase and cmt_ prefix as requested
         clean = symbol.lower().split('_')[-1] # handles symbols like cmt_btcusdt or just btcusdt
-        weex_symbol = f"cmt_{clean}"
-        url = f"https://api-contract.weex.com/capi/v2/market/ticker?symbol={weex_symbol}"
-        print(f"Fetching WEEX Ticker: {url}")
-        try:
-            r = requests.get(url, timeout=10)
-            if r.status_code == 200:
-                data = r.json()
-                if data and 'last' in data:
-                    return data
-            print(f"WEEX Ticker unsuccessful for {weex_symbol}: {r.status_code}")
-            return None
-        except Exception as e:
-            print(f"WEEX Ticker Exception: {str(e)}")
-            return None
+        return f"cmt_{clean}"
+
+    @staticmethod
+    async def get_ticker(symbol: str):
+        """Fetches the latest execution price and 24h metrics from WEEX (via the ticker cache)."""
+        return await TickerCache.get_instance().get(WeexService.weex_symbol(symbol), WeexService._fetch_ticker)
 
     @staticmethod
-    def get_history(symbol: str, investment_date_ms: int):
-        """Fetches the specific candle for the investment date using startTime and endTime."""
-        clean = symbol.lower().split('_')[-1]
-        weex_symbol = f"cmt_{clean}"
+    async def _fetch_ticker(weex_symbol: str):
+        url = f"{WeexService._base_url()}/capi/v2/market/ticker"
+        data = await get_market_client().get_json(url, params={"symbol": weex_symbol})
+        if data and 'last' in data:
+            return data
+        print(f"WEEX Ticker unsuccessful for {weex_symbol}")
+        return None
+
+    @staticmethod
+    def portfolio_symbols():
+        """Normalized symbols of every Crypto holding in portfolio_holdings."""
+        from database import get_connection
+        rows = get_connection().execute(
+            "SELECT DISTINCT symbol FROM portfolio_holdings WHERE category = 'Crypto' AND symbol IS NOT NULL AND symbol != ''"
+        ).fetchall()
+        return sorted({WeexService.weex_symbol(row[0]) for row in rows})
+
+    @staticmethod
+    async def refresh_tickers(symbols=None):
+        """
+        Refreshes the cached tickers of `symbols` (default: every symbol held
+        in a portfolio) in one concurrent sweep. Returns (refreshed, total).
+        """
+        if symbols is None:
+            symbols = await asyncio.to_thread(WeexService.portfolio_symbols)
+        symbols = {WeexService.weex_symbol(symbol) for symbol in symbols}
+        refreshed = await TickerCache.get_instance().refresh(
+            symbols, WeexService._fetch_ticker, max_concurrency=WeexService.BATCH_CONCURRENCY
+        )
+        return refreshed, len(symbols)
+
+    @staticmethod
+    async def get_history(symbol: str, investment_date_ms: int):
+        """Fetches the specific candle for the investment date (each closed day's candle only once)."""
+        weex_symbol = WeexService.weex_symbol(symbol)
+        candle = CandleStore.get_instance().get(weex_symbol, investment_date_ms)
+        if candle is not None:
+            return candle
+        return await WeexService._history_flights.do(
+            (weex_symbol, investment_date_ms), lambda: WeexService._fetch_history(weex_symbol, investment_date_ms)
+        )
+
+    @staticmethod
+    async def _fetch_candles(weex_symbol: str, start_ms: int, end_ms: int, limit: int):
+        url = f"{WeexService._base_url()}/capi/v2/market/historyCandles"
+        return await get_market_client().get_json(url, params={
+            "symbol": weex_symbol,
+            "granularity": "1d",
+            "startTime": start_ms,
+            "endTime": end_ms,
+            "limit": limit
+        })
+
+    @staticmethod
+    async def _fetch_history(weex_symbol: str, investment_date_ms: int):
         # Use both startTime and endTime to get exactly the candle for that day
-        end_time_ms = investment_date_ms + (24 * 60 * 60 * 1000)  # Next day
-        url = f"https://api-contract.weex.com/capi/v2/market/historyCandles?symbol={weex_symbol}&granularity=1d&startTime={investment_date_ms}&endTime={end_time_ms}&limit=1"
-        try:
-            r = requests.get(url, timeout=10)
-            if r.status_code == 200:
-                candles = r.json()
-                if candles and len(candles) > 0:
-                    return candles[0]  # Return the single candle
-                return None
-            return None
-        except Exception as e:
-            print(f"WEEX History Exception: {str(e)}")
-            return None
+        end_time_ms = investment_date_ms + DAY_MS  # Next day
+        candles = await WeexService._fetch_candles(weex_symbol, investment_date_ms, end_time_ms, 1)
+        if candles and len(candles) > 0:
+            CandleStore.get_instance().put(weex_symbol, candles[:1])
+            return candles[0]  # Return the single candle
+        return None
+
+    @staticmethod
+    async def backfill_candles(symbol: str, start_ms: int, end_ms: int) -> int:
+        """
+        Stores the daily candles of [start_ms, end_ms), one upstream call per
+        CANDLE_BACKFILL_MAX_DAYS days that are not stored yet. Returns how
+        many candles were added.
+        """
+        weex_symbol = WeexService.weex_symbol(symbol)
+        store = CandleStore.get_instance()
+        stored = 0
+        for chunk_start in range(start_ms, end_ms, store.max_backfill_days * DAY_MS):
+            chunk_end = min(end_ms, chunk_start + store.max_backfill_days * DAY_MS)
+            if store.missing_days(weex_symbol, chunk_start, chunk_end) == 0:
+                continue
+            days = -(-(chunk_end - chunk_start) // DAY_MS)
+            candles = await WeexService._fetch_candles(weex_symbol, chunk_start, chunk_end, days)
+            if candles:
+                stored += store.put(weex_symbol, candles)
+        return stored
+
+    @staticmethod
+    def _investment_ms(investment_date_str: str) -> int:
+        import datetime
+        dt = datetime.datetime.strptime(investment_date_str, "%Y-%m-%d")
+        return int(dt.timestamp() * 1000)
+
+    @staticmethod
+    def _closing_price(candle):
+        # Use closing price (index 4) from the candle
+        if candle and len(candle) > 4:
+            try:
+                return float(candle[4])
+            except (IndexError, ValueError, TypeError):
+                pass
+        return None
 
     @staticmethod
-    def calculate_investment_growth(symbol: str, investment_date_str: str, manual_entry_price: float = None):
+    def _growth(symbol: str, ticker, purchase_price):
+        current_price = float(ticker.get('last', 0))
+        growth_pct = None
+        if purchase_price and purchase_price > 0:
+            growth_pct = round(((current_price - purchase_price) / purchase_price) * 100, 2)
+
+        return {
+            "symbol": symbol,
+            "current_price": current_price,
+            "purchase_price": purchase_price,
+            "growth_percentage": growth_pct,
+            "high_24h": ticker.get('high_24h'),
+            "low_24h": ticker.get('low_24h'),
+            "price_change_24h_pct": round(float(ticker.get('priceChangePercent', 0)) * 100, 2)
+        }
+
+    @staticmethod
+    async def calculate_investment_growth(symbol: str, investment_date_str: str, manual_entry_price: float = None):
         """Calculates profit/loss since investment date using WEEX data."""
         try:
-            ticker = WeexService.get_ticker(symbol)
+            ticker = await WeexService.get_ticker(symbol)
             if not ticker:
                 return {"error": "Symbol not found on WEEX"}
 
-            current_price = float(ticker.get('last', 0))
             purchase_price = manual_entry_price
-            growth_pct = None
-            
             # If we don't have a manual entry price, fetch it from history
             if purchase_price is None:
-                import datetime
-                dt = datetime.datetime.strptime(investment_date_str, "%Y-%m-%d")
-                investment_ms = int(dt.timestamp() * 1000)
-                candle = WeexService.get_history(symbol, investment_ms)
-                
-                # Use closing price (index 4) from the candle
-                if candle and len(candle) > 4:
-                    try:
-                        purchase_price = float(candle[4])  # Closing price
-                    except (IndexError, ValueError, TypeError):
-                        pass
-            
-            if purchase_price and purchase_price > 0:
-                growth_pct = round(((current_price - purchase_price) / purchase_price) * 100, 2)
-            
-            return {
-                "symbol": symbol,
-                "current_price": current_price,
-                "purchase_price": purchase_price,
-                "growth_percentage": growth_pct,
-                "high_24h": ticker.get('high_24h'),
-                "low_24h": ticker.get('low_24h'),
-                "price_change_24h_pct": round(float(ticker.get('priceChangePercent', 0)) * 100, 2)
-            }
+                candle = await WeexService.get_history(symbol, WeexService._investment_ms(investment_date_str))
+                purchase_price = WeexService._closing_price(candle)
+
+            return WeexService._growth(symbol, ticker, purchase_price)
         except Exception as e:
             print(f"Growth calculation error: {str(e)}")
             return {"error": str(e)}
 
+    @staticmethod
+    async def calculate_investment_growth_batch(holdings, max_concurrency: int = None):
+        """
+        calculate_investment_growth for many holdings at once.
+
+        Args:
+            holdings: dicts with 'id', 'symbol', 'date' and optional 'entryPrice'
+            max_concurrency: Upstream requests in flight at once (WEEX_BATCH_CONCURRENCY)
+
+        Returns:
+            {holding id: growth result or {"error": ...}}. Each distinct
+            symbol's ticker and each distinct (symbol, day) candle is fetched
+            once, concurrently.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or WeexService.BATCH_CONCURRENCY)
+
+        async def bounded(coro):
+            async with semaphore:
+                try:
+                    return await coro
+                except Exception as e:
+                    print(f"WEEX batch lookup error: {str(e)}")
+                    return None
+
+        results = {}
+        candle_keys = {}
+        for holding in holdings:
+            if holding.get('entryPrice') is None:
+                try:
+                    day_ms = WeexService._investment_ms(holding['date'])
+                except (KeyError, TypeError, ValueError) as e:
+                    results[holding.get('id')] = {"error": f"Invalid date: {e}"}
+                    continue
+                candle_keys[holding.get('id')] = (WeexService.weex_symbol(holding['symbol']), day_ms)
+
+        symbols = list({WeexService.weex_symbol(holding['symbol']) for holding in holdings if holding.get('id') not in results})
+        candles = list(set(candle_keys.values()))
+
+        # Several purchase days of one symbol: one backfill call for the span
+        # instead of a call per day (later lookups are then served locally)
+        store = CandleStore.get_instance()
+        days_by_symbol = {}
+        for symbol, day_ms in candles:
+            if store.get(symbol, day_ms) is None:
+                days_by_symbol.setdefault(symbol, []).append(day_ms)
+        backfills = [
+            (symbol, min(days), max(days) + DAY_MS) for symbol, days in days_by_symbol.items()
+            if len(days) > 1 and (max(days) - min(days)) // DAY_MS < store.max_backfill_days
+        ]
+
+        fetched = await asyncio.gather(
+            *(bounded(WeexService.get_ticker(symbol)) for symbol in symbols),
+            *(bounded(WeexService.backfill_candles(symbol, start_ms, end_ms)) for symbol, start_ms, end_ms in backfills)
+        )
+        tickers = dict(zip(symbols, fetched[:len(symbols)]))
+        history = await asyncio.gather(*(bounded(WeexService.get_history(symbol, day_ms)) for symbol, day_ms in candles))
+        closes = {key: WeexService._closing_price(candle) for key, candle in zip(candles, history)}
+
+        for holding in holdings:
+            holding_id = holding.get('id')
+            if holding_id in results:
+                continue
+            ticker = tickers.get(WeexService.weex_symbol(holding['symbol']))
+            if not ticker:
+                results[holding_id] = {"error": "Symbol not found on WEEX"}
+                continue
+            purchase_price = holding.get('entryPrice')
+            if purchase_price is None:
+                purchase_price = closes.get(candle_keys[holding_id])
+            try:
+                results[holding_id] = WeexService._growth(holding['symbol'], ticker, purchase_price)
+            except (TypeError, ValueError) as e:
+                results[holding_id] = {"error": str(e)}
+        return results
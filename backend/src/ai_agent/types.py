@@ -21,3 +21,14 @@ class AgentResponse:
     intent: AgentIntent
     trace_id: Optional[str] = None
     metadata: Dict[str, Any] = None
+
+@dataclass
+class LLMRequest:
+    """Prompt built by a handler, ready to be sent to the LLM gateway."""
+    messages: List[Dict[str, Any]]
+    metadata: Dict[str, Any]
+    temperature: float = 0.7
+    max_tokens: int = 1500
+    extra_body: Optional[Dict[str, Any]] = None
+    # Seconds the completion may be served from the completion cache
+    cache_ttl: Optional[float] = None
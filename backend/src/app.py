@@ -11,8 +11,11 @@ from routes.db import db_blue_print
 from routes.portfolio import portfolio_blue_print
 from routes.agent import agent_blue_print
 from routes.market import market_blue_print
+from ai_agent.core import AgentOrchestrator
+from utils.logger import Logger
 
 load_dotenv()
+logger = Logger.get_instance()
 
 app = Flask(__name__)
 
@@ -38,6 +41,13 @@ app.register_blueprint(portfolio_blue_print, url_prefix='/api/portfolio')
 app.register_blueprint(agent_blue_print, url_prefix='/api/agent')
 app.register_blueprint(market_blue_print, url_prefix='/api/market')
 
+# Build the shared agent orchestrator up front so the first chat request
+# does not pay for constructing the router, handlers and LLM client.
+try:
+    AgentOrchestrator.get_instance()
+except Exception as error:
+    logger.error('Failed to warm up agent orchestrator', metadata={'error': str(error)})
+
 # Root route
 @app.route('/')
 def root():
@@ -8,6 +8,8 @@ Changes:
 Version 1.0: Initial database creation.
 Version 1.1: Added backup and sync functionality.
 Version 1.2: Ported to Python 3.
+Version 1.3: Connection-per-thread pool (WAL) behind the shared `db` handle.
+Version 1.4: Backups via the SQLite online backup API on a background thread.
 
 Instructions to run: This module can be imported from other backend system
                      files to perform database operations.
@@ -17,10 +19,11 @@ File Execution State: Validation is in progress
 
 import sqlite3
 import os
-import shutil
 from pathlib import Path
 from utils.logger import Logger
 from utils.migration_runner import MigrationRunner
+from utils.db_pool import ConnectionPool, ConnectionProxy
+from utils.db_manager import Replicator
 
 logger = Logger.get_instance()
 
@@ -28,31 +31,40 @@ logger = Logger.get_instance()
 db_path = Path(__file__).parent.parent / "database.sqlite"
 backup_path = Path(__file__).parent.parent / "database_backup.sqlite"
 
+# Copies the primary onto the backup off the request path, batching syncs
+# that arrive within DB_BACKUP_MAX_LAG seconds of each other
+backup_replicator = Replicator(db_path, [backup_path], max_lag=float(os.getenv('DB_BACKUP_MAX_LAG', 5.0)))
+
 def create_backup():
     """Create backup database"""
     if db_path.exists():
-        shutil.copy2(db_path, backup_path)
+        backup_replicator.replicate_now()
         logger.info('Database backup created successfully')
     else:
         logger.error('Primary database not found for backup')
 
 def sync_to_backup():
-    """Sync primary to backup"""
+    """Sync primary to backup (asynchronously, within DB_BACKUP_MAX_LAG seconds)"""
     try:
         if db_path.exists():
-            shutil.copy2(db_path, backup_path)
-            logger.info('Database synced to backup successfully')
+            backup_replicator.mark_dirty()
+            logger.info('Database sync to backup scheduled')
     except Exception as error:
         logger.error('Failed to sync database to backup', metadata={'error': str(error)})
 
-# Initialize database connections
-db = sqlite3.connect(str(db_path), check_same_thread=False)
+# Initialize database connections. `db` resolves to the calling thread's
+# pooled connection (WAL, row factory enabled), see utils.db_pool.
+pool = ConnectionPool(db_path)
+db = ConnectionProxy(pool)
 backup_db = sqlite3.connect(str(backup_path), check_same_thread=False)
 
 # Enable row factory for dict-like access
-db.row_factory = sqlite3.Row
 backup_db.row_factory = sqlite3.Row
 
+def get_connection() -> sqlite3.Connection:
+    """The calling thread's pooled connection to the primary database."""
+    return pool.connection()
+
 # Run migrations
 migration_runner = MigrationRunner(db)
 try:
@@ -7,6 +7,9 @@ Creation Date: 02-Feb-2026
 Changes:
 Version 1.0: Initial creation with agent functionality.
 Version 1.1: Added userId support for personalized insights.
+Version 1.2: Added Server-Sent Events streaming variant of generate-insight.
+Version 1.3: Per-stage timings for session writes, history, routing, context,
+             generation and persistence.
 
 Instructions to run: This module can be imported from other backend system
                      files to expose agent functionality via backend server.
@@ -14,12 +17,14 @@ Instructions to run: This module can be imported from other backend system
 File Execution State: Validation is in progress
 """
 
-import asyncio
-from flask import Blueprint, request, jsonify
+import json
+from flask import Blueprint, request, jsonify, Response
 from utils.logger import Logger
 from ai_agent.chat_manager import ChatManager
 from ai_agent.core import AgentOrchestrator
 from utils.opik_client import OpikConfig
+from utils.async_runner import run_async, AsyncRunner
+from utils.timing import StageTimer
 
 agent_blue_print = Blueprint('agent', __name__)
 logger = Logger.get_instance()
@@ -67,6 +72,30 @@ def delete_session(session_id):
     ChatManager.delete_session(session_id)
     return jsonify({'success': True})
 
+# Stages timed by the context prefetcher (user profile/holdings lookup, market context)
+CONTEXT_STAGES = ('user_profile', 'holdings', 'market_context')
+
+def _final_timings(result, timer):
+    """
+    Completes the orchestrator's timings with the stages timed around it
+    (persistence, request total) and stores them in the response metadata.
+    """
+    timings = dict((result.metadata or {}).get('timings') or {})
+    timings.update(timer.finish())
+    result.metadata = dict(result.metadata or {}, timings=timings)
+    return timings
+
+def _load_history(session_id):
+    """Returns the session's messages in OpenAI chat format."""
+    history = []
+    if session_id:
+        messages = ChatManager.get_messages(session_id)
+        # Convert to OpenAI format: [{"role": "user", "content": "..."}, {"role": "assistant", "content": "..."}]
+        for msg in messages:
+            role = "assistant" if msg.get('sender') == 'bot' else "user"
+            history.append({"role": role, "content": msg.get('content', '')})
+    return history
+
 @agent_blue_print.route('/generate-insight', methods=['POST'])
 def generate_insight():
     try:
@@ -89,39 +118,35 @@ def generate_insight():
             logger.error('ReAct agent request missing query', user_id)
             return jsonify({'error': 'Query is required'}), 400
 
+        timer = StageTimer()
         # Handle session
-        if not session_id and user_id:
-            session_id = ChatManager.create_session(user_id, title=query[:50])
-        
-        if session_id:
-            ChatManager.add_message(session_id, 'user', query)
+        with timer.stage('session_write'):
+            if not session_id and user_id:
+                session_id = ChatManager.create_session(user_id, title=query[:50])
 
-        # Run async function in sync context
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        # New Agent Orchestrator Call
-        orchestrator = AgentOrchestrator()
+            if session_id:
+                ChatManager.add_message(session_id, 'user', query)
+
+        # Shared orchestrator (router, handlers and LLM client are built once per app)
+        orchestrator = AgentOrchestrator.get_instance()
         
         # Fetch conversation history for context
-        history = []
-        if session_id:
-            messages = ChatManager.get_messages(session_id)
-            # Convert to OpenAI format: [{"role": "user", "content": "..."}, {"role": "assistant", "content": "..."}]
-            for msg in messages:
-                role = "assistant" if msg.get('sender') == 'bot' else "user"
-                history.append({"role": role, "content": msg.get('content', '')})
+        with timer.stage('history_fetch'):
+            history = _load_history(session_id)
         
-        result = loop.run_until_complete(orchestrator.process(
+        # Run on the shared event loop so concurrent requests overlap their I/O
+        result = run_async(orchestrator.process(
             query,
             user_id,
-            history  # Pass conversation history
+            history,  # Pass conversation history
+            timer
         ))
-        loop.close()
 
         bot_msg_id = None
-        if session_id:
-            bot_msg_id = ChatManager.add_message(session_id, 'bot', result.content, trace_id=result.trace_id)
+        with timer.stage('persistence'):
+            if session_id:
+                bot_msg_id = ChatManager.add_message(session_id, 'bot', result.content, trace_id=result.trace_id)
+        timings = _final_timings(result, timer)
 
         # log the successful generation
         logger.info('AI Agent insight generated successfully', user_id, {
@@ -138,7 +163,8 @@ def generate_insight():
              steps.append({
                  "thought": f"Analyzing user intent for query: '{query}'",
                  "action": "IntentRouter.classify",
-                 "observation": f"Classified as {result.intent}. Confidence: {result.metadata.get('intent_confidence', 'N/A')}. Reasoning: {result.metadata.get('intent_reasoning', 'N/A')}"
+                 "observation": f"Classified as {result.intent}. Confidence: {result.metadata.get('intent_confidence', 'N/A')}. Reasoning: {result.metadata.get('intent_reasoning', 'N/A')}",
+                 "latencyMs": timings.get('router_classification')
              })
 
              # 2. Handler Step (Dynamic based on intent)
@@ -146,7 +172,8 @@ def generate_insight():
              steps.append({
                  "thought": f"Routing to specialist: {handler_name}",
                  "action": f"{handler_name}.process",
-                 "observation": "fetching user data and market context..."
+                 "observation": "fetching user data and market context...",
+                 "latencyMs": round(sum(timings.get(key, 0) for key in CONTEXT_STAGES), 2)
              })
              
              # 3. Model Step
@@ -154,7 +181,8 @@ def generate_insight():
              steps.append({
                  "thought": f"Generating response using {model_used}",
                  "action": "LLM Generation",
-                 "observation": "Insight generated successfully."
+                 "observation": "Insight generated successfully.",
+                 "latencyMs": timings.get('llm_generation')
              })
 
         return jsonify({
@@ -164,7 +192,8 @@ def generate_insight():
                 'finalAnswer': result.content,
                 'sessionId': session_id,
                 'messageId': bot_msg_id,
-                'traceId': result.trace_id
+                'traceId': result.trace_id,
+                'timings': timings
             }
         })
     except Exception as error:
@@ -175,4 +204,78 @@ def generate_insight():
         return jsonify({
             'error': 'Failed to generate insight',
             'details': str(error)
-        }), 500
\ No newline at end of file
+        }), 500
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@agent_blue_print.route('/generate-insight/stream', methods=['POST'])
+def generate_insight_stream():
+    """
+    Server-Sent Events variant of /generate-insight. Emits a `route` event
+    with the router decision, `token` events as the model generates, and a
+    final `done` event once the assembled answer has been persisted.
+    """
+    data = request.get_json() or {}
+    query = data.get('query')
+    user_id = data.get('userId')
+    session_id = data.get('sessionId')
+
+    logger.info('Streaming agent insight request received', user_id, {
+        'query': query,
+        'has_user_id': bool(user_id),
+        'session_id': session_id
+    })
+    if not query:
+        logger.error('Streaming agent request missing query', user_id)
+        return jsonify({'error': 'Query is required'}), 400
+
+    timer = StageTimer()
+    with timer.stage('session_write'):
+        if not session_id and user_id:
+            session_id = ChatManager.create_session(user_id, title=query[:50])
+        if session_id:
+            ChatManager.add_message(session_id, 'user', query)
+    with timer.stage('history_fetch'):
+        history = _load_history(session_id)
+
+    orchestrator = AgentOrchestrator.get_instance()
+
+    def events():
+        result = None
+        try:
+            for event in AsyncRunner.get_instance().iterate(orchestrator.stream(query, user_id, history, timer)):
+                if event['event'] == 'response':
+                    result = event['data']
+                elif event['event'] == 'route':
+                    yield _sse('route', dict(event['data'], sessionId=session_id))
+                else:
+                    yield _sse('token', {'text': event['data']})
+        except Exception as error:
+            logger.critical('Streaming agent failed to generate insight', user_id, {'error': str(error)})
+            yield _sse('error', {'error': 'Failed to generate insight', 'details': str(error)})
+            return
+
+        bot_msg_id = None
+        with timer.stage('persistence'):
+            if session_id and result is not None:
+                bot_msg_id = ChatManager.add_message(session_id, 'bot', result.content, trace_id=result.trace_id)
+        if result is not None:
+            _final_timings(result, timer)
+
+        logger.info('AI Agent insight streamed successfully', user_id, {
+            'intent': result.intent if result else None,
+            'response_length': len(result.content) if result else 0
+        })
+        yield _sse('done', {
+            'finalAnswer': result.content if result else '',
+            'sessionId': session_id,
+            'messageId': bot_msg_id,
+            'traceId': result.trace_id if result else None,
+            'metadata': result.metadata if result else None
+        })
+
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
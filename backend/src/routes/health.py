@@ -8,9 +8,16 @@ Instructions to run: [TODO]
 
 File Execution State: Validation is in progress
 """
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, Response
 import os
-from utils.opik_client import OpikConfig
+from utils.opik_client import OpikConfig, TraceExporter
+from ai_agent.local_classifier import LocalIntentClassifier
+from ai_agent.router_cache import RouterCache
+from ai_agent.completion_cache import CompletionCache
+from utils.ttl_cache import cache_stats
+from utils.timing import stage_metrics
+from ai_agent.tools import MarketDataRefresher
+from ai_agent.market_client import get_market_client
 
 health_blue_print = Blueprint('health', __name__)
 
@@ -22,7 +29,27 @@ def health_check():
         'message': 'Backend is running',
         'opik': {
             'available': opik_client is not None,
-            'project': os.getenv("OPIK_PROJECT_NAME", "FINARTH")
-        }
+            'project': os.getenv("OPIK_PROJECT_NAME", "FINARTH"),
+            # Background exporter queue depth, drops and flushes
+            'export': TraceExporter.get_instance().stats()
+        },
+        # Share of intents resolved without an LLM call and the latency saved
+        'router': LocalIntentClassifier.get_instance().stats.as_dict(),
+        # Background market snapshot refresh: age, failures
+        'market': MarketDataRefresher.get_instance().stats(),
+        # Shared CoinGecko/WEEX HTTP client: requests, retries, failures
+        'market_http': get_market_client().stats()
     }
-    return jsonify(status)
\ No newline at end of file
+    return jsonify(status)
+
+@health_blue_print.route('/caches', methods=['GET'])
+def cache_health():
+    # Make sure the shared caches are reported even before their first lookup
+    RouterCache.get_instance()
+    CompletionCache.get_instance()
+    return jsonify(cache_stats())
+
+@health_blue_print.route('/metrics', methods=['GET'])
+def metrics():
+    # Per-stage agent latency histograms and p50/p95/p99, Prometheus text format
+    return Response(stage_metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
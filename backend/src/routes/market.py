@@ -1,6 +1,6 @@
 from ai_agent.tools import MarketDataService, WeexService
 from flask import Blueprint, jsonify, request
-import asyncio
+from utils.async_runner import run_async
 
 market_blue_print = Blueprint('market', __name__)
 
@@ -10,9 +10,7 @@ def get_market_dashboard():
     Endpoint for Dashboard UI to get real-time market data from CoinGecko.
     """
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        data = loop.run_until_complete(MarketDataService.get_dashboard_data())
+        data = run_async(MarketDataService.get_dashboard_data())
         return jsonify(data), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -21,11 +19,21 @@ def get_market_dashboard():
 def get_coin_chart(coin_id):
     """
     Endpoint for Dashboard UI to get historical chart data.
+    Query params: days (number or "max", default 7), vs_currency (default usd).
     """
+    days = request.args.get('days', '7')
+    vs_currency = request.args.get('vs_currency', 'usd')
+    if days != 'max':
+        try:
+            days = float(days)
+        except ValueError:
+            return jsonify({"error": "days must be a number or 'max'"}), 400
+        if days <= 0:
+            return jsonify({"error": "days must be positive"}), 400
+        days = int(days) if days.is_integer() else days
+
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        data = loop.run_until_complete(MarketDataService.get_coin_chart(coin_id))
+        data = run_async(MarketDataService.get_coin_chart(coin_id, days, vs_currency))
         return jsonify(data), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -33,11 +41,27 @@ def get_coin_chart(coin_id):
 @market_blue_print.route('/weex/ticker/<symbol>', methods=['GET'])
 def get_weex_ticker(symbol):
     try:
-        data = WeexService.get_ticker(symbol)
+        data = run_async(WeexService.get_ticker(symbol))
         return jsonify(data), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@market_blue_print.route('/weex/tickers/refresh', methods=['POST'])
+def refresh_weex_tickers():
+    """
+    Refreshes cached WEEX tickers in bulk.
+    Body (optional): {"symbols": [...]}; defaults to every symbol held in a portfolio.
+    """
+    symbols = (request.get_json(silent=True) or {}).get('symbols')
+    if symbols is not None and (not isinstance(symbols, list) or not all(isinstance(s, str) and s for s in symbols)):
+        return jsonify({"error": "symbols must be a list of strings"}), 400
+
+    try:
+        refreshed, total = run_async(WeexService.refresh_tickers(symbols))
+        return jsonify({"refreshed": refreshed, "symbols": total}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @market_blue_print.route('/weex/analysis', methods=['POST'])
 def get_weex_analysis():
     data = request.json
@@ -49,7 +73,50 @@ def get_weex_analysis():
         
     try:
         entry_price = data.get('entryPrice')
-        analysis = WeexService.calculate_investment_growth(symbol, date, manual_entry_price=entry_price)
+        analysis = run_async(WeexService.calculate_investment_growth(symbol, date, manual_entry_price=entry_price))
         return jsonify(analysis), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+@market_blue_print.route('/weex/analysis/batch', methods=['POST'])
+def get_weex_analysis_batch():
+    """
+    Investment growth for many holdings in one call.
+    Body: {"holdings": [{"id", "symbol", "date", "entryPrice"?}, ...]}
+    Returns: {"results": {id: analysis or {"error": ...}},
+              "errors": [{"index", "error"}] for entries without an id}
+    At most BATCH_MAX_ITEMS holdings per call; clients send larger
+    portfolios in chunks.
+    """
+    data = request.json or {}
+    holdings = data.get('holdings')
+    if not isinstance(holdings, list):
+        return jsonify({"error": "holdings must be a list"}), 400
+    if len(holdings) > WeexService.BATCH_MAX_ITEMS:
+        return jsonify({"error": f"At most {WeexService.BATCH_MAX_ITEMS} holdings per batch"}), 400
+
+    # Invalid entries are reported per item; the rest of the batch is still analysed
+    valid, invalid, errors = [], {}, []
+    for index, holding in enumerate(holdings):
+        if not isinstance(holding, dict) or holding.get('id') is None:
+            errors.append({"index": index, "error": "Each holding needs id, symbol and date"})
+            continue
+        if not holding.get('symbol') or not holding.get('date'):
+            invalid[str(holding['id'])] = {"error": "Each holding needs id, symbol and date"}
+            continue
+        if holding.get('entryPrice') is not None:
+            try:
+                holding['entryPrice'] = float(holding['entryPrice'])
+            except (TypeError, ValueError):
+                invalid[str(holding['id'])] = {"error": f"Invalid entryPrice for holding {holding['id']}"}
+                continue
+        valid.append(holding)
+
+    try:
+        results = run_async(WeexService.calculate_investment_growth_batch(valid)) if valid else {}
+        # JSON keys are strings; raw ids of mixed types could not be sorted by jsonify
+        results = {str(holding_id): analysis for holding_id, analysis in results.items()}
+        results.update(invalid)
+        return jsonify({"results": results, "errors": errors}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
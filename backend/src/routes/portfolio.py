@@ -13,6 +13,8 @@ from database import db
 from utils.auth import token_required
 from utils.logger import Logger
 from ai_agent.tools import WeexService
+from ai_agent.engine.portfolio_valuation import PortfolioValuation
+from utils.async_runner import run_async
 import datetime
 
 logger = Logger.get_instance()
@@ -33,6 +35,26 @@ def get_user_portfolio(current_user):
         logger.error(f'Failed to fetch portfolio: {str(e)}')
         return jsonify({'error': 'Failed to fetch portfolio'}), 500
 
+@portfolio_blue_print.route('/summary', methods=['GET'])
+@token_required
+def get_portfolio_summary(current_user):
+    """
+    Mark-to-market summary: invested vs current value, unrealized P&L,
+    allocation at current value, risk metric and per-holding detail.
+    """
+    try:
+        cursor = db.cursor()
+        cursor.execute(
+            'SELECT * FROM portfolio_holdings WHERE user_id = ? ORDER BY created_at DESC',
+            (current_user['id'],)
+        )
+        holdings = [dict(holding) for holding in cursor.fetchall()]
+        summary = run_async(PortfolioValuation.value_portfolio(holdings))
+        return jsonify(summary), 200
+    except Exception as e:
+        logger.error(f'Failed to value portfolio: {str(e)}')
+        return jsonify({'error': 'Failed to value portfolio'}), 500
+
 @portfolio_blue_print.route('/holdings', methods=['POST'])
 @token_required
 def add_holding(current_user):
@@ -48,7 +70,7 @@ def add_holding(current_user):
             try:
                 dt = datetime.datetime.strptime(date, "%Y-%m-%d")
                 start_ms = int(dt.timestamp() * 1000)
-                history = WeexService.get_history(symbol, start_ms)
+                history = run_async(WeexService.get_history(symbol, start_ms))
                 if history and len(history) >= 5:
                     entry_price = float(history[4]) # Closing price on that day
             except Exception as e:
@@ -85,7 +107,7 @@ def update_holding(current_user, holding_id):
                 try:
                     dt = datetime.datetime.strptime(date, "%Y-%m-%d")
                     start_ms = int(dt.timestamp() * 1000)
-                    history = WeexService.get_history(symbol, start_ms)
+                    history = run_async(WeexService.get_history(symbol, start_ms))
                     if history and len(history) >= 5:
                         entry_price = float(history[4])
                 except Exception as e:
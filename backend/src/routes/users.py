@@ -19,7 +19,7 @@ File Execution State: Validation is in progress
 from flask import Blueprint, jsonify, request
 import sqlite3
 from database import db, sync_to_backup
-from utils.auth import Authentication
+from utils.auth import Authentication, auth_cache
 from ai_agent.session_cache import session_cache
 from utils.logger import Logger
 
@@ -52,6 +52,7 @@ def register():
         session_token = Authentication().generate_token()
         cursor.execute('UPDATE users SET session_token = ? WHERE id = ?', (session_token, user_id))
         db.commit()
+        auth_cache.invalidate_user(user_id)
         
         logger.info('User registered successfully', user_id, {'email': email, 'user_id': user_id})
         return jsonify({
@@ -137,6 +138,8 @@ def login():
         session_token = Authentication().generate_token()
         cursor.execute('UPDATE users SET session_token = ? WHERE id = ?', (session_token, user['id']))
         db.commit()
+        # The previous token is no longer valid
+        auth_cache.invalidate_user(user['id'])
         
         logger.info('User login successful', user['id'], {'email': email})
         return jsonify({
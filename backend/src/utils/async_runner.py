@@ -0,0 +1,156 @@
+"""
+File: async_runner.py
+Description: Long-lived asyncio event loop shared by all Flask blueprints.
+
+Flask serves requests on WSGI worker threads. Instead of building a brand new
+event loop per request, blueprints submit their coroutines to one background
+loop so that concurrent requests waiting on OpenRouter / CoinGecko overlap on
+the same loop (and share loop-bound connection pools).
+
+Set ASYNC_LOOP_MODE=per_request to fall back to the legacy behaviour of one
+throw-away loop per call (useful for benchmarking and debugging).
+"""
+
+import asyncio
+import atexit
+import os
+import queue
+import threading
+from typing import Any, AsyncIterator, Awaitable, Iterator, Optional
+from utils.logger import Logger
+
+logger = Logger.get_instance()
+
+class AsyncRunner:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, mode: Optional[str] = None):
+        self.mode = (mode or os.getenv('ASYNC_LOOP_MODE', 'shared')).lower()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Returns the shared loop, starting its thread on first use."""
+        if self._loop is None or self._loop.is_closed():
+            with self._start_lock:
+                if self._loop is None or self._loop.is_closed():
+                    self._start()
+        return self._loop
+
+    def _start(self):
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run_forever():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run_forever, name='finarth-async-loop', daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+        logger.info('Shared async event loop started', metadata={'mode': self.mode})
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Runs a coroutine to completion from synchronous (WSGI) code and
+        returns its result. Exceptions raised by the coroutine propagate.
+        """
+        if self.mode == 'per_request':
+            loop = asyncio.new_event_loop()
+            try:
+                asyncio.set_event_loop(loop)
+                return loop.run_until_complete(asyncio.wait_for(coro, timeout))
+            finally:
+                loop.close()
+
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def iterate(self, agen: AsyncIterator[Any]) -> Iterator[Any]:
+        """
+        Drives an async generator on the shared loop and yields its items to
+        synchronous code (e.g. a streaming Flask response) as they arrive.
+        Closing the returned iterator early cancels the async generator.
+        """
+        if self.mode == 'per_request':
+            loop = asyncio.new_event_loop()
+            try:
+                asyncio.set_event_loop(loop)
+                while True:
+                    try:
+                        yield loop.run_until_complete(agen.__anext__())
+                    except StopAsyncIteration:
+                        return
+            finally:
+                loop.run_until_complete(agen.aclose())
+                loop.close()
+
+        items: queue.Queue = queue.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async for item in agen:
+                    items.put((True, item))
+            except BaseException as error:
+                items.put((False, error))
+                if not isinstance(error, Exception):
+                    raise
+            finally:
+                items.put((True, done))
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self.loop)
+        try:
+            while True:
+                ok, item = items.get()
+                if item is done:
+                    return
+                if not ok:
+                    raise item
+                yield item
+        finally:
+            if not future.done():
+                future.cancel()
+
+    def submit(self, coro: Awaitable[Any]):
+        """Schedules a coroutine on the shared loop without waiting for it."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def shutdown(self, timeout: float = 5.0):
+        """Stops the shared loop and joins its thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread:
+            self._thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+        self._loop = None
+        self._thread = None
+
+def run_async(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """Convenience wrapper around AsyncRunner.get_instance().run()."""
+    return AsyncRunner.get_instance().run(coro, timeout)
+
+@atexit.register
+def _shutdown_runner():
+    if AsyncRunner._instance is not None:
+        AsyncRunner._instance.shutdown()
@@ -1,8 +1,14 @@
 import hashlib
+import os
 import secrets
 from functools import wraps
+from typing import Any, Dict, Optional
 from flask import request, jsonify
 from database import db
+from utils.ttl_cache import TTLCache, register_cache
+
+# Columns handed to protected routes; never the password hash
+PRINCIPAL_COLUMNS = ('id', 'email', 'name')
 
 class Authentication:
     def __init__(self):
@@ -22,6 +28,54 @@ class Authentication:
         """Generate random token"""
         return secrets.token_hex(32)
 
+class AuthCache:
+    """
+    Maps session tokens to a slim user principal so that steady-state
+    authenticated requests skip the users table entirely. Entries are bounded
+    and expire, and `invalidate_user` drops every token of a user whose
+    session_token was rotated (login / register).
+
+    The cache is per process: `invalidate_user` only clears the worker that
+    handled the login, so in other workers a rotated token stays valid until
+    its entry expires. AUTH_CACHE_TTL is therefore kept to a few seconds,
+    which still serves bursts of requests without a users lookup each.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.getenv('AUTH_CACHE_ENABLED', 'true').lower() == 'true'
+        self.enabled = enabled
+        self.tokens = TTLCache(
+            max_entries=max_entries or int(os.getenv('AUTH_CACHE_SIZE', 10000)),
+            ttl=ttl if ttl is not None else float(os.getenv('AUTH_CACHE_TTL', 5))
+        )
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        principal = self.tokens.get(token)
+        return dict(principal) if principal is not None else None
+
+    def set(self, token: str, principal: Dict[str, Any]):
+        if not self.enabled:
+            return
+        self.tokens.set(token, principal)
+
+    def invalidate_user(self, user_id: int):
+        """Forgets every cached token of the user (in this process only)."""
+        self.tokens.delete_where(lambda token, principal: principal['id'] == user_id)
+
+    def clear(self):
+        self.tokens.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.tokens.stats()
+        stats['enabled'] = self.enabled
+        return stats
+
+auth_cache = AuthCache()
+register_cache('auth', auth_cache)
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -30,12 +84,17 @@ def token_required(f):
             return jsonify({'error': 'Token is missing'}), 401
         
         token = token.replace('Bearer ', '')
-        cursor = db.cursor()
-        cursor.execute('SELECT * FROM users WHERE session_token = ?', (token,))
-        user = cursor.fetchone()
-        
-        if not user:
-            return jsonify({'error': 'Invalid token'}), 401
-        
-        return f(dict(user), *args, **kwargs)
+        principal = auth_cache.get(token)
+        if principal is None:
+            cursor = db.cursor()
+            cursor.execute(f'SELECT {", ".join(PRINCIPAL_COLUMNS)} FROM users WHERE session_token = ?', (token,))
+            user = cursor.fetchone()
+
+            if not user:
+                return jsonify({'error': 'Invalid token'}), 401
+
+            principal = dict(user)
+            auth_cache.set(token, dict(principal))
+
+        return f(principal, *args, **kwargs)
     return decorated
\ No newline at end of file
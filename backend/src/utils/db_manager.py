@@ -1,63 +1,279 @@
+import atexit
+import os
 import sqlite3
 import shutil
+import threading
+import time
+import weakref
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from utils.logger import Logger
+from utils.db_pool import ConnectionPool
 
 logger = Logger.get_instance()
 
+class _BackupRestarted(Exception):
+    """Aborts a stepwise backup that keeps being restarted by source writes."""
+
+class Replicator:
+    """
+    Copies a source SQLite database onto one or more targets with the online
+    backup API, on a background thread.
+
+    Writers only call `mark_dirty()`; writes arriving within `max_lag`
+    seconds of the first unreplicated one are batched into a single backup
+    run, so write latency no longer depends on the database size. The source
+    should be in WAL mode so the backup reads a consistent snapshot without
+    blocking writers.
+
+    By default each target is copied in one backup step. With `pages` > 0
+    (DB_REPLICATION_PAGES) it is copied that many pages per step, sleeping
+    `step_sleep` seconds between steps (DB_REPLICATION_STEP_SLEEP), so the
+    source read lock is only held for one step at a time. SQLite restarts a
+    stepwise backup whenever another connection writes to the source, so
+    under steady writes it may never finish; after MAX_RESTARTS restarts the
+    target is copied in a single step instead.
+    """
+
+    MAX_RESTARTS = 3
+
+    def __init__(self, source: Path, targets: List[Path], max_lag: float = 1.0, pages: Optional[int] = None,
+                 step_sleep: Optional[float] = None):
+        self.source = Path(source)
+        self.targets = [Path(target) for target in targets]
+        self.max_lag = max_lag
+        self.pages = pages if pages is not None else int(os.getenv('DB_REPLICATION_PAGES', -1))
+        self.step_sleep = step_sleep if step_sleep is not None else float(os.getenv('DB_REPLICATION_STEP_SLEEP', 0.005))
+        self._cond = threading.Condition()
+        self._dirty_seq = 0
+        self._synced_seq = 0
+        self._pending_since: Optional[float] = None
+        self._urgent = False
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self.runs = 0
+        self.failures = 0
+        self.last_run_ms = 0.0
+        self.last_run_steps = 0
+        self.restarts = 0
+        self.single_step_fallbacks = 0
+        _replicators.add(self)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=f'replicator-{self.source.stem}', daemon=True)
+            self._thread.start()
+
+    def mark_dirty(self):
+        """Records a committed write; replication follows within max_lag."""
+        with self._cond:
+            self._dirty_seq += 1
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            self._stopped = False
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Replicates pending writes now and waits for them; False on timeout."""
+        with self._cond:
+            target = self._dirty_seq
+            if self._synced_seq >= target:
+                return True
+            self._urgent = True
+            self._ensure_thread()
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._synced_seq >= target, timeout)
+
+    def lag(self) -> float:
+        """Seconds since the oldest write that has not been replicated yet."""
+        pending = self._pending_since
+        return time.monotonic() - pending if pending is not None else 0.0
+
+    def replicate_now(self):
+        """Synchronously copies the source onto every target."""
+        started = time.perf_counter()
+        steps = 0
+        source = sqlite3.connect(str(self.source))
+        try:
+            for target_path in self.targets:
+                target = sqlite3.connect(str(target_path), timeout=30)
+                try:
+                    steps += self._backup(source, target)
+                finally:
+                    target.close()
+        finally:
+            source.close()
+        self.runs += 1
+        self.last_run_ms = (time.perf_counter() - started) * 1000
+        self.last_run_steps = steps
+
+    def _backup(self, source: sqlite3.Connection, target: sqlite3.Connection) -> int:
+        """Copies source onto target; returns the number of backup steps taken."""
+        if self.pages <= 0:
+            source.backup(target, pages=-1)
+            return 1
+
+        steps = 0
+        restarts = 0
+        previous = None
+
+        def progress(status, remaining, total):
+            nonlocal steps, restarts, previous
+            steps += 1
+            # More pages left than after the last step: a write restarted the backup
+            if previous is not None and remaining > previous:
+                restarts += 1
+                self.restarts += 1
+                if restarts >= self.MAX_RESTARTS:
+                    raise _BackupRestarted()
+            previous = remaining
+            # Called after each step, while the source is unlocked
+            if remaining and self.step_sleep > 0:
+                time.sleep(self.step_sleep)
+
+        try:
+            source.backup(target, pages=self.pages, progress=progress)
+        except _BackupRestarted:
+            self.single_step_fallbacks += 1
+            source.backup(target, pages=-1)
+            steps += 1
+        return steps
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._stopped or self._synced_seq < self._dirty_seq)
+                if self._stopped and self._synced_seq >= self._dirty_seq:
+                    return
+                # Batch every write that lands within max_lag of the first one
+                deadline = self._pending_since + self.max_lag
+                while not (self._urgent or self._stopped):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                seq = self._dirty_seq
+                self._pending_since = None
+                self._urgent = False
+
+            try:
+                self.replicate_now()
+                ok = True
+            except sqlite3.Error as error:
+                ok = False
+                self.failures += 1
+                logger.error('Database replication failed', metadata={'error': str(error), 'source': str(self.source)})
+
+            with self._cond:
+                if ok:
+                    self._synced_seq = max(self._synced_seq, seq)
+                elif self._pending_since is None:
+                    # Retry after another max_lag
+                    self._pending_since = time.monotonic()
+                self._cond.notify_all()
+
+    def stop(self, timeout: float = 30.0):
+        """Flushes pending writes and stops the background thread."""
+        self.flush(timeout)
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'runs': self.runs,
+            'failures': self.failures,
+            'last_run_ms': round(self.last_run_ms, 2),
+            'last_run_steps': self.last_run_steps,
+            'restarts': self.restarts,
+            'single_step_fallbacks': self.single_step_fallbacks,
+            'pending_writes': self._dirty_seq - self._synced_seq,
+            'lag_seconds': round(self.lag(), 3),
+            'max_lag': self.max_lag
+        }
+
+_replicators: 'weakref.WeakSet[Replicator]' = weakref.WeakSet()
+
+@atexit.register
+def _flush_replicators():
+    for replicator in list(_replicators):
+        replicator.stop()
+
 class DatabaseManager:
-    def __init__(self, base_path: Path):
+    def __init__(self, base_path: Path, replication: Optional[str] = None, max_lag: Optional[float] = None):
+        """
+        Args:
+            base_path: Path the write/backup/read database names derive from
+            replication: 'incremental' (background backup API, default) or
+                         'copy' (legacy full file copy after every write)
+            max_lag: Seconds a write may take to reach the read database
+        """
         self.write_db = base_path.parent / f"{base_path.stem}_write.db"
         self.backup_db = base_path.parent / f"{base_path.stem}_backup.db"
         self.read_db = base_path.parent / f"{base_path.stem}_read.db"
-        
+        self.replication = (replication or os.getenv('DB_REPLICATION_MODE', 'incremental')).lower()
+
         self.write_db.parent.mkdir(parents=True, exist_ok=True)
-        
+
         if not self.write_db.exists():
             self._init_databases()
-    
+
+        self._write_pool = ConnectionPool(self.write_db)
+        self._read_pool = ConnectionPool(self.read_db)
+        self.replicator = Replicator(
+            self.write_db,
+            [self.backup_db, self.read_db],
+            max_lag=max_lag if max_lag is not None else float(os.getenv('DB_REPLICATION_MAX_LAG', 1.0))
+        )
+
     def _init_databases(self):
         sqlite3.connect(str(self.write_db)).close()
         shutil.copy2(self.write_db, self.backup_db)
         shutil.copy2(self.write_db, self.read_db)
         logger.info('Initialized write, backup, and read databases')
-    
+
     def get_write_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(str(self.write_db), check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
-    
+        return self._write_pool.connection()
+
     def get_read_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(str(self.read_db), check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
-    
+        return self._read_pool.connection()
+
     def _replicate(self):
-        shutil.copy2(self.write_db, self.backup_db)
-        shutil.copy2(self.backup_db, self.read_db)
-    
+        if self.replication == 'copy':
+            # Fold the WAL into the main file so the copy is complete
+            self.get_write_connection().execute('PRAGMA wal_checkpoint(FULL)')
+            shutil.copy2(self.write_db, self.backup_db)
+            shutil.copy2(self.backup_db, self.read_db)
+        else:
+            self.replicator.mark_dirty()
+
+    def sync(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every committed write is visible in the read database."""
+        if self.replication == 'copy':
+            return True
+        return self.replicator.flush(timeout)
+
     def execute_write(self, query: str, params: tuple = ()):
         conn = self.get_write_connection()
+        cursor = conn.cursor()
         try:
-            cursor = conn.cursor()
             cursor.execute(query, params)
             conn.commit()
-            lastrowid = cursor.lastrowid
-        finally:
-            conn.close()
-        
+        except Exception:
+            conn.rollback()
+            raise
+        lastrowid = cursor.lastrowid
+
         self._replicate()
         return lastrowid
-    
+
     def execute_read(self, query: str, params: tuple = ()):
-        conn = self.get_read_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            return cursor.fetchall()
-        finally:
-            conn.close()
+        cursor = self.get_read_connection().cursor()
+        cursor.execute(query, params)
+        return cursor.fetchall()
 
 _db_manager: Optional[DatabaseManager] = None
 
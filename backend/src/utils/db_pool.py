@@ -0,0 +1,140 @@
+"""
+File: db_pool.py
+Description: Connection-per-thread SQLite pool.
+
+Every thread that touches the database gets its own connection (so Flask
+worker threads no longer share one connection without locking), and that
+connection is reused for the lifetime of the thread instead of reconnecting
+per query. When a thread exits its connection goes back to a bounded idle
+pool for the next thread, which matters for servers that spawn a thread per
+request.
+
+Connections are opened in WAL mode with synchronous=NORMAL so readers do not
+block the writer, with a busy timeout instead of immediate "database is
+locked" errors, and with a larger prepared statement cache.
+"""
+
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Union
+
+class _Lease:
+    """Thread-local holder; hands the connection back when its thread exits."""
+    __slots__ = ('pool', 'conn')
+
+    def __init__(self, pool: 'ConnectionPool', conn: sqlite3.Connection):
+        self.pool = pool
+        self.conn = conn
+
+    def __del__(self):
+        self.pool._release(self.conn)
+
+class ConnectionPool:
+    BUSY_TIMEOUT_MS = 5000
+    CACHED_STATEMENTS = 256
+    MAX_IDLE = 16
+
+    def __init__(self, path: Union[str, Path], busy_timeout_ms: int = BUSY_TIMEOUT_MS,
+                 cached_statements: int = CACHED_STATEMENTS, max_idle: int = MAX_IDLE):
+        self.path = str(path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=max_idle)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.opened = 0
+        self.reused = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # Leases move between threads, but only one thread uses a connection at a time
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout_ms / 1000,
+            cached_statements=self.cached_statements,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+        with self._lock:
+            self.opened += 1
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """The calling thread's connection, created or taken from the idle pool on first use."""
+        lease = getattr(self._local, 'lease', None)
+        if lease is not None:
+            return lease.conn
+        try:
+            conn = self._idle.get_nowait()
+            with self._lock:
+                self.reused += 1
+        except queue.Empty:
+            conn = self._connect()
+        self._local.lease = _Lease(self, conn)
+        return conn
+
+    def _release(self, conn: sqlite3.Connection):
+        try:
+            if self._closed:
+                conn.close()
+                return
+            if conn.in_transaction:
+                # Work left uncommitted by a finished thread is discarded
+                conn.rollback()
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def release_current(self):
+        """Returns the calling thread's connection to the pool early."""
+        lease = getattr(self._local, 'lease', None)
+        if lease is not None:
+            del self._local.lease
+
+    def close_all(self):
+        """Closes idle connections; leased ones close when their thread exits."""
+        self._closed = True
+        self.release_current()
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'path': self.path,
+                'opened': self.opened,
+                'reused': self.reused,
+                'idle': self._idle.qsize()
+            }
+
+class ConnectionProxy:
+    """
+    Drop-in stand-in for a sqlite3.Connection that forwards every attribute to
+    the calling thread's pooled connection, so existing `db.cursor()` /
+    `db.commit()` call sites keep working unchanged.
+    """
+
+    def __init__(self, pool: ConnectionPool):
+        object.__setattr__(self, '_pool', pool)
+
+    def __getattr__(self, name: str):
+        return getattr(self._pool.connection(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._pool.connection(), name, value)
+
+    def __enter__(self):
+        return self._pool.connection().__enter__()
+
+    def __exit__(self, *exc):
+        return self._pool.connection().__exit__(*exc)
@@ -1,9 +1,14 @@
 import os
+import sys
 import json
+import atexit
+import queue
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import inspect
 
 class LogLevel(Enum):
@@ -12,14 +17,55 @@ class LogLevel(Enum):
     ERROR = 'ERROR'
     CRITICAL = 'CRITICAL'
 
+# Records below the configured level are dropped; plain ints keep the check cheap
+_DEBUG, _INFO, _ERROR, _CRITICAL = 10, 20, 40, 50
+LEVEL_SEVERITY = {
+    LogLevel.DEBUG: _DEBUG,
+    LogLevel.INFO: _INFO,
+    LogLevel.ERROR: _ERROR,
+    LogLevel.CRITICAL: _CRITICAL
+}
+
+class _LogFile:
+    """An open log file in a rotation series, with its line and byte counts kept in memory."""
+    __slots__ = ('base_filename', 'path', 'index', 'lines', 'bytes', 'handle')
+
+    def __init__(self, base_filename: str, path: Path, index: int, lines: int):
+        self.base_filename = base_filename
+        self.path = path
+        self.index = index
+        self.lines = lines
+        self.bytes = path.stat().st_size if path.exists() else 0
+        self.handle = open(path, 'a')
+
 class Logger:
+    """
+    Application logger writing one file series per user per day.
+
+    Log calls only format the line and put it on a queue; a background writer
+    thread drains the queue in batches, appends to the files it keeps open and
+    echoes to the console. Line and byte counts are kept in memory, so files
+    are only read once (when a series is first opened) to find where to resume.
+    Set LOG_ASYNC=false to write synchronously on the calling thread.
+
+    Records below `log_level` (LOG_LEVEL) return before any formatting or
+    stack inspection. `format` (LOG_FORMAT) is 'text' for the colored console
+    style or 'json' for one JSON object per line; `caller_info`
+    (LOG_CALLER_INFO) controls the file:line lookup.
+    """
     _instance = None
 
     def __init__(self):
         self.config = {
             'max_lines_per_file': 1000,
-            'log_level': LogLevel.DEBUG,
-            'enable_colors': True
+            # 0 disables size based rotation
+            'max_bytes_per_file': int(os.getenv('LOG_MAX_BYTES_PER_FILE', 0)),
+            'log_level': LogLevel(os.getenv('LOG_LEVEL', 'DEBUG').upper()),
+            'format': os.getenv('LOG_FORMAT', 'text').lower(),
+            'caller_info': os.getenv('LOG_CALLER_INFO', 'true').lower() == 'true',
+            'enable_colors': True,
+            'async': os.getenv('LOG_ASYNC', 'true').lower() == 'true',
+            'max_open_files': 32
         }
         self.log_dir = Path(__file__).parent.parent / 'logs'
         self.color_codes = {
@@ -29,7 +75,16 @@ class Logger:
             LogLevel.CRITICAL: '\033[31m',  # Red
             'RESET': '\033[0m'
         }
+        self._threshold = LEVEL_SEVERITY[self.config['log_level']]
         self._ensure_log_directory()
+        self._files: 'OrderedDict[str, _LogFile]' = OrderedDict()
+        self._files_lock = threading.Lock()
+        self._queue: 'queue.SimpleQueue' = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_pid: Optional[int] = None
+        self._writer_lock = threading.Lock()
+        self.dropped = 0
+        atexit.register(self.close)
 
     @classmethod
     def get_instance(cls):
@@ -39,6 +94,13 @@ class Logger:
 
     def configure(self, config: Dict[str, Any]):
         self.config.update(config)
+        if isinstance(self.config['log_level'], str):
+            self.config['log_level'] = LogLevel(self.config['log_level'].upper())
+        self._threshold = LEVEL_SEVERITY[self.config['log_level']]
+
+    def is_enabled(self, level: LogLevel) -> bool:
+        """Whether records at this level are written; use to guard costly log arguments."""
+        return LEVEL_SEVERITY[level] >= self._threshold
 
     def _ensure_log_directory(self):
         self.log_dir.mkdir(exist_ok=True)
@@ -55,20 +117,123 @@ class Logger:
             return len([line for line in f if line.strip()])
 
     def _get_next_log_file(self, user_id: Optional[int] = None) -> Path:
-        base_filename = self._get_log_filename(user_id)
-        base_path = self.log_dir / base_filename
-        file_index = 1
-        current_file = base_path
-        # check if the current file exceeds max lines.
-        while current_file.exists():
-            line_count = self._get_current_file_line_count(current_file)
-            if line_count < self.config['max_lines_per_file']:
-                return current_file
-            # If the current file exceeds max lines, increment the index and try again.
-            name_without_ext = base_filename.replace('.log', '')
-            current_file = self.log_dir / f'{name_without_ext}_{file_index}.log'
-            file_index += 1
-        return current_file
+        with self._files_lock:
+            return self._open_log_file(self._get_log_filename(user_id)).path
+
+    def _series_path(self, base_filename: str, index: int) -> Path:
+        if index == 0:
+            return self.log_dir / base_filename
+        return self.log_dir / f"{base_filename.replace('.log', '')}_{index}.log"
+
+    def _is_full(self, log_file: _LogFile) -> bool:
+        max_bytes = self.config['max_bytes_per_file']
+        return log_file.lines >= self.config['max_lines_per_file'] or (max_bytes and log_file.bytes >= max_bytes)
+
+    def _open_log_file(self, base_filename: str) -> _LogFile:
+        """Current file of a series, opening (and rotating) it as needed. Caller holds _files_lock."""
+        log_file = self._files.get(base_filename)
+        if log_file is not None:
+            self._files.move_to_end(base_filename)
+            if not self._is_full(log_file):
+                return log_file
+            # Rotate without re-reading: the next index is known
+            log_file.handle.close()
+            index = log_file.index + 1
+            path = self._series_path(base_filename, index)
+            log_file = _LogFile(base_filename, path, index, self._get_current_file_line_count(path))
+        else:
+            # First use of this series in the process: skip past files that are already full
+            index = 0
+            path = self._series_path(base_filename, index)
+            line_count = self._get_current_file_line_count(path)
+            while line_count >= self.config['max_lines_per_file']:
+                index += 1
+                path = self._series_path(base_filename, index)
+                line_count = self._get_current_file_line_count(path)
+            log_file = _LogFile(base_filename, path, index, line_count)
+            while len(self._files) >= self.config['max_open_files']:
+                _, idle = self._files.popitem(last=False)
+                idle.handle.close()
+        self._files[base_filename] = log_file
+        if self._is_full(log_file):
+            return self._open_log_file(base_filename)
+        return log_file
+
+    def _write_batch(self, records: List[Tuple[str, str, Any]]):
+        """Appends formatted lines to their files and the console, flushing each once."""
+        touched = set()
+        consoles: Dict[int, Tuple[Any, List[str]]] = {}
+        with self._files_lock:
+            for base_filename, entry, console in records:
+                log_file = self._open_log_file(base_filename)
+                log_file.handle.write(entry + '\n')
+                log_file.lines += 1
+                log_file.bytes += len(entry) + 1
+                touched.add(log_file)
+                if console is not None:
+                    consoles.setdefault(id(console), (console, []))[1].append(entry)
+            for log_file in touched:
+                # Files rotated away mid-batch were flushed on close
+                if not log_file.handle.closed:
+                    log_file.handle.flush()
+        # Also log to console for development
+        for console, entries in consoles.values():
+            try:
+                console.write('\n'.join(entries) + '\n')
+            except ValueError:
+                # The stream was closed (e.g. a redirected buffer) before the batch was written
+                pass
+
+    def _ensure_writer(self):
+        if self._writer is not None and self._writer_pid == os.getpid():
+            return
+        with self._writer_lock:
+            if self._writer is not None and self._writer_pid == os.getpid():
+                return
+            if self._writer_pid is not None:
+                # Forked worker: the parent's thread, queue and handles did not survive
+                self._queue = queue.SimpleQueue()
+                self._files = OrderedDict()
+                self._files_lock = threading.Lock()
+            self._writer_pid = os.getpid()
+            self._writer = threading.Thread(target=self._run_writer, name='log-writer', daemon=True)
+            self._writer.start()
+
+    def _run_writer(self):
+        log_queue = self._queue
+        while True:
+            records = [log_queue.get()]
+            # Drain whatever else is queued so it shares one write and flush
+            while len(records) < 1000:
+                try:
+                    records.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            waiters = [record for record in records if isinstance(record, threading.Event)]
+            lines = [record for record in records if not isinstance(record, threading.Event)]
+            try:
+                if lines:
+                    self._write_batch(lines)
+            except Exception as e:
+                self.dropped += len(lines)
+                sys.__stderr__.write(f'Logger: failed to write {len(lines)} lines: {e}\n')
+            for waiter in waiters:
+                waiter.set()
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Blocks until every line logged so far has been written."""
+        if not self.config['async'] or self._writer is None or self._writer_pid != os.getpid():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        self.flush()
+        with self._files_lock:
+            for log_file in self._files.values():
+                log_file.handle.close()
+            self._files.clear()
 
     def _get_caller_info(self) -> Dict[str, Any]:
         """Get the filename and line number of the caller"""
@@ -84,40 +249,58 @@ class Logger:
             return {'file': filename, 'line': line_number}
         return {'file': 'unknown', 'line': 0}
 
-    def _format_log_entry(self, level: LogLevel, message: str, user_id: Optional[int], metadata: Optional[Dict], caller_info: Dict[str, Any]) -> str:
+    def _format_log_entry(self, level: LogLevel, message: str, user_id: Optional[int], metadata: Optional[Dict], caller_info: Optional[Dict[str, Any]]) -> str:
         timestamp = datetime.now().isoformat()
+        if self.config['format'] == 'json':
+            entry = {'timestamp': timestamp, 'level': level.value, 'user': user_id, 'message': message}
+            if caller_info:
+                entry['file'] = caller_info['file']
+                entry['line'] = caller_info['line']
+            if metadata:
+                entry['metadata'] = metadata
+            return json.dumps(entry, default=str)
         color_code = self.color_codes[level] if self.config['enable_colors'] else ''
         reset_code = self.color_codes['RESET'] if self.config['enable_colors'] else ''
         user_info = f'[User:{user_id}]' if user_id else '[System]'
-        location = f"[{caller_info['file']}:{caller_info['line']}]"
+        location = f"[{caller_info['file']}:{caller_info['line']}] " if caller_info else ''
         metadata_str = f' | {json.dumps(metadata)}' if metadata else ''
         # add additional formatting for better readability
-        return f'{color_code}[{timestamp}] [{level.value}] {user_info} {location} {message}{metadata_str}{reset_code}'
+        return f'{color_code}[{timestamp}] [{level.value}] {user_info} {location}{message}{metadata_str}{reset_code}'
 
     def _write_log(self, level: LogLevel, message: str, user_id: Optional[int], metadata: Optional[Dict]):
-        log_file = self._get_next_log_file(user_id)
-        caller_info = self._get_caller_info()
+        caller_info = self._get_caller_info() if self.config['caller_info'] else None
         formatted_entry = self._format_log_entry(level, message, user_id, metadata, caller_info)
-        # open the log file in append mode and write the log entry
-        with open(log_file, 'a') as f:
-            f.write(formatted_entry + '\n')
-        # Also log to console for development
-        print(formatted_entry)
+        record = (self._get_log_filename(user_id), formatted_entry, sys.stdout)
+        if self.config['async']:
+            self._ensure_writer()
+            self._queue.put(record)
+        else:
+            self._write_batch([record])
 
     def info(self, message: str, user_id: Optional[int] = None, metadata: Optional[Dict] = None):
+        if self._threshold > _INFO:
+            return
         self._write_log(LogLevel.INFO, message, user_id, metadata)
 
     def debug(self, message: str, user_id: Optional[int] = None, metadata: Optional[Dict] = None):
+        if self._threshold > _DEBUG:
+            return
         self._write_log(LogLevel.DEBUG, message, user_id, metadata)
 
     def error(self, message: str, user_id: Optional[int] = None, metadata: Optional[Dict] = None):
+        if self._threshold > _ERROR:
+            return
         self._write_log(LogLevel.ERROR, message, user_id, metadata)
 
     def critical(self, message: str, user_id: Optional[int] = None, metadata: Optional[Dict] = None):
+        if self._threshold > _CRITICAL:
+            return
         self._write_log(LogLevel.CRITICAL, message, user_id, metadata)
 
     # Database operation logging helpers
     def log_db_operation(self, operation: str, table: str, user_id: Optional[int] = None, data: Optional[Dict] = None):
+        if self._threshold > _INFO:
+            return
         self.info(f'DB Operation: {operation} on {table}', user_id, {'table': table, 'operation': operation, 'data': data})
 
     def log_db_error(self, operation: str, table: str, error: Exception, user_id: Optional[int] = None):
@@ -125,12 +308,16 @@ class Logger:
 
     # LLM operation logging helpers
     def log_llm_call(self, model: str, prompt: str, user_id: Optional[int] = None, metadata: Optional[Dict] = None):
+        if self._threshold > _INFO:
+            return
         meta = {'model': model, 'prompt_length': len(prompt)}
         if metadata:
             meta.update(metadata)
         self.info(f'LLM Call: {model}', user_id, meta)
 
     def log_llm_response(self, model: str, response_length: int, user_id: Optional[int] = None, metadata: Optional[Dict] = None):
+        if self._threshold > _INFO:
+            return
         meta = {'model': model, 'response_length': response_length}
         if metadata:
             meta.update(metadata)
@@ -1,9 +1,14 @@
 
 import os
 import uuid
-from typing import List, Dict, Any, Optional
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Callable
 
 try:
+    import opik
     from opik import opik_context, Opik, track
     from opik.integrations.openai import track_openai
     from opik.integrations.langchain import OpikTracer
@@ -73,6 +78,11 @@ class OpikConfig:
 
         return cls._client
 
+    @classmethod
+    def is_active(cls) -> bool:
+        """Whether a client has been initialised (without attempting to create one)."""
+        return cls._client is not None
+
     @classmethod
     def track_openai_client(cls, openai_client):
         """Wraps OpenAI client with Opik tracking if available."""
@@ -83,7 +93,10 @@ class OpikConfig:
 
     @classmethod
     def flush(cls):
-        """Flushes the Opik client to ensure all traces are sent."""
+        """
+        Flushes the Opik client to ensure all traces are sent. Blocks on the
+        tracing backend, so keep it off the request path (see TraceExporter).
+        """
         if OPIK_AVAILABLE and cls._client:
             try:
                 cls._client.flush()
@@ -105,24 +118,17 @@ class OpikConfig:
 
     @classmethod
     def log_feedback(cls, trace_id: str, name: str, value: float):
-        """Logs a feedback score to Opik for a given trace ID."""
-        if OPIK_AVAILABLE:
-            client = cls.get_client()
-            if client:
-                try:
-                    project_name = os.getenv("OPIK_PROJECT_NAME", "FINARTH")
-                    client.log_traces_feedback_scores(
-                        scores=[{
-                            "id": trace_id,
-                            "name": name,
-                            "value": value,
-                            "project_name": project_name
-                        }]
-                    )
-                    client.flush()
-                    sys_logger.info(f"Logged feedback '{name}={value}' to Opik", metadata={"trace_id": trace_id})
-                except Exception as e:
-                    sys_logger.error(f"Failed to log feedback to Opik: {e}")
+        """Queues a feedback score for a given trace ID; TraceExporter sends it to Opik."""
+        if cls.get_client():
+            project_name = os.getenv("OPIK_PROJECT_NAME", "FINARTH")
+            queued = TraceExporter.get_instance().submit_feedback({
+                "id": trace_id,
+                "name": name,
+                "value": value,
+                "project_name": project_name
+            })
+            if queued:
+                sys_logger.info(f"Queued feedback '{name}={value}' for Opik", metadata={"trace_id": trace_id})
 
     @classmethod
     def get_thread_id(cls, user_id):
@@ -140,6 +146,177 @@ class OpikConfig:
         except:
             return user_id
 
+class TraceExporter:
+    """
+    Sends tracing data to Opik from a background thread so requests never
+    wait on the tracing backend.
+
+    Feedback scores go into a bounded queue (OPIK_EXPORT_QUEUE_SIZE); when it
+    is full new scores are dropped and counted rather than blocking. Every
+    OPIK_EXPORT_INTERVAL seconds, or as soon as OPIK_EXPORT_BATCH_SIZE scores
+    are waiting, the exporter sends them in batches and flushes the Opik
+    client, which also pushes out the spans recorded by `@trace` since the
+    previous cycle. Pending data is flushed at shutdown.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, client_factory: Optional[Callable[[], Any]] = None, max_queue: Optional[int] = None,
+                 batch_size: Optional[int] = None, interval: Optional[float] = None):
+        self.client_factory = client_factory or OpikConfig.get_client
+        self.max_queue = max_queue or int(os.getenv("OPIK_EXPORT_QUEUE_SIZE", 1000))
+        self.batch_size = batch_size or int(os.getenv("OPIK_EXPORT_BATCH_SIZE", 100))
+        self.interval = interval if interval is not None else float(os.getenv("OPIK_EXPORT_INTERVAL", 2.0))
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(self.max_queue)
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._waiters: List[threading.Event] = []
+        self._spans_pending = False
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._thread_pid: Optional[int] = None
+        self.exported = 0
+        self.dropped = 0
+        self.batches = 0
+        self.flushes = 0
+        self.errors = 0
+        atexit.register(self.stop)
+
+    @classmethod
+    def get_instance(cls) -> "TraceExporter":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread_pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._thread_pid != os.getpid():
+                self._thread_pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="opik-exporter", daemon=True)
+                self._thread.start()
+
+    def submit_feedback(self, score: Dict[str, Any]) -> bool:
+        """Queues a feedback score; returns False if it was dropped because the queue is full."""
+        try:
+            self._queue.put_nowait(score)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            sys_logger.error("Opik export queue full, dropping feedback score", metadata={"trace_id": score.get("id")})
+            return False
+        self._ensure_thread()
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def mark_spans_pending(self):
+        """Notes that spans were recorded, so the next cycle flushes the client."""
+        self._spans_pending = True
+        self._ensure_thread()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Exports everything queued so far and flushes the client; blocks up to `timeout`."""
+        if self._thread is None or self._thread_pid != os.getpid() or not self._thread.is_alive():
+            return self._queue.empty()
+        done = threading.Event()
+        with self._lock:
+            self._waiters.append(done)
+        self._wake.set()
+        return done.wait(timeout)
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping = True
+        self.flush(timeout)
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _export(self):
+        client = self.client_factory()
+        batch = self._drain()
+        pending = self._spans_pending or bool(batch)
+        self._spans_pending = False
+        while batch:
+            try:
+                if client is not None:
+                    client.log_traces_feedback_scores(scores=batch)
+                    self.exported += len(batch)
+                    self.batches += 1
+            except Exception as e:
+                self.errors += 1
+                sys_logger.error(f"Failed to export feedback to Opik: {e}", metadata={"scores": len(batch)})
+            batch = self._drain()
+        if pending and client is not None:
+            try:
+                client.flush()
+                self.flushes += 1
+            except Exception as e:
+                self.errors += 1
+                sys_logger.error(f"Failed to flush Opik client: {e}")
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            with self._lock:
+                waiters, self._waiters = self._waiters, []
+            self._export()
+            for waiter in waiters:
+                waiter.set()
+            if self._stopping:
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "max_queue": self.max_queue,
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "flushes": self.flushes,
+            "errors": self.errors
+        }
+
+class StreamTrace:
+    """
+    Trace for work that is resumed across event-loop steps, such as an async
+    generator, where the context-based `@trace` cannot follow it. The trace is
+    created and ended explicitly on the Opik client; `id` is None when tracing
+    is inactive.
+    """
+
+    def __init__(self, name: str, input: Optional[Dict[str, Any]] = None):
+        self.id = None
+        self._trace = None
+        client = OpikConfig._client
+        if client is not None:
+            try:
+                self._trace = client.trace(name=name, input=input)
+                self.id = self._trace.id
+            except Exception as e:
+                sys_logger.debug(f"Could not start Opik trace {name}: {e}")
+
+    def end(self, output: Optional[Dict[str, Any]] = None):
+        """Ends the trace once; the background exporter sends it."""
+        trace, self._trace = self._trace, None
+        if trace is None:
+            return
+        try:
+            trace.end(output=output)
+        except Exception as e:
+            sys_logger.debug(f"Could not end Opik trace: {e}")
+        TraceExporter.get_instance().mark_spans_pending()
+
 # Helper decorator for tracking functions
 def trace(name=None):
     def decorator(func):
@@ -148,6 +325,15 @@ def trace(name=None):
         return func
     return decorator
 
+# Helper context manager for tracing a block as a child span of the current trace
+@contextmanager
+def span(name: str):
+    if OPIK_AVAILABLE and OpikConfig._client is not None and hasattr(opik, 'start_as_current_span'):
+        with opik.start_as_current_span(name=name):
+            yield
+    else:
+        yield
+
 # Helper decorator to obtain opik context
 def context_opik(name=None):
     def decorator(func):
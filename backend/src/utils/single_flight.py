@@ -0,0 +1,58 @@
+"""
+File: single_flight.py
+Description: Coalesces concurrent async calls for the same key so that they
+             share one underlying call (and its result or exception).
+
+Calls are only shared within one event loop; a caller on another loop starts
+its own call.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: Dict[Hashable, Tuple[asyncio.AbstractEventLoop, asyncio.Task]] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        with self._lock:
+            if self._inflight.get(key, (None, None))[1] is task:
+                del self._inflight[key]
+        # Mark the exception retrieved in case nobody awaits it any more
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Awaits `call()`, or the call already in flight for `key`.
+
+        The call runs in its own task, so cancelling one caller (e.g. a
+        disconnected client) neither cancels it nor reaches the other callers.
+        If the shared call itself is cancelled, waiting callers start a new one.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                inflight = self._inflight.get(key)
+                if inflight is not None and inflight[0] is loop and not inflight[1].done():
+                    self.coalesced += 1
+                    task = inflight[1]
+                else:
+                    self.calls += 1
+                    task = loop.create_task(call())
+                    self._inflight[key] = (loop, task)
+                    task.add_done_callback(lambda done, key=key: self._forget(key, done))
+            try:
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if task.cancelled() and not (current and current.cancelling()):
+                    continue
+                raise
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,147 @@
+"""
+File: timing.py
+Description: Lightweight wall-clock timer for per-stage latency reporting in
+             the agent pipeline.
+
+A StageTimer belongs to one request; its stages end up in the response
+metadata. Every recorded stage is also fed into the process-wide
+`stage_metrics` histograms, served in Prometheus text format from
+/api/health/metrics. `StageTimer.stage()` additionally opens an Opik span
+when tracing is configured, and is a plain timer otherwise.
+"""
+
+import bisect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+from utils.opik_client import span as opik_span
+
+# Upper bounds (ms) of the Prometheus histogram buckets
+DEFAULT_BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+QUANTILES = (0.5, 0.95, 0.99)
+
+class LatencyHistogram:
+    """
+    Cumulative bucket counts for Prometheus plus a window of the most recent
+    samples from which p50/p95/p99 are computed.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS, window: int = 2048):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, ms: float):
+        self.bucket_counts[bisect.bisect_left(self.buckets, ms)] += 1
+        self.count += 1
+        self.sum += ms
+        self.recent.append(ms)
+
+    def quantiles(self, quantiles: Iterable[float] = QUANTILES) -> Dict[float, float]:
+        samples = sorted(self.recent)
+        if not samples:
+            return {quantile: 0.0 for quantile in quantiles}
+        return {quantile: samples[min(len(samples) - 1, int(quantile * len(samples)))] for quantile in quantiles}
+
+class StageMetrics:
+    """Per-stage latency histograms shared by all requests in the process."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS, window: int = 2048):
+        self.buckets = tuple(buckets)
+        self.window = window
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, ms: float):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = LatencyHistogram(self.buckets, self.window)
+            histogram.observe(ms)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """p50/p95/p99, count and mean (ms) per stage."""
+        with self._lock:
+            result = {}
+            for stage, histogram in sorted(self._histograms.items()):
+                quantiles = histogram.quantiles()
+                result[stage] = {
+                    'count': histogram.count,
+                    'mean': round(histogram.sum / histogram.count, 2),
+                    'p50': round(quantiles[0.5], 2),
+                    'p95': round(quantiles[0.95], 2),
+                    'p99': round(quantiles[0.99], 2)
+                }
+            return result
+
+    def render_prometheus(self, prefix: str = 'finarth_stage_latency_ms') -> str:
+        lines: List[str] = [
+            f'# HELP {prefix} Agent pipeline stage latency in milliseconds.',
+            f'# TYPE {prefix} histogram'
+        ]
+        quantile_lines: List[str] = [
+            f'# HELP {prefix}_quantile Stage latency quantiles over the most recent {self.window} samples.',
+            f'# TYPE {prefix}_quantile gauge'
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram.bucket_counts):
+                    cumulative += count
+                    lines.append(f'{prefix}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'{prefix}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{prefix}_sum{{stage="{stage}"}} {histogram.sum:.3f}')
+                lines.append(f'{prefix}_count{{stage="{stage}"}} {histogram.count}')
+                for quantile, value in histogram.quantiles().items():
+                    quantile_lines.append(f'{prefix}_quantile{{stage="{stage}",quantile="{quantile:g}"}} {value:.3f}')
+        return '\n'.join(lines + quantile_lines) + '\n'
+
+stage_metrics = StageMetrics()
+
+class StageTimer:
+    def __init__(self, metrics: Optional[StageMetrics] = stage_metrics):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        # Absolute perf_counter() value at which each stage finished
+        self.finished_at: Dict[str, float] = {}
+        self.metrics = metrics
+
+    @contextmanager
+    def stage(self, name: str):
+        """Times the enclosed block and records it under `name`."""
+        started = time.perf_counter()
+        try:
+            with opik_span(name):
+                yield
+        finally:
+            self.record(name, started)
+
+    def record(self, name: str, started: float, ended: Optional[float] = None):
+        ended = ended if ended is not None else time.perf_counter()
+        self.stages[name] = (ended - started) * 1000
+        self.finished_at[name] = ended
+        if self.metrics is not None:
+            self.metrics.observe(name, self.stages[name])
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def finish(self) -> Dict[str, float]:
+        """Records the request's total latency and returns `as_dict()`."""
+        if self.metrics is not None:
+            self.metrics.observe('total', self.elapsed_ms())
+        return self.as_dict()
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage durations in milliseconds, rounded for JSON responses."""
+        result = {name: round(ms, 2) for name, ms in self.stages.items()}
+        result['total'] = round(self.elapsed_ms(), 2)
+        return result
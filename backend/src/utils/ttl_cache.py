@@ -0,0 +1,110 @@
+"""
+File: ttl_cache.py
+Description: Thread-safe, size-bounded LRU cache with per-entry expiry.
+
+Named caches register themselves so that their hit/miss counters can be
+reported together by the health blueprint (GET /api/health/caches).
+"""
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+# name -> object with a stats() method
+_registry: 'weakref.WeakValueDictionary[str, Any]' = weakref.WeakValueDictionary()
+
+def register_cache(name: str, cache: Any):
+    """Reports `cache.stats()` under `name` in cache_stats()."""
+    _registry[name] = cache
+
+class TTLCache:
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 300.0, name: Optional[str] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_entries: Least recently used entries are evicted beyond this
+            ttl: Default lifetime in seconds (None = no expiry)
+            name: Registers the cache for health reporting
+            clock: Time source, injectable for tests
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.name = name
+        self._clock = clock
+        self._data: 'OrderedDict[Hashable, Tuple[Any, Optional[float]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        if name:
+            register_cache(name, self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at is None or expires_at > self._clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = _MISSING):
+        ttl = self.ttl if ttl is _MISSING else ttl
+        expires_at = self._clock() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Removes every entry for which predicate(key, value) is true."""
+        with self._lock:
+            keys = [key for key, (value, _) in self._data.items() if predicate(key, value)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and (entry[1] is None or entry[1] > self._clock())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every named cache that is still alive."""
+    return {name: cache.stats() for name, cache in list(_registry.items())}
@@ -9,7 +9,12 @@ Instructions to run: Use pytest to run the tests in this file.
 
 File Execution State: Validated with so far changes.
 """
+import os
 import pytest
+from backend.scripts.benchmarks.stub_server import openai_stub
+
+# Stub router answers must not become training data for the local classifier
+os.environ.setdefault('ROUTER_DECISION_LOG', os.devnull)
 
 @pytest.fixture(scope="module", autouse=True)
 def setup_environment():
@@ -36,4 +41,26 @@ def react_agent_instance():
 @pytest.fixture
 def orchestrator_instance():
     from ai_agent.core import AgentOrchestrator
-    return AgentOrchestrator()
\ No newline at end of file
+    return AgentOrchestrator()
+
+@pytest.fixture
+def llm_stub(monkeypatch):
+    """Local OpenAI-compatible server that answers every completion after 0.5s."""
+    with openai_stub(delay=0.5) as server:
+        monkeypatch.setenv('OPENROUTER_BASE_URL', f"{server.url}/v1")
+        monkeypatch.setenv('OPENROUTER_API_KEY', 'stub-key')
+        monkeypatch.setenv('MODEL_NAME', 'stub-model')
+        yield server
+
+@pytest.fixture
+def candle_store(monkeypatch, tmp_path):
+    """CandleStore on a freshly migrated temporary database."""
+    from ai_agent.candle_store import CandleStore
+    from utils.db_pool import ConnectionPool
+    from utils.migration_runner import MigrationRunner
+    pool = ConnectionPool(tmp_path / 'candles.sqlite')
+    MigrationRunner(pool.connection()).run_migrations()
+    store = CandleStore(connection=pool.connection)
+    monkeypatch.setattr(CandleStore, '_instance', store)
+    yield store
+    pool.close_all()
@@ -0,0 +1,67 @@
+"""
+File Name: test_agent_prefetch.py
+Description: This file contains the code for testing speculative context
+             prefetching in the agent orchestrator.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with prefetch timing tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import asyncio
+import pytest
+
+@pytest.fixture(autouse=True)
+def llm_routing(monkeypatch):
+    # The timings below rely on the (slow) LLM router, not the local fast path
+    # or previously cached classifications
+    monkeypatch.setenv("LOCAL_ROUTER_ENABLED", "false")
+    monkeypatch.setenv("ROUTER_CACHE_ENABLED", "false")
+
+@pytest.fixture
+def slow_context(monkeypatch):
+    """Replaces the context loaders with slow fakes and records cancellations."""
+    from ai_agent.engine import context_prefetch
+    cancelled = set()
+
+    def loader(key, value, delay):
+        async def load(user_id):
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                cancelled.add(key)
+                raise
+            return value
+        return load
+
+    monkeypatch.setattr(context_prefetch, "CONTEXT_LOADERS", {
+        "user_profile": loader("user_profile", {"name": "Asha"}, 0.4),
+        "holdings": loader("holdings", [], 2.0),
+        "market_context": loader("market_context", "Market data", 2.0),
+    })
+    return cancelled
+
+# test that context loads overlap with routing and unused loads are cancelled
+def test_prefetch_overlaps_router(llm_stub, slow_context):
+    from ai_agent.core import AgentOrchestrator
+    response = asyncio.run(AgentOrchestrator(prefetch=True).process("What is an ETF?", 7))
+
+    timings = response.metadata["timings"]
+    assert timings["router_classification"] >= 400
+    assert timings["prefetch_saved"] >= 300
+    # GENERAL_ADVICE only reads the profile
+    assert slow_context == {"holdings", "market_context"}
+    # Cancelled loads are not timed
+    assert "user_profile" in timings
+    assert "holdings" not in timings and "market_context" not in timings
+
+# test that disabling prefetch loads context only after routing
+def test_without_prefetch_nothing_is_saved(llm_stub, slow_context):
+    from ai_agent.core import AgentOrchestrator
+    response = asyncio.run(AgentOrchestrator(prefetch=False).process("What is an ETF?", 7))
+
+    timings = response.metadata["timings"]
+    assert timings["prefetch_saved"] < 50
+    assert timings["total"] >= timings["router_classification"] + timings["user_profile"]
@@ -0,0 +1,106 @@
+"""
+File Name: test_agent_streaming.py
+Description: This file contains the code for testing the Server-Sent Events
+             variant of the generate-insight endpoint.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with streaming endpoint tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import json
+import pytest
+
+@pytest.fixture(autouse=True)
+def no_prefetch(monkeypatch):
+    # Keep the speculative market-data fetch from reaching CoinGecko
+    monkeypatch.setenv("AGENT_PREFETCH", "false")
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+# test that the router decision arrives first and tokens assemble the answer
+def test_stream_emits_route_tokens_and_done(llm_stub):
+    from app import app
+    client = app.test_client()
+    response = client.post('/api/agent/generate-insight/stream', json={'query': 'What is an ETF?'})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+
+    events = parse_events(response.get_data(as_text=True))
+    names = [name for name, _ in events]
+    assert names[0] == 'route'
+    assert events[0][1]['intent'] == 'GENERAL_ADVICE'
+    assert names[-1] == 'done'
+    assert names.count('token') > 1
+
+    streamed = "".join(data['text'] for name, data in events if name == 'token')
+    assert streamed == events[-1][1]['finalAnswer']
+
+# test that a missing query is rejected before streaming starts
+def test_stream_requires_query(llm_stub):
+    from app import app
+    response = app.test_client().post('/api/agent/generate-insight/stream', json={})
+    assert response.status_code == 400
+
+class RecordingOpikClient:
+    """Records the traces started through the Opik client API."""
+
+    def __init__(self):
+        self.traces = []
+
+    def trace(self, name, input=None):
+        handle = RecordedTrace(f"trace-{len(self.traces) + 1}", name, input)
+        self.traces.append(handle)
+        return handle
+
+    def log_traces_feedback_scores(self, scores):
+        pass
+
+    def flush(self):
+        pass
+
+class RecordedTrace:
+    def __init__(self, id, name, input):
+        self.id, self.name, self.input, self.output, self.ended = id, name, input, None, False
+
+    def end(self, output=None):
+        self.output, self.ended = output, True
+
+# test that a streamed answer is traced and its trace id reaches the saved message and feedback
+def test_stream_is_traced(llm_stub, monkeypatch):
+    import uuid
+    from app import app
+    from database import db
+    from ai_agent.chat_manager import ChatManager
+    from utils.opik_client import OpikConfig, TraceExporter
+    opik = RecordingOpikClient()
+    exporter = TraceExporter(interval=60)
+    monkeypatch.setattr(OpikConfig, '_client', opik)
+    monkeypatch.setattr(TraceExporter, '_instance', exporter)
+
+    client = app.test_client()
+    email = f"stream-{uuid.uuid4().hex}@example.com"
+    user_id = client.post('/api/users/register', json={'email': email, 'password': 'secret'}).get_json()['userId']
+    try:
+        response = client.post('/api/agent/generate-insight/stream', json={'query': 'What is an ETF?', 'userId': user_id})
+        done = parse_events(response.get_data(as_text=True))[-1][1]
+
+        assert [trace.name for trace in opik.traces] == ['agent_orchestrator_stream']
+        assert opik.traces[0].ended and opik.traces[0].output['content'] == done['finalAnswer']
+        assert done['traceId'] == 'trace-1'
+        assert ChatManager.get_message_by_id(done['messageId'])['trace_id'] == 'trace-1'
+
+        client.post('/api/agent/message-feedback', json={'messageId': done['messageId'], 'feedback': 'up'})
+        assert exporter.stats()['queued'] == 1
+    finally:
+        exporter.stop(10)
+        ChatManager.delete_session(done['sessionId'])
+        db.execute('DELETE FROM users WHERE id = ?', (user_id,))
+        db.commit()
@@ -0,0 +1,81 @@
+"""
+File Name: test_auth_cache.py
+Description: This file contains the code for testing the session token to
+             user principal cache used by token_required.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with auth cache tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import uuid
+import pytest
+
+@pytest.fixture
+def client():
+    from app import app
+    from utils.auth import auth_cache
+    auth_cache.clear()
+    return app.test_client()
+
+@pytest.fixture
+def account(client):
+    from database import db
+    email = f"auth-cache-{uuid.uuid4().hex}@example.com"
+    response = client.post('/api/users/register', json={'email': email, 'password': 'secret'})
+    yield {'email': email, 'token': response.get_json()['token']}
+    db.execute('DELETE FROM users WHERE email = ?', (email,))
+    db.commit()
+
+def count_user_queries(client, path, token, times):
+    from database import get_connection
+    statements = []
+    conn = get_connection()
+    conn.set_trace_callback(statements.append)
+    try:
+        responses = [client.get(path, headers={'Authorization': f'Bearer {token}'}) for _ in range(times)]
+    finally:
+        conn.set_trace_callback(None)
+    return responses, sum('FROM users' in statement for statement in statements)
+
+# test that only the first authenticated request reads the users table
+def test_token_lookup_is_cached(client, account):
+    responses, user_queries = count_user_queries(client, '/api/portfolio/holdings', account['token'], 5)
+
+    assert all(response.status_code == 200 for response in responses)
+    assert user_queries == 1
+
+# test that the principal excludes the password hash
+def test_principal_is_slim(client, account):
+    from utils.auth import auth_cache
+    client.get('/api/portfolio/holdings', headers={'Authorization': f"Bearer {account['token']}"})
+
+    assert set(auth_cache.get(account['token'])) == {'id', 'email', 'name'}
+
+# test that logging in again invalidates the previous token
+def test_login_invalidates_old_token(client, account):
+    headers = {'Authorization': f"Bearer {account['token']}"}
+    assert client.get('/api/portfolio/holdings', headers=headers).status_code == 200
+
+    login = client.post('/api/users/login', json={'email': account['email'], 'password': 'secret'})
+    assert client.get('/api/portfolio/holdings', headers=headers).status_code == 401
+    new_headers = {'Authorization': f"Bearer {login.get_json()['token']}"}
+    assert client.get('/api/portfolio/holdings', headers=new_headers).status_code == 200
+
+# test that a token rotated by another worker stops working once the cache entry expires
+def test_rotation_elsewhere_expires(client, account, monkeypatch):
+    import time
+    from database import db
+    from utils.auth import auth_cache
+    monkeypatch.setattr(auth_cache.tokens, 'ttl', 0.2)
+    headers = {'Authorization': f"Bearer {account['token']}"}
+    assert client.get('/api/portfolio/holdings', headers=headers).status_code == 200
+
+    # Another worker's login rotates the token without touching this process's cache
+    db.execute('UPDATE users SET session_token = ? WHERE email = ?', ('rotated', account['email']))
+    db.commit()
+    assert client.get('/api/portfolio/holdings', headers=headers).status_code == 200
+    time.sleep(0.3)
+    assert client.get('/api/portfolio/holdings', headers=headers).status_code == 401
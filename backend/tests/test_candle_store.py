@@ -0,0 +1,92 @@
+"""
+File Name: test_candle_store.py
+Description: This file contains the code for testing the permanent store of
+             daily WEEX candles against a local stub of WEEX.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with fetch-once, backfill and restart tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import asyncio
+import time
+import pytest
+from backend.scripts.benchmarks.stub_server import market_stub, stub_price, DAY_MS
+
+CANDLE_PATH = '/capi/v2/market/historyCandles'
+TODAY_MS = int(time.time() * 1000) // DAY_MS * DAY_MS
+PAST_DAY_MS = TODAY_MS - 40 * DAY_MS
+
+@pytest.fixture
+def weex(monkeypatch, candle_store):
+    from ai_agent.market_client import MarketHttpClient
+    from ai_agent.ticker_cache import TickerCache
+    with market_stub(delay=0.1) as server:
+        monkeypatch.setenv('WEEX_BASE_URL', server.url)
+        monkeypatch.setattr(MarketHttpClient, '_instance', MarketHttpClient(retries=0))
+        monkeypatch.setattr(TickerCache, '_instance', TickerCache())
+        yield server, candle_store
+
+def history(symbol, day_ms):
+    from ai_agent.tools import WeexService
+    return asyncio.run(WeexService.get_history(symbol, day_ms))
+
+# test that a past candle is fetched once, also across a restart
+def test_past_candle_fetched_once(weex, monkeypatch):
+    from ai_agent.candle_store import CandleStore
+    server, store = weex
+    candle = history('BTCUSDT', PAST_DAY_MS)
+    assert float(candle[4]) == stub_price('btcusdt', PAST_DAY_MS)
+    assert history('cmt_btcusdt', PAST_DAY_MS) == candle
+    assert server.count(CANDLE_PATH) == 1
+
+    # A new process only has the database
+    monkeypatch.setattr(CandleStore, '_instance', CandleStore(connection=store._connection))
+    assert history('btcusdt', PAST_DAY_MS) == candle
+    assert server.count(CANDLE_PATH) == 1
+    assert CandleStore.get_instance().stats()['db_hits'] == 1
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        CandleStore.get_instance().get('cmt_btcusdt', PAST_DAY_MS)
+    assert (time.perf_counter() - started) / 1000 < 1e-3
+
+# test that the still open day is never stored
+def test_open_day_not_stored(weex):
+    server, store = weex
+    history('ethusdt', TODAY_MS)
+    history('ethusdt', TODAY_MS)
+    assert server.count(CANDLE_PATH) == 2
+    assert store.count('cmt_ethusdt', TODAY_MS, TODAY_MS + DAY_MS) == 0
+
+# test that concurrent lookups of one day share a single fetch
+def test_concurrent_lookups_share_fetch(weex):
+    from ai_agent.tools import WeexService
+    server, _ = weex
+
+    async def burst():
+        return await asyncio.gather(*(WeexService.get_history('solusdt', PAST_DAY_MS) for _ in range(8)))
+
+    results = asyncio.run(burst())
+    assert all(result == results[0] for result in results)
+    assert server.count(CANDLE_PATH) == 1
+
+# test that a date range is backfilled in one call and never refetched
+def test_backfill_range(weex):
+    from ai_agent.tools import WeexService
+    server, store = weex
+    start_ms, end_ms = PAST_DAY_MS, PAST_DAY_MS + 30 * DAY_MS
+    assert asyncio.run(WeexService.backfill_candles('xrpusdt', start_ms, end_ms)) == 30
+    assert server.count(CANDLE_PATH) == 1
+
+    for day in range(30):
+        assert history('xrpusdt', start_ms + day * DAY_MS) is not None
+    assert asyncio.run(WeexService.backfill_candles('xrpusdt', start_ms, end_ms)) == 0
+    assert server.count(CANDLE_PATH) == 1
+
+    # Extending the range fetches again, adding only the new days
+    assert asyncio.run(WeexService.backfill_candles('xrpusdt', start_ms, end_ms + 5 * DAY_MS)) == 5
+    assert server.count(CANDLE_PATH) == 2
+    assert store.stats()['stored'] == 35
@@ -0,0 +1,93 @@
+"""
+File Name: test_chart_cache.py
+Description: This file contains the code for testing the coin chart cache
+             against a local stub of CoinGecko.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with hit, slicing and coalescing tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import asyncio
+import pytest
+from backend.scripts.benchmarks.stub_server import market_stub, DAY_MS
+
+CHART_PATH = '/api/v3/coins'
+
+@pytest.fixture
+def charts(monkeypatch):
+    from ai_agent.chart_cache import ChartCache
+    from ai_agent.market_client import MarketHttpClient
+    with market_stub(delay=0.2) as server:
+        monkeypatch.setenv('COINGECKO_BASE_URL', f"{server.url}/api/v3")
+        monkeypatch.setattr(MarketHttpClient, '_instance', MarketHttpClient(retries=0))
+        cache = ChartCache(allow_coarser=False)
+        monkeypatch.setattr(ChartCache, '_instance', cache)
+        yield server, cache
+
+def chart(coin_id, days, vs_currency='usd'):
+    from ai_agent.tools import MarketDataService
+    return asyncio.run(MarketDataService.get_coin_chart(coin_id, days, vs_currency))
+
+# test that repeated requests are served from the cache with a granularity-scaled TTL
+def test_hits_and_ttl(charts):
+    server, cache = charts
+    first = chart('bitcoin', 7)
+    assert chart('bitcoin', 7) == first
+    assert chart('Bitcoin', 7.0) == first
+    assert server.count(CHART_PATH) == 1
+
+    chart('bitcoin', 7, vs_currency='eur')
+    assert server.count(CHART_PATH) == 2
+    assert cache.ttl(1) < cache.ttl(7) < cache.ttl(365) == cache.ttl('max')
+
+# test that shorter ranges are sliced from a cached longer range of the same granularity
+def test_slices_longer_range(charts):
+    server, cache = charts
+    week = chart('ethereum', 7)
+    three_days = chart('ethereum', 3)
+    assert server.count(CHART_PATH) == 1
+    assert cache.stats()['sliced'] == 1
+
+    newest = week['prices'][-1][0]
+    assert three_days['prices'][-1] == week['prices'][-1]
+    assert three_days['prices'][0][0] >= newest - 3 * DAY_MS
+    assert len(three_days['prices']) == len(three_days['total_volumes']) < len(week['prices'])
+
+    # 1 day has 5-minute points; hourly data from the 7-day chart is too coarse
+    day = chart('ethereum', 1)
+    assert server.count(CHART_PATH) == 2
+    assert day['prices'][1][0] - day['prices'][0][0] == 5 * 60 * 1000
+
+# test that coarser ranges are sliced only when allowed
+def test_allow_coarser(charts):
+    server, cache = charts
+    cache.allow_coarser = True
+    chart('solana', 7)
+    assert len(chart('solana', 1)['prices']) in (24, 25)
+    assert server.count(CHART_PATH) == 1
+
+# test that concurrent misses for one chart share a single upstream call
+def test_coalesces_concurrent_requests(charts):
+    from ai_agent.tools import MarketDataService
+    server, cache = charts
+
+    async def burst():
+        return await asyncio.gather(*(MarketDataService.get_coin_chart('cardano', 30) for _ in range(10)))
+
+    results = asyncio.run(burst())
+    assert all(result == results[0] for result in results)
+    assert server.count(CHART_PATH) == 1
+    stats = cache.stats()
+    assert stats['upstream'] == 1 and stats['coalesced'] == 9 and stats['inflight'] == 0
+
+# test that failed fetches are not cached
+def test_failures_not_cached(charts):
+    server, cache = charts
+    server.routes[CHART_PATH] = lambda request: (500, {'error': 'down'})
+    assert chart('ripple', 7) is None
+    assert chart('ripple', 7) is None
+    assert server.count(CHART_PATH) == 2
+    assert len(cache.memory) == 0
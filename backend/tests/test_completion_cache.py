@@ -0,0 +1,81 @@
+"""
+File Name: test_completion_cache.py
+Description: This file contains the code for testing the opt-in completion
+             cache in the LLM gateway.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with completion cache tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import asyncio
+import pytest
+
+MESSAGES = [{"role": "user", "content": "What is an ETF?"}]
+
+@pytest.fixture
+def gateway(llm_stub):
+    from ai_agent.completion_cache import CompletionCache
+    from ai_agent.llm_gateway import LLMGateway
+    gateway = LLMGateway.get_instance()
+    gateway.completion_cache = CompletionCache(enabled=True)
+    return gateway
+
+def completions(stub):
+    return stub.count("/v1/chat/completions")
+
+# test that identical deterministic requests are served from the cache
+def test_deterministic_completion_is_cached(gateway, llm_stub):
+    async def ask():
+        first = await gateway.chat(messages=MESSAGES, temperature=0, max_tokens=100)
+        second = await gateway.chat(messages=MESSAGES, temperature=0, max_tokens=100)
+        other = await gateway.chat(messages=MESSAGES, temperature=0, max_tokens=200)
+        return first, second, other
+
+    first, second, other = asyncio.run(ask())
+
+    assert second.choices[0].message.content == first.choices[0].message.content
+    assert completions(llm_stub) == 2
+    stats = gateway.completion_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["saved_tokens"]) == (1, 2, 20)
+
+# test that sampled requests bypass the cache unless explicitly enabled
+def test_sampled_completion_bypasses_cache(gateway, llm_stub):
+    from ai_agent.completion_cache import CompletionCache
+
+    async def ask_twice():
+        for _ in range(2):
+            await gateway.chat(messages=MESSAGES, temperature=0.7)
+
+    asyncio.run(ask_twice())
+    assert completions(llm_stub) == 2
+    assert gateway.completion_cache.stats()["bypassed"] == 2
+
+    gateway.completion_cache = CompletionCache(enabled=True, allow_sampled=True)
+    asyncio.run(ask_twice())
+    assert completions(llm_stub) == 3
+
+# test that a zero handler TTL (expired market data) skips the cache
+def test_expired_market_context_is_not_cached(gateway, llm_stub):
+    async def ask_twice():
+        for _ in range(2):
+            await gateway.chat(messages=MESSAGES, temperature=0, cache_ttl=0)
+
+    asyncio.run(ask_twice())
+    assert completions(llm_stub) == 2
+
+# test that a streamed completion is reused by the next identical request
+def test_streamed_completion_is_cached(gateway, llm_stub):
+    async def ask():
+        streamed = "".join([delta async for delta in gateway.stream_chat(messages=MESSAGES, temperature=0)])
+        cached = [delta async for delta in gateway.stream_chat(messages=MESSAGES, temperature=0)]
+        response = await gateway.chat(messages=MESSAGES, temperature=0)
+        return streamed, cached, response
+
+    streamed, cached, response = asyncio.run(ask())
+
+    assert cached == [streamed]
+    assert response.choices[0].message.content == streamed
+    assert completions(llm_stub) == 1
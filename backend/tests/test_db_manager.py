@@ -0,0 +1,122 @@
+"""
+File Name: test_db_manager.py
+Description: This file contains the code for testing write/read replication
+             in the DatabaseManager.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with incremental replication tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+
+def make_manager(tmp_path, **kwargs):
+    from utils.db_manager import DatabaseManager
+    manager = DatabaseManager(tmp_path / "app.sqlite", **kwargs)
+    manager.execute_write("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    manager.sync(5)
+    return manager
+
+# test that writes return before replication and reach the read database after sync
+def test_incremental_replication(tmp_path):
+    manager = make_manager(tmp_path, max_lag=60)
+    manager.execute_write("INSERT INTO notes (body) VALUES (?)", ("hello",))
+
+    # Nothing copied on the write path
+    assert manager.replicator.stats()["pending_writes"] == 1
+    assert manager.sync(5)
+    assert [row["body"] for row in manager.execute_read("SELECT body FROM notes")] == ["hello"]
+    manager.replicator.stop()
+
+# test that a burst of writes is replicated in one batch within the max lag
+def test_writes_are_batched(tmp_path):
+    manager = make_manager(tmp_path, max_lag=0.2)
+    runs_before = manager.replicator.runs
+    for index in range(50):
+        manager.execute_write("INSERT INTO notes (body) VALUES (?)", (f"note {index}",))
+
+    assert manager.sync(5)
+    assert manager.replicator.runs - runs_before <= 2
+    assert manager.execute_read("SELECT COUNT(*) AS n FROM notes")[0]["n"] == 50
+    manager.replicator.stop()
+
+# test that the backup database matches the write database
+def test_backup_is_replicated(tmp_path):
+    import sqlite3
+    manager = make_manager(tmp_path, max_lag=0)
+    manager.execute_write("INSERT INTO notes (body) VALUES (?)", ("backed up",))
+    manager.sync(5)
+
+    backup = sqlite3.connect(str(manager.backup_db))
+    assert backup.execute("SELECT body FROM notes").fetchall() == [("backed up",)]
+    backup.close()
+    manager.replicator.stop()
+
+# test that the legacy copy mode still replicates synchronously
+def test_copy_mode(tmp_path):
+    manager = make_manager(tmp_path, replication="copy")
+    manager.execute_write("INSERT INTO notes (body) VALUES (?)", ("copied",))
+
+    assert [row["body"] for row in manager.execute_read("SELECT body FROM notes")] == ["copied"]
+
+# test that replication copies the database in bounded backup steps
+def test_replication_in_steps(tmp_path):
+    import sqlite3
+    from utils.db_manager import Replicator
+    source = tmp_path / "source.sqlite"
+    connection = sqlite3.connect(str(source))
+    connection.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    connection.executemany("INSERT INTO notes (body) VALUES (?)", [("x" * 500,) for _ in range(200)])
+    connection.commit()
+    pages = connection.execute("PRAGMA page_count").fetchone()[0]
+    connection.close()
+
+    replicator = Replicator(source, [tmp_path / "target.sqlite"], pages=4, step_sleep=0)
+    replicator.replicate_now()
+    assert replicator.stats()["last_run_steps"] == -(-pages // 4)
+    assert replicator.stats()["single_step_fallbacks"] == 0
+
+    target = sqlite3.connect(str(tmp_path / "target.sqlite"))
+    assert target.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 200
+    target.close()
+
+# test that a stepwise copy restarted by source writes falls back to a single step
+def test_replication_under_writes(tmp_path):
+    import sqlite3
+    import threading
+    import time
+    from utils.db_manager import Replicator
+    source = tmp_path / "source.sqlite"
+    connection = sqlite3.connect(str(source), check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    connection.executemany("INSERT INTO notes (body) VALUES (?)", [("x" * 500,) for _ in range(400)])
+    connection.commit()
+
+    stop = threading.Event()
+
+    def write():
+        while not stop.is_set():
+            connection.execute("INSERT INTO notes (body) VALUES (?)", ("during backup",))
+            connection.commit()
+            time.sleep(0.005)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    replicator = Replicator(source, [tmp_path / "target.sqlite"], pages=1, step_sleep=0.02)
+    try:
+        started = time.perf_counter()
+        replicator.replicate_now()
+        elapsed = time.perf_counter() - started
+    finally:
+        stop.set()
+        writer.join()
+        connection.close()
+
+    assert elapsed < 5
+    assert replicator.stats()["restarts"] >= Replicator.MAX_RESTARTS
+    assert replicator.stats()["single_step_fallbacks"] == 1
+    target = sqlite3.connect(str(tmp_path / "target.sqlite"))
+    assert target.execute("SELECT COUNT(*) FROM notes").fetchone()[0] >= 400
+    target.close()
@@ -0,0 +1,41 @@
+"""
+File Name: test_llm_gateway.py
+Description: This file contains the code for testing that LLM calls made
+             through the shared async gateway overlap on the event loop.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with stub-server concurrency tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import asyncio
+import time
+
+# test that two concurrent handler calls take roughly as long as one
+def test_concurrent_process_overlaps(llm_stub):
+    from ai_agent.handlers.generic import GenericHandler
+    handler = GenericHandler()
+
+    async def run_two():
+        return await asyncio.gather(
+            handler.process("What is an ETF?", None),
+            handler.process("What is a bond?", None)
+        )
+
+    started = time.perf_counter()
+    first, second = asyncio.run(run_two())
+    elapsed = time.perf_counter() - started
+
+    assert "error" not in (first.metadata or {})
+    assert "error" not in (second.metadata or {})
+    assert llm_stub.count('/v1/chat/completions') == 2
+    # Each stub completion takes 0.5s; serialized calls would need >= 1.0s
+    assert elapsed < 0.9
+
+# test that the router and a handler share one gateway instance
+def test_gateway_is_shared(llm_stub):
+    from ai_agent.router import IntentRouter
+    from ai_agent.handlers.risk import RiskHandler
+    assert IntentRouter().llm is RiskHandler().llm
@@ -0,0 +1,115 @@
+"""
+File Name: test_logger.py
+Description: This file contains the code for testing the queue-backed log
+             writer and its file rotation.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with writer and rotation tests.
+         1.1 - Added level filtering and JSON-lines format tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import contextlib
+import io
+import pytest
+
+@pytest.fixture
+def make_logger(tmp_path):
+    from utils.logger import Logger
+    loggers = []
+
+    def make(**config):
+        logger = Logger()
+        logger.log_dir = tmp_path
+        logger.configure({'enable_colors': False, **config})
+        loggers.append(logger)
+        return logger
+    yield make
+    for logger in loggers:
+        logger.close()
+
+def lines(path):
+    return path.read_text().splitlines()
+
+# test that queued lines reach the file and the console after flush
+def test_queued_lines_are_written(make_logger, tmp_path):
+    logger = make_logger()
+    console = io.StringIO()
+    with contextlib.redirect_stdout(console):
+        for index in range(50):
+            logger.info(f'line {index}', 7, {'index': index})
+    assert logger.flush()
+
+    written = lines(tmp_path / logger._get_log_filename(7))
+    assert len(written) == 50
+    assert 'line 49 | {"index": 49}' in written[-1]
+    assert 'test_logger.py' in written[0]
+    assert console.getvalue().count('\n') == 50
+
+# test that files rotate at the line limit without re-reading them
+def test_rotation_uses_cached_counts(make_logger, tmp_path, monkeypatch):
+    logger = make_logger(max_lines_per_file=10, **{'async': False})
+    base = logger._get_log_filename(None)
+    (tmp_path / base).write_text('old\n' * 4)
+    reads = []
+    count_lines = logger._get_current_file_line_count
+    monkeypatch.setattr(logger, '_get_current_file_line_count', lambda path: reads.append(path) or count_lines(path))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index in range(25):
+            logger.info(f'line {index}')
+
+    assert [len(lines(tmp_path / name)) for name in (base, base.replace('.log', '_1.log'), base.replace('.log', '_2.log'))] == [10, 10, 9]
+    # Only the existing file and the two new ones were looked at, once each
+    assert len(reads) == 3
+
+# test that a new process picks up after files that are already full
+def test_resumes_after_full_files(make_logger, tmp_path):
+    logger = make_logger(max_lines_per_file=5)
+    base = logger._get_log_filename(None)
+    (tmp_path / base).write_text('old\n' * 5)
+    with contextlib.redirect_stdout(io.StringIO()):
+        logger.info('fresh')
+    logger.flush()
+
+    assert lines(tmp_path / base.replace('.log', '_1.log'))[0].endswith('fresh')
+
+# test that size based rotation is honoured
+def test_rotation_by_size(make_logger, tmp_path):
+    logger = make_logger(max_bytes_per_file=200)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index in range(20):
+            logger.info('x' * 50)
+    logger.flush()
+
+    files = sorted(tmp_path.glob('system_*.log'))
+    assert len(files) > 1
+    assert sum(len(lines(path)) for path in files) == 20
+    assert all(path.stat().st_size < 200 + 120 for path in files)
+
+# test that records below the level are dropped before caller inspection
+def test_level_filter_short_circuits(make_logger, tmp_path, monkeypatch):
+    from utils.logger import LogLevel
+    logger = make_logger(log_level='info', **{'async': False})
+    monkeypatch.setattr(logger, '_get_caller_info', lambda: pytest.fail('inspected a filtered record'))
+    monkeypatch.setattr(logger, '_format_log_entry', lambda *args: pytest.fail('formatted a filtered record'))
+    logger.debug('hidden', metadata={'big': 'x' * 1000})
+
+    assert not logger.is_enabled(LogLevel.DEBUG) and logger.is_enabled(LogLevel.ERROR)
+    assert list(tmp_path.glob('*.log')) == []
+
+# test the JSON-lines format with and without caller info
+def test_json_lines_format(make_logger, tmp_path):
+    import json
+    logger = make_logger(format='json', **{'async': False})
+    with contextlib.redirect_stdout(io.StringIO()):
+        logger.error('failed', 3, {'code': 42})
+        logger.configure({'caller_info': False})
+        logger.info('plain', 3)
+
+    first, second = (json.loads(line) for line in lines(tmp_path / logger._get_log_filename(3)))
+    assert (first['level'], first['user'], first['message'], first['metadata']) == ('ERROR', 3, 'failed', {'code': 42})
+    assert first['file'] == 'test_logger.py' and first['line'] > 0
+    assert 'file' not in second and second['message'] == 'plain'
@@ -0,0 +1,88 @@
+"""
+File Name: test_market_client.py
+Description: This file contains the code for testing the pooled async HTTP
+             client shared by the CoinGecko and WEEX services.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with reuse, retry and per-host limit tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import asyncio
+import threading
+import time
+import pytest
+from backend.scripts.benchmarks.stub_server import StubServer, market_stub, stub_price
+
+@pytest.fixture
+def market(monkeypatch):
+    from ai_agent.market_client import MarketHttpClient
+    from ai_agent.ticker_cache import TickerCache
+    with market_stub() as server:
+        monkeypatch.setenv('COINGECKO_BASE_URL', f"{server.url}/api/v3")
+        monkeypatch.setenv('WEEX_BASE_URL', server.url)
+        monkeypatch.setattr(TickerCache, '_instance', TickerCache())
+        client = MarketHttpClient(retries=2, backoff=0.01)
+        monkeypatch.setattr(MarketHttpClient, '_instance', client)
+        yield server, client
+
+# test that CoinGecko and WEEX calls share keep-alive connections
+def test_services_share_connections(market):
+    from ai_agent.tools import MarketDataService, WeexService
+    server, _ = market
+
+    async def lookups():
+        chart = await MarketDataService.get_coin_chart('bitcoin', 7)
+        tickers = [await WeexService.get_ticker(symbol) for symbol in ('BTCUSDT', 'cmt_ethusdt', 'solusdt')]
+        return chart, tickers
+
+    chart, tickers = asyncio.run(lookups())
+    assert chart['prices']
+    assert [ticker['symbol'] for ticker in tickers] == ['cmt_btcusdt', 'cmt_ethusdt', 'cmt_solusdt']
+    assert float(tickers[0]['last']) == stub_price('btcusdt')
+    assert server.connection_count == 1
+
+# test that transient upstream errors are retried
+def test_retries_transient_errors(monkeypatch):
+    from ai_agent.market_client import MarketHttpClient
+    attempts = []
+
+    def flaky(request):
+        attempts.append(request.path)
+        return (503, {'error': 'busy'}) if len(attempts) < 3 else {'ok': True}
+
+    with StubServer({'/flaky': flaky}) as server:
+        client = MarketHttpClient(retries=2, backoff=0.01)
+        assert asyncio.run(client.get_json(f"{server.url}/flaky")) == {'ok': True}
+        assert len(attempts) == 3
+        assert client.stats()['retried'] == 2
+
+        attempts.clear()
+        client = MarketHttpClient(retries=1, backoff=0.01)
+        assert asyncio.run(client.get_json(f"{server.url}/flaky")) is None
+        assert client.stats()['failures'] == 1
+
+# test that concurrent requests to one host are capped
+def test_per_host_limit():
+    from ai_agent.market_client import MarketHttpClient
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def slow(request):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return {}
+
+    with StubServer({'/slow': slow}) as server:
+        client = MarketHttpClient(max_per_host=3, retries=0)
+
+        async def burst():
+            return await asyncio.gather(*(client.get_json(f"{server.url}/slow") for _ in range(12)))
+
+        assert asyncio.run(burst()) == [{}] * 12
+    assert peak[0] == 3
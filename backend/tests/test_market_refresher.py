@@ -0,0 +1,135 @@
+"""
+File Name: test_market_refresher.py
+Description: This file contains the code for testing the background market
+             snapshot refresher against a local stub of CoinGecko.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with stale-while-revalidate tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import asyncio
+import time
+import pytest
+from backend.scripts.benchmarks.stub_server import StubServer
+
+UPSTREAM_DELAY = 1.0
+
+def snapshot(price, age):
+    return {
+        "global": {"market_cap_change_percentage_24h_usd": 1.0, "market_cap_percentage": {"btc": 50.0}},
+        "top_coins": [{"name": "Bitcoin", "current_price": price, "price_change_percentage_24h": 1.0}],
+        "updated_at": time.time() - age
+    }
+
+@pytest.fixture
+def coingecko(monkeypatch, tmp_path):
+    from ai_agent.tools import MarketDataService, MarketDataRefresher
+    from ai_agent.market_client import MarketHttpClient
+    state = {'price': 200.0, 'status': 200}
+
+    def respond(payload):
+        return (state['status'], payload) if state['status'] != 200 else payload
+
+    server = StubServer({
+        '/api/v3/global': lambda request: respond({"data": snapshot(state['price'], 0)["global"]}),
+        '/api/v3/coins/markets': lambda request: respond(snapshot(state['price'], 0)["top_coins"]),
+    }, delay=UPSTREAM_DELAY)
+    with server:
+        monkeypatch.setenv('COINGECKO_BASE_URL', f"{server.url}/api/v3")
+        monkeypatch.setattr(MarketDataService, 'CACHE_FILE', str(tmp_path / 'market_cache.json'))
+        monkeypatch.setattr(MarketDataService, '_cache', {"data": None, "expiry": 0})
+        refresher = MarketDataRefresher(enabled=True, refresh_ahead=0, retry_interval=60)
+        monkeypatch.setattr(MarketDataRefresher, '_instance', refresher)
+        monkeypatch.setattr(MarketHttpClient, '_instance', MarketHttpClient(retries=0))
+        server.state = state
+        yield server, refresher
+        refresher.stop()
+
+def wait_for(predicate, timeout=10):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline
+        time.sleep(0.05)
+
+# test that expired data is served at once and revalidated in the background
+def test_stale_while_revalidate(coingecko):
+    from ai_agent.tools import MarketDataService
+    server, refresher = coingecko
+    MarketDataService._save_cache(snapshot(100.0, age=4000), time.time() - 400)
+
+    started = time.perf_counter()
+    data = asyncio.run(MarketDataService.get_dashboard_data())
+    assert time.perf_counter() - started < UPSTREAM_DELAY / 2
+    assert data["top_coins"][0]["current_price"] == 100.0
+
+    wait_for(lambda: refresher.refreshes == 1)
+    data = asyncio.run(MarketDataService.get_dashboard_data())
+    assert data["top_coins"][0]["current_price"] == 200.0
+    assert server.count('/api/v3/global') == 1
+    assert refresher.stats()["snapshot_age"] < 5
+
+# test that failed refreshes are counted while the last good snapshot is served
+def test_failures_keep_serving_last_snapshot(coingecko):
+    from ai_agent.tools import MarketDataService
+    server, refresher = coingecko
+    server.state['status'] = 429
+    MarketDataService._save_cache(snapshot(100.0, age=4000), time.time() - 400)
+
+    for _ in range(3):
+        started = time.perf_counter()
+        assert asyncio.run(MarketDataService.get_dashboard_data())["top_coins"][0]["current_price"] == 100.0
+        assert time.perf_counter() - started < UPSTREAM_DELAY / 2
+        wait_for(lambda: not refresher.stats()["refreshing"])
+
+    stats = refresher.stats()
+    assert stats["failures"] >= 1 and stats["refreshes"] == 0
+    assert stats["last_error"]
+
+# test that snapshots older than the staleness bound are fetched inline
+def test_max_staleness_forces_inline_fetch(coingecko, monkeypatch):
+    from ai_agent.tools import MarketDataService
+    monkeypatch.setattr(MarketDataService, 'MAX_STALENESS', 3600)
+    MarketDataService._save_cache(snapshot(100.0, age=7200), time.time() - 3600)
+
+    data = asyncio.run(MarketDataService.get_dashboard_data())
+    assert data["top_coins"][0]["current_price"] == 200.0
+
+# test that the scheduler refreshes ahead of expiry without any request
+def test_refreshes_before_expiry(coingecko):
+    from ai_agent.tools import MarketDataService
+    server, refresher = coingecko
+    refresher.refresh_ahead = 3500
+    MarketDataService._save_cache(snapshot(100.0, age=200), time.time() + 3400)
+
+    refresher.start()
+    wait_for(lambda: refresher.refreshes == 1)
+    assert MarketDataService._load_cache()["data"]["top_coins"][0]["current_price"] == 200.0
+    assert refresher.next_refresh_in() > 0
+
+# test that a request cancelled while waiting for another fetch does not keep the fetch lock
+def test_cancelled_wait_releases_fetch_lock(coingecko):
+    from ai_agent.tools import MarketDataService
+    server, refresher = coingecko
+    refresher.enabled = False
+
+    async def cancel_waiter():
+        waiter = asyncio.create_task(MarketDataService.get_dashboard_data())
+        await asyncio.sleep(0.1)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    assert MarketDataService._fetch_lock.acquire(blocking=False)
+    try:
+        asyncio.run(cancel_waiter())
+    finally:
+        MarketDataService._fetch_lock.release()
+    time.sleep(0.2)
+    assert MarketDataService._fetch_lock.acquire(blocking=False)
+    MarketDataService._fetch_lock.release()
+
+    data = asyncio.run(MarketDataService.get_dashboard_data())
+    assert data["top_coins"][0]["current_price"] == 200.0
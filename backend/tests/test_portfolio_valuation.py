@@ -0,0 +1,114 @@
+"""
+File Name: test_portfolio_valuation.py
+Description: This file contains the code for testing the mark-to-market
+             portfolio valuation engine against a local stub of WEEX.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with valuation, pricing and endpoint tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import asyncio
+import uuid
+import pytest
+from backend.scripts.benchmarks.stub_server import market_stub, stub_price
+
+TICKER_PATH = '/capi/v2/market/ticker'
+
+HOLDINGS = [
+    {"id": 1, "name": "Bitcoin", "category": "Crypto", "symbol": "BTCUSDT", "amount": 1000.0, "entry_price": 50000.0},
+    {"id": 2, "name": "More Bitcoin", "category": "Crypto", "symbol": "cmt_btcusdt", "amount": 500.0, "entry_price": 40000.0},
+    {"id": 3, "name": "Ether", "category": "Crypto", "symbol": "ethusdt", "amount": 300.0, "entry_price": None},
+    {"id": 4, "name": "Index Fund", "category": "ETF", "symbol": "VOO", "amount": 2000.0, "entry_price": 400.0},
+    {"id": 5, "name": "Savings", "category": "Cash", "symbol": "", "amount": 700.0, "entry_price": None}
+]
+
+@pytest.fixture
+def weex(monkeypatch):
+    from ai_agent.market_client import MarketHttpClient
+    from ai_agent.ticker_cache import TickerCache
+    with market_stub() as server:
+        monkeypatch.setenv('WEEX_BASE_URL', server.url)
+        monkeypatch.setattr(MarketHttpClient, '_instance', MarketHttpClient(retries=0))
+        monkeypatch.setattr(TickerCache, '_instance', TickerCache())
+        yield server
+
+# test current value, unrealized P&L and allocation at given prices
+def test_mark_to_market():
+    from ai_agent.engine.portfolio_valuation import PortfolioValuation
+    from ai_agent.engine.portfolio_analyzer import PortfolioAnalyzer
+    valuation = PortfolioValuation.mark_to_market(HOLDINGS, {"cmt_btcusdt": 60000.0, "cmt_ethusdt": 3000.0}, include_holdings=True)
+
+    # BTC: 0.02 + 0.0125 units at 60000; ETH has no entry price; ETF and Cash are not priced
+    assert valuation['values'] == pytest.approx([1200.0, 750.0, 300.0, 2000.0, 700.0])
+    assert valuation['total_invested'] == 4500.0
+    assert valuation['total_value'] == 4950.0
+    assert valuation['unrealized_pnl'] == 450.0
+    assert valuation['unrealized_pnl_pct'] == 10.0
+    assert valuation['priced_count'] == 2
+    assert list(valuation['allocation']) == ['Crypto', 'ETF', 'Cash']
+    assert valuation['allocation']['Crypto'] == pytest.approx(2250 / 4950)
+
+    details = valuation['holdings']
+    assert details[1]['unrealized_pnl'] == 250.0 and details[1]['unrealized_pnl_pct'] == 50.0
+    assert details[2]['priced'] is False and details[2]['current_price'] is None
+
+    analysis = PortfolioAnalyzer.analyze_holdings(HOLDINGS, values=valuation['values'])
+    assert analysis['total_value'] == pytest.approx(4950.0)
+    assert analysis['top_3_assets'][1]['value'] == pytest.approx(1200.0)
+
+# test that the pure-Python path matches the NumPy one and prices Cryptocurrency holdings
+def test_mark_to_market_without_numpy(monkeypatch):
+    from ai_agent.engine import portfolio_valuation
+    holdings = HOLDINGS + [{"id": 6, "name": "Ether", "category": "Cryptocurrency", "symbol": "ETHUSDT", "amount": 600.0, "entry_price": 2000.0}]
+    prices = {"cmt_btcusdt": 60000.0, "cmt_ethusdt": 3000.0}
+    vectorized = portfolio_valuation.PortfolioValuation.mark_to_market(holdings, prices, include_holdings=True)
+    monkeypatch.setattr(portfolio_valuation, 'NUMPY_AVAILABLE', False)
+    plain = portfolio_valuation.PortfolioValuation.mark_to_market(holdings, prices, include_holdings=True)
+
+    assert plain == vectorized
+    assert plain['holdings'][5]['priced'] is True
+    assert plain['values'][5] == pytest.approx(900.0)
+    assert plain['allocation']['Cryptocurrency'] == pytest.approx(900 / plain['total_value'])
+
+# test that prices are fetched once per distinct symbol
+def test_fetches_each_symbol_once(weex):
+    from ai_agent.engine.portfolio_valuation import PortfolioValuation
+    holdings = HOLDINGS * 50
+    prices = asyncio.run(PortfolioValuation.fetch_prices(holdings))
+    assert prices == {"cmt_btcusdt": stub_price('btcusdt'), "cmt_ethusdt": stub_price('ethusdt')}
+    assert weex.count(TICKER_PATH) == 2
+
+    summary = asyncio.run(PortfolioValuation.value_portfolio(holdings))
+    assert weex.count(TICKER_PATH) == 2
+    assert summary['holdings_count'] == 250 and 'values' not in summary
+    assert summary['risk_metric'] > 0
+
+# test the portfolio summary endpoint
+def test_summary_endpoint(weex):
+    from app import app
+    from database import db
+    client = app.test_client()
+    email = f"valuation-{uuid.uuid4().hex}@example.com"
+    token = client.post('/api/users/register', json={'email': email, 'password': 'secret'}).get_json()['token']
+    headers = {'Authorization': f'Bearer {token}'}
+    try:
+        for holding in HOLDINGS[:2] + HOLDINGS[3:]:
+            payload = {key: holding[key] for key in ('name', 'category', 'symbol', 'amount', 'entry_price')}
+            assert client.post('/api/portfolio/holdings', json={**payload, 'date': '2026-01-05'}, headers=headers).status_code == 201
+
+        response = client.get('/api/portfolio/summary', headers=headers)
+        assert response.status_code == 200
+        summary = response.get_json()
+        price = stub_price('btcusdt')
+        assert summary['total_value'] == pytest.approx(1000 / 50000 * price + 500 / 40000 * price + 2700, abs=0.01)
+        assert summary['priced_count'] == 2
+        assert {holding['name'] for holding in summary['holdings'] if holding['priced']} == {'Bitcoin', 'More Bitcoin'}
+        assert client.get('/api/portfolio/summary').status_code == 401
+    finally:
+        user_id = db.execute('SELECT id FROM users WHERE email = ?', (email,)).fetchone()['id']
+        db.execute('DELETE FROM portfolio_holdings WHERE user_id = ?', (user_id,))
+        db.execute('DELETE FROM users WHERE id = ?', (user_id,))
+        db.commit()
@@ -0,0 +1,94 @@
+"""
+File Name: test_router_cache.py
+Description: This file contains the code for testing the LRU+TTL cache and
+             the router classification cache built on it.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with router cache tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import asyncio
+import pytest
+
+@pytest.fixture
+def router(llm_stub, tmp_path):
+    from ai_agent.router import IntentRouter
+    from ai_agent.router_cache import RouterCache
+    router = IntentRouter(use_local=False, use_cache=False)
+    router.cache = RouterCache(db_path=str(tmp_path / "router_cache.sqlite"))
+    return router
+
+# test that the least recently used entry is evicted and entries expire
+def test_ttl_cache_eviction_and_expiry():
+    from utils.ttl_cache import TTLCache
+    now = [0.0]
+    cache = TTLCache(max_entries=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+
+    now[0] = 11
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (1, 2, 1, 1)
+
+# test that near-identical queries share a key but different history does not
+def test_cache_key_normalization():
+    from ai_agent.router_cache import cache_key
+    assert cache_key("What's the  Bitcoin price?") == cache_key("whats the bitcoin price")
+    history = [{"role": "user", "content": "I hold ETH"}]
+    assert cache_key("Should I sell?", history) != cache_key("Should I sell?")
+    # Only the last 3 turns reach the router prompt
+    older = [{"role": "user", "content": "hi"}] + history * 3
+    assert cache_key("Should I sell?", older) == cache_key("Should I sell?", history * 3)
+
+# test that a repeated query is answered from the cache without the LLM
+def test_router_reuses_cached_classification(router, llm_stub):
+    first = asyncio.run(router.classify("Tell me something interesting"))
+    second = asyncio.run(router.classify("tell me something interesting!"))
+
+    assert second == first
+    assert llm_stub.count("/v1/chat/completions") == 1
+    stats = router.cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+# test that persisted classifications survive a restart
+def test_router_cache_persists(router, llm_stub, tmp_path):
+    from ai_agent.router_cache import RouterCache
+    asyncio.run(router.classify("Tell me something interesting"))
+
+    router.cache = RouterCache(db_path=str(tmp_path / "router_cache.sqlite"))
+    result = asyncio.run(router.classify("Tell me something interesting"))
+
+    assert result.reasoning == "stub"
+    assert llm_stub.count("/v1/chat/completions") == 1
+    assert router.cache.stats()["persistent_hits"] == 1
+
+# test that cache counters are served by the health blueprint
+def test_health_reports_caches():
+    from app import app
+    response = app.test_client().get('/api/health/caches')
+
+    assert response.status_code == 200
+    assert {"hits", "misses", "hit_rate"} <= set(response.get_json()["router"])
+
+# test that the router does its SQLite cache reads and writes off the event loop
+def test_persistence_runs_off_the_loop(router, llm_stub, monkeypatch):
+    import threading
+    from ai_agent.router_cache import RouterCache
+    threads = []
+    for name in ('_read_through', '_write_through'):
+        original = getattr(RouterCache, name)
+
+        def recorder(self, *args, original=original, name=name):
+            threads.append((name, threading.current_thread() is threading.main_thread()))
+            return original(self, *args)
+        monkeypatch.setattr(RouterCache, name, recorder)
+
+    asyncio.run(router.classify("Tell me something interesting"))
+    assert threads == [('_read_through', False), ('_write_through', False)]
@@ -0,0 +1,88 @@
+"""
+File Name: test_session_cache.py
+Description: This file contains the code for testing the bounded, striped
+             user session cache.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with eviction and concurrency tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import threading
+import time
+
+def make_cache(**kwargs):
+    from ai_agent.session_cache import SessionCache
+    return SessionCache(**kwargs)
+
+# test that set merges partial updates into the existing session
+def test_partial_update_keeps_fields():
+    cache = make_cache()
+    cache.set(1, {'name': 'Asha', 'country': 'India', 'familiarInvestments': ['stocks']})
+    session = cache.get(1)
+    cache.set(1, {'age': 30})
+
+    assert cache.get(1) is session
+    assert (session.name, session.country, session.age) == ('Asha', 'India', 30)
+    assert session.familiar_investments == ['stocks']
+    assert not hasattr(session, '__dict__')
+
+# test that the least recently used session is evicted beyond max entries
+def test_lru_eviction():
+    cache = make_cache(max_entries=2, stripes=1)
+    cache.set(1, {'name': 'a'})
+    cache.set(2, {'name': 'b'})
+    cache.get(1)
+    cache.set(3, {'name': 'c'})
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
+    assert cache.stats()['evictions'] == 1
+
+# test that the byte budget bounds memory use
+def test_byte_budget():
+    cache = make_cache(max_bytes=4000, stripes=1)
+    for user_id in range(50):
+        cache.set(user_id, {'name': 'x' * 200, 'selectedOptions': ['goal'] * 5})
+
+    stats = cache.stats()
+    assert stats['bytes'] <= 4000
+    assert stats['size'] < 50
+    assert cache.get(49) is not None
+
+# test that idle sessions expire
+def test_idle_ttl():
+    cache = make_cache(idle_ttl=0.05)
+    cache.set(1, {'name': 'a'})
+    assert cache.get(1) is not None
+    time.sleep(0.1)
+
+    assert cache.get(1) is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['expirations']) == (1, 1, 1)
+
+# test that concurrent readers and writers keep the cache consistent
+def test_concurrent_access():
+    cache = make_cache(max_entries=64)
+    errors = []
+
+    def work(worker):
+        try:
+            for index in range(2000):
+                user_id = (worker * 7 + index) % 128
+                cache.set(user_id, {'name': f'user {user_id}', 'age': index})
+                session = cache.get(user_id)
+                assert session is None or session.user_id == user_id
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(cache) <= 64
@@ -0,0 +1,77 @@
+"""
+File Name: test_session_store.py
+Description: This file contains the code for testing the session stores
+             behind the session cache, including sharing sessions between
+             worker processes.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with read-through/write-through tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import multiprocessing
+
+def make_cache(path, **kwargs):
+    from ai_agent.session_cache import SessionCache
+    from ai_agent.session_store import SQLiteSessionStore
+    return SessionCache(store=SQLiteSessionStore(str(path)), **kwargs)
+
+def worker_set(path, user_id, user_data):
+    make_cache(path).set(user_id, user_data)
+
+def worker_get(path, user_id, results):
+    session = make_cache(path).get(user_id)
+    results.put(session.to_dict() if session else None)
+
+def run(target, *args):
+    process = multiprocessing.get_context('spawn').Process(target=target, args=args)
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+
+# test that a session written by one process is read through by another
+def test_sessions_are_shared_between_processes(tmp_path):
+    path = tmp_path / 'sessions.sqlite'
+    run(worker_set, path, 1, {'name': 'Asha', 'country': 'India', 'selectedOptions': ['retire']})
+
+    cache = make_cache(path)
+    session = cache.get(1)
+    assert (session.name, session.country, session.selected_options) == ('Asha', 'India', ['retire'])
+    assert cache.stats()['store_hits'] == 1
+
+    cache.set(1, {'age': 41})
+    results = multiprocessing.get_context('spawn').Queue()
+    run(worker_get, path, 1, results)
+    assert results.get(timeout=10)['age'] == 41
+
+# test that a partial update in a cold process merges with the stored session
+def test_partial_update_merges_with_store(tmp_path):
+    path = tmp_path / 'sessions.sqlite'
+    make_cache(path).set(1, {'name': 'Asha', 'riskPreference': 'low'})
+    run(worker_set, path, 1, {'riskPreference': 'high'})
+
+    session = make_cache(path).get(1)
+    assert (session.name, session.risk_preference) == ('Asha', 'high')
+
+# test that cached sessions are revalidated against the store
+def test_revalidation_picks_up_other_writers(tmp_path):
+    path = tmp_path / 'sessions.sqlite'
+    cache = make_cache(path, revalidate=0)
+    cache.set(1, {'name': 'Asha'})
+    run(worker_set, path, 1, {'name': 'Ravi'})
+    assert cache.get(1).name == 'Ravi'
+
+    make_cache(path).delete(1)
+    assert cache.get(1) is None
+
+# test that the memory store keeps the cache process-local
+def test_memory_store_is_local():
+    from ai_agent.session_cache import SessionCache
+    from ai_agent.session_store import MemorySessionStore
+    cache = SessionCache(store=MemorySessionStore())
+    cache.set(1, {'name': 'Asha'})
+
+    assert SessionCache(store=MemorySessionStore()).get(1) is None
+    assert cache.stats()['store_hits'] == 0
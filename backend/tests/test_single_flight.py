@@ -0,0 +1,70 @@
+"""
+File Name: test_single_flight.py
+Description: This file contains the code for testing the coalescing of
+             concurrent async calls shared by the ticker and chart caches.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with coalescing and cancellation tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import asyncio
+import pytest
+
+# test that concurrent callers share one call
+def test_coalesces_calls():
+    from utils.single_flight import SingleFlight
+    flights = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def burst():
+        return await asyncio.gather(*(flights.do('key', call) for _ in range(5)))
+
+    assert asyncio.run(burst()) == [42] * 5
+    assert (flights.calls, flights.coalesced, len(flights)) == (1, 4, 0)
+
+# test that cancelling the leader does not cancel a waiting follower
+def test_leader_cancel_spares_followers():
+    from utils.single_flight import SingleFlight
+    flights = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.2)
+        return 'price'
+
+    async def scenario():
+        leader = asyncio.create_task(flights.do('cmt_btcusdt', call))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flights.do('cmt_btcusdt', call))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(scenario()) == 'price'
+    assert flights.calls == 1
+
+# test that a follower retries when the shared call itself is cancelled
+def test_follower_retries_cancelled_call():
+    from utils.single_flight import SingleFlight
+    flights = SingleFlight()
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        await asyncio.sleep(0.05)
+        if len(attempts) == 1:
+            raise asyncio.CancelledError()
+        return 'retried'
+
+    async def burst():
+        return await asyncio.gather(*(flights.do('key', call) for _ in range(3)))
+
+    assert asyncio.run(burst()) == ['retried'] * 3
+    assert len(attempts) == 2
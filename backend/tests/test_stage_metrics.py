@@ -0,0 +1,55 @@
+"""
+File Name: test_stage_metrics.py
+Description: This file contains the code for testing the per-stage latency
+             instrumentation of the agent pipeline and its metrics endpoint.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with histogram and endpoint tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import pytest
+
+PIPELINE_STAGES = {'session_write', 'history_fetch', 'router_classification', 'llm_generation', 'persistence', 'total'}
+
+@pytest.fixture(autouse=True)
+def no_prefetch(monkeypatch):
+    # Keep the speculative market-data fetch from reaching CoinGecko
+    monkeypatch.setenv("AGENT_PREFETCH", "false")
+
+# test the percentiles and Prometheus rendering of the stage histograms
+def test_histogram_quantiles_and_rendering():
+    from utils.timing import StageMetrics
+    metrics = StageMetrics(buckets=(10, 100))
+    for ms in range(1, 101):
+        metrics.observe('router_classification', ms)
+
+    snapshot = metrics.snapshot()['router_classification']
+    assert (snapshot['count'], snapshot['p50'], snapshot['p95'], snapshot['p99']) == (100, 51, 96, 100)
+
+    text = metrics.render_prometheus()
+    assert '# TYPE finarth_stage_latency_ms histogram' in text
+    assert 'finarth_stage_latency_ms_bucket{stage="router_classification",le="10"} 10' in text
+    assert 'finarth_stage_latency_ms_bucket{stage="router_classification",le="+Inf"} 100' in text
+    assert 'finarth_stage_latency_ms_quantile{stage="router_classification",quantile="0.99"} 100.000' in text
+
+# test that a chat request reports every stage and feeds the metrics endpoint
+def test_request_timings_and_metrics_endpoint(llm_stub):
+    from app import app
+    from utils.timing import stage_metrics
+    stage_metrics.reset()
+    client = app.test_client()
+
+    response = client.post('/api/agent/generate-insight', json={'query': 'Tell me something about saving money'})
+    data = response.get_json()['data']
+    assert PIPELINE_STAGES <= set(data['timings'])
+    assert data['timings']['llm_generation'] >= 400
+    assert data['steps'][-1]['latencyMs'] == data['timings']['llm_generation']
+
+    metrics = client.get('/api/health/metrics')
+    assert metrics.mimetype == 'text/plain'
+    body = metrics.get_data(as_text=True)
+    for stage in PIPELINE_STAGES:
+        assert f'finarth_stage_latency_ms_count{{stage="{stage}"}} 1' in body
@@ -0,0 +1,92 @@
+"""
+File Name: test_ticker_cache.py
+Description: This file contains the code for testing the WEEX ticker cache
+             against a local stub of WEEX.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with TTL, coalescing and bulk refresh tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import asyncio
+import time
+import pytest
+from backend.scripts.benchmarks.stub_server import market_stub, stub_price
+
+TICKER_PATH = '/capi/v2/market/ticker'
+
+@pytest.fixture
+def tickers(monkeypatch):
+    from ai_agent.market_client import MarketHttpClient
+    from ai_agent.ticker_cache import TickerCache
+    with market_stub(delay=0.2) as server:
+        monkeypatch.setenv('WEEX_BASE_URL', server.url)
+        monkeypatch.setattr(MarketHttpClient, '_instance', MarketHttpClient(retries=0))
+        cache = TickerCache(ttl=1.0)
+        monkeypatch.setattr(TickerCache, '_instance', cache)
+        yield server, cache
+
+def ticker(symbol):
+    from ai_agent.tools import WeexService
+    return asyncio.run(WeexService.get_ticker(symbol))
+
+# test that tickers are cached per normalized symbol until the TTL passes
+def test_ttl_and_normalized_keys(tickers):
+    server, cache = tickers
+    assert float(ticker('BTCUSDT')['last']) == stub_price('btcusdt')
+    ticker('cmt_btcusdt')
+    ticker('btcusdt')
+    assert server.count(TICKER_PATH) == 1
+
+    time.sleep(1.1)
+    ticker('btcusdt')
+    assert server.count(TICKER_PATH) == 2
+
+    stats = cache.stats()['symbols']['cmt_btcusdt']
+    assert (stats['hits'], stats['misses'], stats['hit_ratio']) == (2, 2, 0.5)
+    assert stats['age'] < 0.5 and cache.age('cmt_btcusdt') < 0.5
+    assert cache.age('cmt_ethusdt') is None
+
+# test that simultaneous lookups of one symbol share one upstream call
+def test_coalesces_concurrent_lookups(tickers):
+    from ai_agent.tools import WeexService
+    server, cache = tickers
+
+    async def burst():
+        return await asyncio.gather(*(WeexService.get_ticker(symbol) for symbol in ['ethusdt', 'ETHUSDT', 'cmt_ethusdt'] * 4))
+
+    results = asyncio.run(burst())
+    assert all(result == results[0] for result in results)
+    assert server.count(TICKER_PATH) == 1
+    assert cache.stats()['coalesced'] == 11
+
+# test that failed lookups are not cached
+def test_failures_not_cached(tickers):
+    server, cache = tickers
+    server.routes[TICKER_PATH] = lambda request: {'code': 'not found'}
+    assert ticker('nosuchusdt') is None
+    assert ticker('nosuchusdt') is None
+    assert server.count(TICKER_PATH) == 2
+
+# test the bulk refresh of portfolio symbols
+def test_bulk_refresh(tickers, monkeypatch):
+    from app import app
+    from ai_agent.tools import WeexService
+    server, cache = tickers
+    monkeypatch.setattr(WeexService, 'portfolio_symbols', staticmethod(lambda: ['cmt_btcusdt', 'cmt_solusdt', 'cmt_xrpusdt']))
+    client = app.test_client()
+
+    started = time.perf_counter()
+    response = client.post('/api/market/weex/tickers/refresh')
+    assert time.perf_counter() - started < 0.5
+    assert response.get_json() == {"refreshed": 3, "symbols": 3}
+
+    ticker('SOLUSDT')
+    assert server.count(TICKER_PATH) == 3
+    assert cache.stats()['symbols']['cmt_solusdt']['hits'] == 1
+
+    response = client.post('/api/market/weex/tickers/refresh', json={"symbols": ["ADAUSDT", "cmt_adausdt"]})
+    assert response.get_json() == {"refreshed": 1, "symbols": 1}
+    assert client.post('/api/market/weex/tickers/refresh', json={"symbols": "ADAUSDT"}).status_code == 400
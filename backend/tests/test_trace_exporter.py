@@ -0,0 +1,97 @@
+"""
+File Name: test_trace_exporter.py
+Description: This file contains the code for testing the background Opik
+             trace exporter against a stub Opik endpoint that answers slowly.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with non-blocking export tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import asyncio
+import json
+import time
+import urllib.request
+import pytest
+from backend.scripts.benchmarks.stub_server import StubServer
+
+FEEDBACK_PATH = '/api/v1/private/traces/feedback-scores'
+FLUSH_PATH = '/api/v1/private/flush'
+OPIK_DELAY = 2.0
+
+class StubOpikClient:
+    """The two Opik client calls the exporter makes, sent to the stub endpoint."""
+
+    def __init__(self, url):
+        self.url = url
+
+    def _post(self, path, payload):
+        request = urllib.request.Request(self.url + path, data=json.dumps(payload).encode(),
+                                         headers={'Content-Type': 'application/json'})
+        urllib.request.urlopen(request, timeout=10).read()
+
+    def log_traces_feedback_scores(self, scores):
+        self._post(FEEDBACK_PATH, {'scores': scores})
+
+    def flush(self):
+        self._post(FLUSH_PATH, {})
+
+@pytest.fixture
+def opik_stub(monkeypatch):
+    from utils.opik_client import OpikConfig, TraceExporter
+    received = []
+    server = StubServer({
+        FEEDBACK_PATH: lambda request: received.extend(request.body['scores']) or {},
+        FLUSH_PATH: lambda request: {}
+    }, delay=OPIK_DELAY)
+    with server:
+        monkeypatch.setattr(OpikConfig, '_client', StubOpikClient(server.url))
+        exporter = TraceExporter(interval=60)
+        monkeypatch.setattr(TraceExporter, '_instance', exporter)
+        server.received = received
+        yield server, exporter
+        exporter.stop(10)
+
+# test that logging feedback returns immediately and is sent as one batch
+def test_feedback_is_batched_off_the_request_path(opik_stub):
+    from utils.opik_client import OpikConfig
+    server, exporter = opik_stub
+
+    started = time.perf_counter()
+    for index in range(3):
+        OpikConfig.log_feedback(f'trace-{index}', 'user_feedback', 1.0)
+    assert time.perf_counter() - started < 0.5
+    assert server.count(FEEDBACK_PATH) == 0
+
+    assert exporter.flush(10)
+    assert server.count(FEEDBACK_PATH) == 1
+    assert [score['id'] for score in server.received] == ['trace-0', 'trace-1', 'trace-2']
+    assert server.count(FLUSH_PATH) == 1
+
+# test that a full queue drops new scores instead of blocking
+def test_full_queue_drops(opik_stub):
+    from utils.opik_client import TraceExporter
+    server, _ = opik_stub
+    exporter = TraceExporter(max_queue=2, interval=60)
+
+    accepted = [exporter.submit_feedback({'id': f'trace-{index}'}) for index in range(5)]
+    assert accepted == [True, True, False, False, False]
+    assert exporter.flush(10)
+    assert (exporter.stats()['exported'], exporter.stats()['dropped']) == (2, 3)
+    exporter.stop(10)
+
+# test that the orchestrator no longer flushes the tracing backend per request
+def test_process_does_not_wait_for_opik(opik_stub, llm_stub, monkeypatch):
+    from ai_agent.core import AgentOrchestrator
+    server, exporter = opik_stub
+    monkeypatch.setenv('AGENT_PREFETCH', 'false')
+
+    started = time.perf_counter()
+    asyncio.run(AgentOrchestrator().process('Tell me something about saving money'))
+    assert time.perf_counter() - started < OPIK_DELAY
+    assert server.count(FLUSH_PATH) == 0
+
+    assert exporter.flush(10)
+    assert server.count(FLUSH_PATH) == 1
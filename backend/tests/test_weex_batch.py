@@ -0,0 +1,92 @@
+"""
+File Name: test_weex_batch.py
+Description: This file contains the code for testing the batch investment
+             growth endpoint against a local stub of WEEX.
+Author Name: The FinArth Team
+Creation Date: 18-Oct-2026
+Version: 1.0 - Initial creation with deduplication and endpoint tests.
+
+Instructions to run: Use pytest to run the tests in this file.
+
+File Execution State: Validated with so far changes.
+"""
+import asyncio
+import pytest
+from backend.scripts.benchmarks.stub_server import market_stub
+
+TICKER_PATH = '/capi/v2/market/ticker'
+CANDLE_PATH = '/capi/v2/market/historyCandles'
+
+HOLDINGS = [
+    {"id": 1, "symbol": "BTCUSDT", "date": "2026-01-05"},
+    {"id": 2, "symbol": "cmt_btcusdt", "date": "2026-01-05"},
+    {"id": 3, "symbol": "btcusdt", "date": "2026-02-10"},
+    {"id": 4, "symbol": "ETHUSDT", "date": "2026-01-05", "entryPrice": 1000.0},
+    {"id": 5, "symbol": "solusdt", "date": "not-a-date"}
+]
+
+@pytest.fixture
+def weex(monkeypatch, candle_store):
+    from ai_agent.market_client import MarketHttpClient
+    from ai_agent.ticker_cache import TickerCache
+    with market_stub() as server:
+        monkeypatch.setenv('WEEX_BASE_URL', server.url)
+        monkeypatch.setattr(MarketHttpClient, '_instance', MarketHttpClient(retries=0))
+        monkeypatch.setattr(TickerCache, '_instance', TickerCache())
+        yield server
+
+# test that the batch matches single calls while fetching each ticker and candle once
+def test_batch_matches_single_calls(weex):
+    from ai_agent.tools import WeexService
+    results = asyncio.run(WeexService.calculate_investment_growth_batch(HOLDINGS, max_concurrency=2))
+    assert weex.count(TICKER_PATH) == 2
+    # Both BTC purchase days come from one backfill call
+    assert weex.count(CANDLE_PATH) == 1
+
+    for holding in HOLDINGS[:4]:
+        single = asyncio.run(WeexService.calculate_investment_growth(
+            holding['symbol'], holding['date'], manual_entry_price=holding.get('entryPrice')))
+        assert results[holding['id']] == single
+    assert results[1]['growth_percentage'] is not None
+    assert results[4]['purchase_price'] == 1000.0
+    assert 'error' in results[5]
+
+# test the batch endpoint and its validation
+def test_batch_endpoint(weex):
+    from app import app
+    client = app.test_client()
+
+    response = client.post('/api/market/weex/analysis/batch', json={"holdings": HOLDINGS[:4]})
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert set(results) == {'1', '2', '3', '4'}
+    assert results['1']['current_price'] == results['3']['current_price']
+
+    assert client.post('/api/market/weex/analysis/batch', json={"holdings": "BTCUSDT"}).status_code == 400
+    too_many = [{"id": index, "symbol": "btcusdt", "date": "2026-01-05"} for index in range(201)]
+    assert client.post('/api/market/weex/analysis/batch', json={"holdings": too_many}).status_code == 400
+
+# test that invalid entries get per-item errors without failing the batch
+def test_batch_endpoint_reports_invalid_items(weex):
+    from app import app
+    client = app.test_client()
+    holdings = [
+        HOLDINGS[0],
+        {"id": 7},
+        {"id": 8, "symbol": "btcusdt", "date": "2026-01-05", "entryPrice": "abc"},
+        {"symbol": "btcusdt", "date": "2026-01-05"},
+        "BTCUSDT"
+    ]
+    response = client.post('/api/market/weex/analysis/batch', json={"holdings": holdings})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert 'current_price' in body['results']['1']
+    assert 'error' in body['results']['7']
+    assert 'entryPrice' in body['results']['8']['error']
+    assert [error['index'] for error in body['errors']] == [3, 4]
+
+    # Mixed int and str ids
+    mixed = [HOLDINGS[0], dict(HOLDINGS[1], id="abc")]
+    response = client.post('/api/market/weex/analysis/batch', json={"holdings": mixed})
+    assert response.status_code == 200
+    assert set(response.get_json()['results']) == {'1', 'abc'}
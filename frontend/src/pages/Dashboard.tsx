@@ -4,6 +4,7 @@ import {
 } from 'lucide-react';
 import { useLocation, useParams } from 'react-router-dom';
 import { apiCall } from '../utils/api.ts';
+import { fetchCryptoAnalysis } from '../utils/cryptoAnalysis.ts';
 import { Activity } from '../components/Icons.tsx';
 import Sidebar from '../components/Sidebar.tsx';
 import Portfolio from './Portfolio.tsx';
@@ -316,26 +317,7 @@ const Dashboard: React.FC<DashboardProps> = ({ onLogout }) => {
         return;
       }
 
-      const analysisResults: Record<number, any> = {};
-      await Promise.all(
-        cryptoHoldings.map(async (holding) => {
-          try {
-            const res = await apiCall('/api/market/weex/analysis', {
-              method: 'POST',
-              body: JSON.stringify({
-                symbol: holding.symbol,
-                date: holding.date,
-                entryPrice: holding.entry_price
-              })
-            });
-            if (res && !res.error) {
-              analysisResults[holding.id] = res;
-            }
-          } catch (e) {
-            console.error(`Failed to fetch analysis for ${holding.symbol}:`, e);
-          }
-        })
-      );
+      const analysisResults = await fetchCryptoAnalysis(cryptoHoldings);
       setCryptoAnalysis(analysisResults);
     };
 
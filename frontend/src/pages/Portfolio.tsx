@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { apiCall } from '../utils/api.ts';
+import { fetchCryptoAnalysis } from '../utils/cryptoAnalysis.ts';
 
 interface PortfolioProps {
   holdings: any[];
@@ -72,27 +73,7 @@ const Portfolio: React.FC<PortfolioProps> = ({ holdings, onRefresh, marketData,
         return;
       }
 
-      const analysisResults: Record<number, any> = {};
-
-      await Promise.all(
-        cryptoHoldings.map(async (holding) => {
-          try {
-            const res = await apiCall('/api/market/weex/analysis', {
-              method: 'POST',
-              body: JSON.stringify({
-                symbol: holding.symbol,
-                date: holding.date,
-                entryPrice: holding.entry_price
-              })
-            });
-            if (res && !res.error) {
-              analysisResults[holding.id] = res;
-            }
-          } catch (e) {
-            console.error(`Failed to fetch analysis for ${holding.symbol}:`, e);
-          }
-        })
-      );
+      const analysisResults = await fetchCryptoAnalysis(cryptoHoldings);
 
       setCryptoAnalysis(analysisResults);
       setIsAnalysisLoading(false);
@@ -0,0 +1,39 @@
+import { apiCall } from './api.ts';
+
+// Must not exceed WeexService.BATCH_MAX_ITEMS on the backend
+export const WEEX_BATCH_MAX_ITEMS = 200;
+
+// Investment growth for crypto holdings, keyed by holding id. Holdings are sent
+// in chunks of at most WEEX_BATCH_MAX_ITEMS; a failed chunk or a holding the
+// backend reports an error for is left out rather than failing the rest.
+export const fetchCryptoAnalysis = async (holdings: any[]): Promise<Record<number, any>> => {
+  const chunks: any[][] = [];
+  for (let start = 0; start < holdings.length; start += WEEX_BATCH_MAX_ITEMS) {
+    chunks.push(holdings.slice(start, start + WEEX_BATCH_MAX_ITEMS));
+  }
+
+  const analysisResults: Record<number, any> = {};
+  await Promise.all(chunks.map(async chunk => {
+    try {
+      const res = await apiCall('/api/market/weex/analysis/batch', {
+        method: 'POST',
+        body: JSON.stringify({
+          holdings: chunk.map(holding => ({
+            id: holding.id,
+            symbol: holding.symbol,
+            date: holding.date,
+            entryPrice: holding.entry_price
+          }))
+        })
+      });
+      Object.entries(res?.results || {}).forEach(([id, analysis]: [string, any]) => {
+        if (analysis && !analysis.error) {
+          analysisResults[Number(id)] = analysis;
+        }
+      });
+    } catch (e) {
+      console.error('Failed to fetch crypto analysis:', e);
+    }
+  }));
+  return analysisResults;
+};